@@ -124,6 +124,7 @@ class GameConfig(Config):
                             "force_wincap": False,
                             "force_freegame": True,
                         },
+                        rejection_hooks=["missing_freegame"],
                     ),
                     Distribution(
                         criteria="0",
@@ -134,6 +135,7 @@ class GameConfig(Config):
                             "force_wincap": False,
                             "force_freegame": False,
                         },
+                        rejection_hooks=["exceeds_win_criteria"],
                     ),
                     Distribution(
                         criteria="basegame",
@@ -201,6 +203,7 @@ class GameConfig(Config):
                             "force_wincap": False,
                             "force_freegame": True,
                         },
+                        rejection_hooks=["missing_freegame"],
                     ),
                 ],
             ),
@@ -1,5 +1,6 @@
 from game_calculations import GameCalculations
 from src.calculations.cluster import Cluster
+from src.calculations.board_codes import BoardCodes
 from game_events import update_grid_mult_event
 from src.events.events import update_freespin_event
 
@@ -30,19 +31,22 @@ class GameExecutables(GameCalculations):
 
     def get_clusters_update_wins(self):
         """Find clusters on board and update win manager."""
-        clusters = Cluster.get_clusters(self.board, "wild")
+        board_codes = BoardCodes(self.board)
+        clusters = Cluster.get_clusters(board_codes, "wild")
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
-        self.board, self.win_data = self.evaluate_clusters_with_grid(
+        self.board, self.win_data, total_win = Cluster.evaluate_clusters(
             config=self.config,
-            board=self.board,
+            board=board_codes,
             clusters=clusters,
-            pos_mult_grid=self.position_multipliers,
             global_multiplier=self.global_multiplier,
             return_data=return_data,
+            multiplier_strategy="grid",
+            pos_mult_grid=self.position_multipliers,
         )
+        self.win_data["totalWin"] += total_win
 
         Cluster.record_cluster_wins(self)
         self.win_manager.update_spinwin(self.win_data["totalWin"])
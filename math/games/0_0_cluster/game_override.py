@@ -12,6 +12,7 @@ class GameStateOverride(GameExecutables):
         super().reset_book()
         # Reset parameters relevant to local game only
         self.tumble_win = 0
+        self.reset_grid_mults()
 
     def reset_fs_spin(self):
         super().reset_fs_spin()
@@ -1,8 +1,7 @@
 """Events specific to new and updating expanding wild symbols."""
 
-from copy import deepcopy
 from src.events.event_constants import EventConstants
-from src.events.events import json_ready_sym
+from src.events.events import json_ready_sym, json_copy, book_event
 
 NEW_EXP_WILDS = "newExpandingWilds"
 UPDATE_EXP_WILDS = "updateExpandingWilds"
@@ -11,9 +10,10 @@ WIN_DATA = "winInfo"
 PRIZE_WIN_DATA = "prizeWinInfo"
 
 
+@book_event
 def new_expanding_wild_event(gamestate) -> None:
     """Passed after reveal event"""
-    new_exp_wilds = gamestate.new_exp_wilds
+    new_exp_wilds = json_copy(gamestate.new_exp_wilds)
     if gamestate.config.include_padding:
         for ew in new_exp_wilds:
             ew["row"] += 1
@@ -22,9 +22,10 @@ def new_expanding_wild_event(gamestate) -> None:
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_expanding_wild_event(gamestate) -> None:
     """On each reveal - the multiplier value on the expanding wild is updated (sent before reveal)"""
-    existing_wild_details = deepcopy(gamestate.expanding_wilds)
+    existing_wild_details = json_copy(gamestate.expanding_wilds)
     wild_event = []
     if gamestate.config.include_padding:
         for ew in existing_wild_details:
@@ -36,8 +37,10 @@ def update_expanding_wild_event(gamestate) -> None:
     gamestate.book.add_event(event)
 
 
+@book_event
 def new_sticky_event(gamestate, new_sticky_syms: list):
     """Pass details on new prize symbols"""
+    new_sticky_syms = json_copy(new_sticky_syms)
     if gamestate.config.include_padding:
         for sym in new_sticky_syms:
             sym["row"] += 1
@@ -47,12 +50,13 @@ def new_sticky_event(gamestate, new_sticky_syms: list):
     gamestate.book.add_event(event)
 
 
+@book_event
 def win_info_prize_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
     win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
+    win_data_copy["wins"] = json_copy(gamestate.win_data["wins"])
     prize_details = []
     for _, w in enumerate(win_data_copy["wins"]):
         if include_padding_index:
@@ -69,6 +73,7 @@ def win_info_prize_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@book_event
 def reveal_prize_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -94,8 +99,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
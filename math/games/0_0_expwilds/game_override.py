@@ -1,5 +1,4 @@
 from game_executables import GameExecutables
-from src.calculations.statistics import get_random_outcome
 
 
 class GameStateOverride(GameExecutables):
@@ -20,15 +19,13 @@ class GameStateOverride(GameExecutables):
     def assign_mult_property(self, symbol):
         """Only assign multiplier values in freegame"""
         if self.gametype != self.config.basegame_type:
-            multiplier_value = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
-            )
+            multiplier_value = self.draw_condition("mult_values")
             symbol.assign_attribute({"multiplier": multiplier_value})
 
     def assign_prize_value(self, symbol):
         """Only assign multiplier values in freegame"""
         # if self.gametype != self.config.basegame_type:
-        multiplier_value = get_random_outcome(self.get_current_distribution_conditions()["prize_values"])
+        multiplier_value = self.draw_condition("prize_values")
         symbol.assign_attribute({"prize": multiplier_value})
 
     def check_repeat(self) -> None:
@@ -5,7 +5,6 @@ from game_events import win_info_prize_event, new_sticky_event
 from src.calculations.lines import Lines
 from src.events.events import update_freespin_event, reveal_event, set_total_event, set_win_event
 from game_events import new_expanding_wild_event, update_expanding_wild_event, reveal_prize_event
-from src.calculations.statistics import get_random_outcome
 
 
 class GameState(GameStateOverride):
@@ -17,22 +16,23 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-            if self.betmode == "superspin":
-                self.run_superspin()
-            else:
-                self.draw_board(emit_event=True)
+            with self.spin_attempt():
+                if self.betmode == "superspin":
+                    self.run_superspin()
+                else:
+                    self.draw_board(emit_event=True)
 
-                self.win_data = Lines.get_lines(self.board, self.config, global_multiplier=self.global_multiplier)
-                Lines.record_lines_wins(self)
-                self.win_manager.update_spinwin(self.win_data["totalWin"])
-                Lines.emit_linewin_events(self)
+                    self.win_data = Lines.get_lines(self.board, self.config, global_multiplier=self.global_multiplier)
+                    Lines.record_lines_wins(self)
+                    self.win_manager.update_spinwin(self.win_data["totalWin"])
+                    Lines.emit_linewin_events(self)
 
-                self.win_manager.update_gametype_wins(self.gametype)
-                if self.check_fs_condition() and self.check_freespin_entry():
-                    self.run_freespin_from_base()
+                    self.win_manager.update_gametype_wins(self.gametype)
+                    if self.check_fs_condition() and self.check_freespin_entry():
+                        self.run_freespin_from_base()
 
-                self.evaluate_finalwin()
-            self.check_repeat()
+                    self.evaluate_finalwin()
+                self.check_repeat()
 
         self.imprint_wins()
 
@@ -45,7 +45,7 @@ class GameState(GameStateOverride):
             self.update_freespin()
             self.draw_board(emit_event=False)
 
-            wild_on_reveal = get_random_outcome(self.get_current_distribution_conditions()["landing_wilds"])
+            wild_on_reveal = self.draw_condition("landing_wilds")
             self.assign_new_wilds(wild_on_reveal)
             self.update_with_existing_wilds()  # Override board with expanding wilds, update mults on each
 
@@ -298,7 +298,13 @@ class GameConfig(Config):
                         conditions=wincap_condition,
                     ),
                     Distribution(criteria="freegame", quota=0.1, conditions=freegame_condition),
-                    Distribution(criteria="0", quota=0.4, win_criteria=0.0, conditions=zerowin_condition),
+                    Distribution(
+                        criteria="0",
+                        quota=0.4,
+                        win_criteria=0.0,
+                        conditions=zerowin_condition,
+                        rejection_hooks=["exceeds_win_criteria"],
+                    ),
                     Distribution(criteria="basegame", quota=0.5, conditions=basegame_condition),
                 ],
             ),
@@ -1,5 +1,4 @@
 from game_executables import GameExecutables
-from src.calculations.statistics import get_random_outcome
 
 
 class GameStateOverride(GameExecutables):
@@ -20,9 +19,7 @@ class GameStateOverride(GameExecutables):
         """Assign multiplier value to Wild symbol in freegame."""
         multiplier_value = 1
         if self.gametype == self.config.freegame_type:
-            multiplier_value = get_random_outcome(
-                self.get_current_distribution_conditions()["mult_values"][self.gametype]
-            )
+            multiplier_value = self.draw_condition("mult_values")
         symbol.assign_attribute({"multiplier": multiplier_value})
 
     def check_repeat(self):
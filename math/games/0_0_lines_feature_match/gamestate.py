@@ -9,17 +9,18 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-            self.draw_board()
+            with self.spin_attempt():
+                self.draw_board()
 
-            # Evaluate wins, update wallet, transmit events
-            self.evaluate_lines_board()
+                # Evaluate wins, update wallet, transmit events
+                self.evaluate_lines_board()
 
-            self.win_manager.update_gametype_wins(self.gametype)
-            if self.check_fs_condition():
-                self.run_freespin_from_base()
+                self.win_manager.update_gametype_wins(self.gametype)
+                if self.check_fs_condition():
+                    self.run_freespin_from_base()
 
-            self.evaluate_finalwin()
-            self.check_repeat()
+                self.evaluate_finalwin()
+                self.check_repeat()
 
         self.imprint_wins()
 
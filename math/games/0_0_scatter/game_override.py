@@ -1,6 +1,5 @@
 from game_executables import *
 from src.events.events import update_freespin_event, update_global_mult_event
-from src.calculations.statistics import get_random_outcome
 
 
 class GameStateOverride(GameExecutables):
@@ -24,9 +23,7 @@ class GameStateOverride(GameExecutables):
 
     def assign_mult_property(self, symbol):
         """Use betmode conditions to assign multiplier attribute to multiplier symbol."""
-        multiplier_value = get_random_outcome(
-            self.get_current_distribution_conditions()["mult_values"][self.gametype]
-        )
+        multiplier_value = self.draw_condition("mult_values")
         symbol.assign_attribute({"multiplier": multiplier_value})
 
     def check_game_repeat(self):
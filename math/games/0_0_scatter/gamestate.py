@@ -10,24 +10,25 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-            self.draw_board()
+            with self.spin_attempt():
+                self.draw_board()
 
-            self.get_scatterpays_update_wins()
-            self.emit_tumble_win_events()  # Transmit win information
-
-            while self.win_data["totalWin"] > 0 and not (self.wincap_triggered):
-                self.tumble_game_board()
                 self.get_scatterpays_update_wins()
                 self.emit_tumble_win_events()  # Transmit win information
 
-            self.set_end_tumble_event()
-            self.win_manager.update_gametype_wins(self.gametype)
+                while self.win_data["totalWin"] > 0 and not (self.wincap_triggered):
+                    self.tumble_game_board()
+                    self.get_scatterpays_update_wins()
+                    self.emit_tumble_win_events()  # Transmit win information
+
+                self.set_end_tumble_event()
+                self.win_manager.update_gametype_wins(self.gametype)
 
-            if self.check_fs_condition() and self.check_freespin_entry():
-                self.run_freespin_from_base()
+                if self.check_fs_condition() and self.check_freespin_entry():
+                    self.run_freespin_from_base()
 
-            self.evaluate_finalwin()
-            self.check_repeat()
+                self.evaluate_finalwin()
+                self.check_repeat()
 
         self.imprint_wins()
 
@@ -1,5 +1,4 @@
 from game_executables import GameExecutables
-from src.calculations.statistics import get_random_outcome
 
 
 class GameStateOverride(GameExecutables):
@@ -18,7 +17,7 @@ class GameStateOverride(GameExecutables):
 
     def assign_mult_property(self, symbol):
         """Assign symbol multiplier using probabilities defined in config distributions."""
-        multiplier_value = get_random_outcome(self.get_current_distribution_conditions()["mult_values"])
+        multiplier_value = self.draw_condition("mult_values")
         symbol.assign_attribute({"multiplier": multiplier_value})
 
     def check_game_repeat(self):
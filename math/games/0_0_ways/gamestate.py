@@ -11,18 +11,19 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-            self.draw_board(emit_event=True)
+            with self.spin_attempt():
+                self.draw_board(emit_event=True)
 
-            # Evaluate base-game board
-            self.evaluate_ways_board()
+                # Evaluate base-game board
+                self.evaluate_ways_board()
 
-            self.win_manager.update_gametype_wins(self.gametype)
-            # Check Scatter condition and trigger freegame
-            if self.check_fs_condition() and self.check_freespin_entry():
-                self.run_freespin_from_base()
+                self.win_manager.update_gametype_wins(self.gametype)
+                # Check Scatter condition and trigger freegame
+                if self.check_fs_condition() and self.check_freespin_entry():
+                    self.run_freespin_from_base()
 
-            self.evaluate_finalwin()
-            self.check_repeat()
+                self.evaluate_finalwin()
+                self.check_repeat()
 
         self.imprint_wins()
 
@@ -11,8 +11,8 @@ class GameState(GameStateOverride):
         self.repeat = True
         while self.repeat:
             self.reset_book()
-
-            self.evaluate_finalwin()
+            with self.spin_attempt():
+                self.evaluate_finalwin()
 
         self.imprint_wins()
 
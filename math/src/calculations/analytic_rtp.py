@@ -0,0 +1,156 @@
+"""Exact (full-cycle) RTP of lines and ways reelstrips, computed from per-reel symbol stop counts."""
+
+from collections import defaultdict
+from fractions import Fraction
+from src.config.config import Config
+from src.calculations.reelstrips import ReelstripTable
+
+
+def get_symbol_frequencies(reelstrip: list) -> list:
+    """Share of stop positions holding each symbol name, per reel."""
+    frequencies = []
+    for strip in reelstrip:
+        counts = defaultdict(int)
+        for name in strip:
+            counts[name] += 1
+        frequencies.append({name: Fraction(count, len(strip)) for name, count in counts.items()})
+    return frequencies
+
+
+def format_wins(wins: dict, cost: float) -> dict:
+    """{symbol: {kind: {"hit_rate", "rtp"}}} from {(symbol, kind): [expected hits, expected win]}."""
+    formatted = {}
+    for (symbol, kind), (hits, win) in sorted(wins.items()):
+        formatted.setdefault(symbol, {})[kind] = {"hit_rate": float(hits), "rtp": float(win / Fraction(cost))}
+    return formatted
+
+
+def get_lines_wins(config: Config, reelstrip_id: str, wild_key: str = "wild", wild_sym: str = "W") -> dict:
+    """Expected hits and win per spin of every (symbol, kind), following Lines.get_lines() without multipliers.
+
+    The symbol on any payline position is distributed as the symbol frequencies of its reel, independently across
+    reels. A line outcome is fixed by the number of leading wilds, the first non-wild symbol and the number of
+    following matches, all outcomes are enumerated and weighted by their probability.
+    """
+    frequencies = get_symbol_frequencies(config.reels[reelstrip_id][: config.num_reels])
+    num_reels, num_lines = len(frequencies), len(config.paylines)
+    wild_names = set(config.special_symbols.get(wild_key, []))
+    wild_probs = [sum(prob for name, prob in reel.items() if name in wild_names) for reel in frequencies]
+
+    wins = defaultdict(lambda: [Fraction(0), Fraction(0)])
+
+    def record(wild_matches: int, symbol: str, kind: int, prob: Fraction) -> None:
+        wild_win = config.paytable.get((wild_matches, wild_sym), 0)
+        base_win = config.paytable.get((kind, symbol), 0) if symbol is not None else 0
+        if base_win > 0 or wild_win > 0:
+            key, pay = ((wild_sym, wild_matches), wild_win) if wild_win > base_win else ((symbol, kind), base_win)
+            wins[key][0] += prob * num_lines
+            wins[key][1] += prob * num_lines * Fraction(pay)
+
+    leading_wild_prob = Fraction(1)
+    for wild_matches in range(num_reels):
+        for symbol, symbol_prob in frequencies[wild_matches].items():
+            if symbol in wild_names:
+                continue
+            prob = leading_wild_prob * symbol_prob
+            for kind in range(wild_matches + 1, num_reels + 1):
+                match_prob = frequencies[kind].get(symbol, 0) + wild_probs[kind] if kind < num_reels else 0
+                record(wild_matches, symbol, kind, prob * (1 - match_prob))
+                prob *= match_prob
+        leading_wild_prob *= wild_probs[wild_matches]
+    record(num_reels, None, num_reels, leading_wild_prob)
+
+    return wins
+
+
+def get_ways_wins(config: Config, reelstrip_id: str, wild_key: str = "wild") -> dict:
+    """Expected hits and win per spin of every (symbol, kind), following Ways.get_ways_data() without multipliers.
+
+    A symbol wins if it lands on the first reel, each following reel contributes the number of symbols plus wilds
+    in its window. Reels are independent, so the expected ways of a kind are the product of the per-reel
+    expectations, with the first reel missing the symbol (or wild) ending the win.
+    """
+    table = ReelstripTable(config, config.reels[reelstrip_id])
+    wild_names = set(config.special_symbols.get(wild_key, []))
+    num_reels = len(table.windows)
+
+    wins = defaultdict(lambda: [Fraction(0), Fraction(0)])
+    symbols = {name for window in table.windows[0] for name in window}
+    for symbol in sorted(symbols):
+        # Per reel: expected symbol + wild count (first reel: only if the symbol landed), and P(count > 0)
+        expected_counts, hit_probs = [], []
+        for reel, windows in enumerate(table.windows):
+            expected, hits = Fraction(0), Fraction(0)
+            for window in windows:
+                num_symbol = sum(1 for name in window if name == symbol)
+                count = num_symbol + sum(1 for name in window if name in wild_names)
+                if (num_symbol if reel == 0 else count) > 0:
+                    expected += count
+                    hits += 1
+            expected_counts.append(expected / len(windows))
+            hit_probs.append(hits / len(windows))
+
+        expected_ways, hit_prob = Fraction(1), Fraction(1)
+        for kind in range(1, num_reels + 1):
+            expected_ways *= expected_counts[kind - 1]
+            hit_prob *= hit_probs[kind - 1]
+            if hit_prob == 0:
+                break
+            end_prob = 1 - hit_probs[kind] if kind < num_reels else 1
+            pay = config.paytable.get((kind, symbol), 0)
+            if pay > 0:
+                wins[(symbol, kind)][0] += hit_prob * end_prob
+                wins[(symbol, kind)][1] += expected_ways * end_prob * Fraction(pay)
+
+    return wins
+
+
+def get_scatter_probabilities(config: Config, reelstrip_id: str, scatter_key: str = "scatter") -> dict:
+    """Probability of each number of scatter symbols on the board."""
+    table = ReelstripTable(config, config.reels[reelstrip_id])
+    count_table = table.get_count_table(scatter_key, config.special_symbols.get(scatter_key, []))
+    num_combinations = count_table.num_combinations()
+    return {
+        count: float(Fraction(combinations, num_combinations))
+        for count, combinations in enumerate(count_table.combinations[0])
+        if combinations > 0
+    }
+
+
+def get_reelstrip_rtp(
+    config: Config,
+    reelstrip_id: str,
+    win_type: str = "lines",
+    cost: float = 1.0,
+    gametype: str = None,
+    wild_key: str = "wild",
+    wild_sym: str = "W",
+    scatter_key: str = "scatter",
+) -> dict:
+    """Exact RTP of a reelstrip for a lines or ways game without tumbles or multipliers.
+
+    Returns the RTP, the hit rate (expected number of wins per spin) and RTP contribution of every paying symbol
+    and kind, the scatter count probabilities and the probability of triggering freegames in gametype (the
+    basegame by default).
+    """
+    match win_type:
+        case "lines":
+            wins = get_lines_wins(config, reelstrip_id, wild_key=wild_key, wild_sym=wild_sym)
+        case "ways":
+            wins = get_ways_wins(config, reelstrip_id, wild_key=wild_key)
+        case _:
+            raise ValueError(f"win_type must be 'lines' or 'ways', not '{win_type}'")
+
+    scatter_probs = get_scatter_probabilities(config, reelstrip_id, scatter_key=scatter_key)
+    triggers = config.freespin_triggers.get(gametype or config.basegame_type, {})
+    trigger_probability = (
+        sum(prob for count, prob in scatter_probs.items() if count >= min(triggers)) if len(triggers) > 0 else 0.0
+    )
+    return {
+        "reelstrip": reelstrip_id,
+        "win_type": win_type,
+        "rtp": float(sum(win for _, win in wins.values()) / Fraction(cost)),
+        "wins": format_wins(wins, cost),
+        "scatter_counts": scatter_probs,
+        "trigger_probability": trigger_probability,
+    }
@@ -1,60 +1,67 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
 from typing import List
 from src.state.state import GeneralGameState
-from src.calculations.statistics import get_random_outcome
+from src.calculations.reelstrips import ReelstripTable, StopCountTable
 from src.events.events import reveal_event
 
 
 class Board(GeneralGameState):
     """Handles generation of a game board and symbols"""
 
+    def get_reelstrip_table(self, reelstrip_id: str) -> ReelstripTable:
+        """Precomputed windows of a reelstrip, recompiled if the config reelstrip has been replaced."""
+        table = self.reelstrip_tables.get(reelstrip_id)
+        if table is None or table.reelstrip is not self.config.reels[reelstrip_id]:
+            table = ReelstripTable(self.config, self.config.reels[reelstrip_id])
+            self.reelstrip_tables[reelstrip_id] = table
+        return table
+
+    def fill_board_from_table(self, table: ReelstripTable, reel_positions: List[int]) -> tuple:
+        """Create board (and padding) symbols for the given stop positions, in reel then row order.
+        Special symbols are recorded as they land, the first reel after which anticipation applies is returned."""
+        board, top_symbols, bottom_symbols, special_positions = [], [], [], []
+        first_scatter_reel = -1
+        for reel, reel_pos in enumerate(reel_positions):
+            if self.config.include_padding:
+                top_symbols.append(self.create_symbol(table.top_padding[reel][reel_pos]))
+                bottom_symbols.append(self.create_symbol(table.bottom_padding[reel][reel_pos]))
+            column = [self.create_symbol(name) for name in table.windows[reel][reel_pos]]
+            for row in table.special_rows[reel][reel_pos]:
+                special_positions.append((reel, row))
+                for special_symbol in table.special_matches[column[row].name]:
+                    self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
+                    if (
+                        column[row].check_attribute("scatter")
+                        and len(self.special_syms_on_board[special_symbol])
+                        >= self.config.anticipation_triggers[self.gametype]
+                        and first_scatter_reel == -1
+                    ):
+                        first_scatter_reel = reel + 1
+            board.append(column)
+        return board, top_symbols, bottom_symbols, special_positions, first_scatter_reel
+
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
+        self.reelstrip_id = self.draw_condition("reel_weights")
+        table = self.get_reelstrip_table(self.reelstrip_id)
+        reel_positions = [self.rng.randrange(0, table.lengths[reel]) for reel in range(self.config.num_reels)]
+        self.create_board_from_stops(self.reelstrip_id, reel_positions)
+
+    def create_board_from_stops(self, reelstrip_id: str, reel_positions: List[int]) -> None:
+        """Creates a gameboard (with padding symbols and anticipation) from reelstrip stopping positions."""
         self.refresh_special_syms()
-        self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
+        self.reelstrip_id = reelstrip_id
         self.reelstrip = self.config.reels[self.reelstrip_id]
+        table = self.get_reelstrip_table(self.reelstrip_id)
         anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
-        padding_positions = [0] * self.config.num_reels
-        first_scatter_reel = -1
-        for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-                if sym.defn.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
-            padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
+        board, top_symbols, bottom_symbols, special_positions, first_scatter_reel = self.fill_board_from_table(
+            table, reel_positions
+        )
+        padding_positions = [
+            (reel_positions[reel] + self.config.num_rows[reel] + 1) % table.lengths[reel]
+            for reel in range(self.config.num_reels)
+        ]
 
         if first_scatter_reel > -1 and first_scatter_reel != self.config.num_reels:
             count = 1
@@ -67,7 +74,7 @@ class Board(GeneralGameState):
                 raise RuntimeError
 
         self.board = board
-        self.get_special_symbols_on_board()
+        self.get_special_symbols_on_board(special_positions)
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
         self.anticipation = anticipation
@@ -75,57 +82,66 @@ class Board(GeneralGameState):
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
 
+    def get_count_table(self, reelstrip_id: str, criteria: str) -> StopCountTable:
+        """Stop position counts of a special symbol kind, or (case-insensitive) symbol name, on a reelstrip."""
+        table = self.get_reelstrip_table(reelstrip_id)
+        if criteria in self.config.special_symbols:
+            target_names = self.config.special_symbols[criteria]
+        else:
+            target_names = {name for name in table.symbol_names if name.upper() == criteria.upper()}
+        return table.get_count_table(criteria, target_names)
+
+    def create_board_with_count(self, criteria: str, totals: List[int]) -> None:
+        """Draw a board showing one of the given totals of criteria symbols.
+
+        Samples directly from the distribution of (reelstrip, stop positions) given the symbol count: reelstrips
+        are chosen by their reel_weights times the probability of showing one of the totals, stop positions
+        uniformly from all combinations of that reelstrip which show one of the totals. With nominal reel_weights
+        declared the likelihood ratio is updated by the nominal over the biased probability of the drawn reelstrip,
+        both given the totals.
+        """
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+        reelstrip_ids, shown, weights, count_tables = [], [], [], []
+        for reelstrip_id, weight in reel_weights.items():
+            count_table = self.get_count_table(reelstrip_id, criteria)
+            reelstrip_ids.append(reelstrip_id)
+            shown.append(count_table.count_combinations(totals) / count_table.num_combinations())
+            weights.append(weight * shown[-1])
+            count_tables.append(count_table)
+        if sum(weights) <= 0:
+            raise RuntimeError(f"No reelstrip in {list(reel_weights)} can show {list(totals)} '{criteria}' symbols")
+
+        strip_index = self.rng.choices(range(len(reelstrip_ids)), weights)[0]
+        nominal_weights = self.get_current_betmode_distributions().get_nominal_weights("reel_weights", self.gametype)
+        if nominal_weights is not None:
+            nominal = [nominal_weights.get(reelstrip_id, 0) * p for reelstrip_id, p in zip(reelstrip_ids, shown)]
+            if sum(nominal) <= 0:
+                raise RuntimeError(f"No nominal reelstrip can show {list(totals)} '{criteria}' symbols")
+            self.update_likelihood_ratio(nominal[strip_index] / sum(nominal), weights[strip_index] / sum(weights))
+        reel_positions = count_tables[strip_index].sample(self.rng, totals)
+        self.create_board_from_stops(reelstrip_ids[strip_index], reel_positions)
+
     def force_board_from_reelstrips(self, reelstrip_id: str, force_stop_positions: List[List]) -> None:
         """Creates a gameboard from specified stopping positions."""
-        if self.config.include_padding:
-            top_symbols = []
-            bottom_symbols = []
         self.refresh_special_syms()
         self.reelstrip_id = reelstrip_id
         self.reelstrip = self.config.reels[self.reelstrip_id]
+        table = self.get_reelstrip_table(self.reelstrip_id)
         anticipation = [0] * self.config.num_reels
-        board = [[]] * self.config.num_reels
-        for i in range(self.config.num_reels):
-            board[i] = [0] * self.config.num_rows[i]
 
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
 
-        padding_positions = [0] * self.config.num_reels
-        first_scatter_reel = -1
-        for reel in range(self.config.num_reels):
-            reel_pos = reel_positions[reel]
-            if self.config.include_padding:
-                top_symbols.append(
-                    self.create_symbol(self.reelstrip[reel][(reel_pos - 1) % len(self.reelstrip[reel])])
-                )
-                bottom_symbols.append(
-                    self.create_symbol(
-                        self.reelstrip[reel][(reel_pos + len(board[reel])) % len(self.reelstrip[reel])]
-                    )
-                )
-            for row in range(self.config.num_rows[reel]):
-                sym_id = self.reelstrip[reel][(reel_pos + row) % len(self.reelstrip[reel])]
-                sym = self.create_symbol(sym_id)
-                board[reel][row] = sym
-
-                if sym.defn.special:
-                    for special_symbol in self.special_syms_on_board:
-                        for s in self.config.special_symbols[special_symbol]:
-                            if board[reel][row].name == s:
-                                self.special_syms_on_board[special_symbol] += [{"reel": reel, "row": row}]
-                                if (
-                                    board[reel][row].check_attribute("scatter")
-                                    and len(self.special_syms_on_board[special_symbol])
-                                    >= self.config.anticipation_triggers[self.gametype]
-                                    and first_scatter_reel == -1
-                                ):
-                                    first_scatter_reel = reel + 1
-                padding_positions[reel] = (reel_positions[reel] + len(board[reel]) + 1) % len(self.reelstrip[reel])
+        table_positions = [reel_positions[reel] % table.lengths[reel] for reel in range(self.config.num_reels)]
+        board, top_symbols, bottom_symbols, _, first_scatter_reel = self.fill_board_from_table(table, table_positions)
+        padding_positions = [
+            (reel_positions[reel] + self.config.num_rows[reel] + 1) % table.lengths[reel]
+            for reel in range(self.config.num_reels)
+        ]
 
         if first_scatter_reel > -1 and first_scatter_reel <= self.config.num_reels:
             count = 1
@@ -142,10 +158,12 @@ class Board(GeneralGameState):
             self.bottom_symbols = bottom_symbols
 
     def create_symbol(self, name: str):
-        sym = self.symbol_storage.create_symbol(name)
-        if name in self.special_symbol_functions:
-            for func in self.special_symbol_functions[name]:
-                func(sym)
+        if name not in self.special_symbol_functions:
+            return self.symbol_storage.create_symbol(name)
+
+        sym = self.symbol_storage.create_symbol(name, mutable=True)
+        for func in self.special_symbol_functions[name]:
+            func(sym)
 
         return sym
 
@@ -155,15 +173,17 @@ class Board(GeneralGameState):
         for s in self.config.special_symbols:
             self.special_syms_on_board[s] = []
 
-    def get_special_symbols_on_board(self) -> None:
-        """Scans board for any active special symbols."""
+    def get_special_symbols_on_board(self, positions: List[tuple] = None) -> None:
+        """Scans board for any active special symbols.
+        positions optionally restricts the scan to known (reel, row) cells, in board order."""
         self.refresh_special_syms()
-        for reel, _ in enumerate(self.board):
-            for row, _ in enumerate(self.board[reel]):
-                if self.board[reel][row].defn.special:
-                    for specialType in list(self.special_syms_on_board.keys()):
-                        if self.board[reel][row].check_attribute(specialType):
-                            self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
+        if positions is None:
+            positions = [(reel, row) for reel in range(len(self.board)) for row in range(len(self.board[reel]))]
+        for reel, row in positions:
+            if self.board[reel][row].defn.special:
+                for specialType in list(self.special_syms_on_board.keys()):
+                    if self.board[reel][row].check_attribute(specialType):
+                        self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
 
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
@@ -196,17 +216,13 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = self.draw_condition("scatter_triggers")
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
             and self.gametype == self.config.basegame_type
         ):
-            self.create_board_reelstrips()
-            while self.count_special_symbols(trigger_symbol) >= min(
-                self.config.freespin_triggers[self.gametype].keys()
-            ):
-                self.create_board_reelstrips()
+            self.create_board_with_count(trigger_symbol, range(min(self.config.freespin_triggers[self.gametype])))
         else:
             self.create_board_reelstrips()
         if emit_event:
@@ -222,65 +238,14 @@ class Board(GeneralGameState):
             force_criteria: The type of symbol to force on the board. (e.g. "scatter")
             num_force_syms: The number of symbols to force on the board.
 
-        Note: If it is possible for two target symbols to appear on one reel, this method
-        will not be able to guarantee an exact number of target symbols or actually random
-        reel positions. I.e. Ensure the reels do not have stacked scatter symbols.
-        """
-        while True:
-            self._force_special_board(force_criteria, num_force_syms)
-            if (
-                force_criteria in self.config.special_symbols
-                and self.count_special_symbols(force_criteria) == num_force_syms
-            ):
-                break
-            elif (
-                not (force_criteria in self.config.special_symbols)
-                and self.count_symbols_on_board(force_criteria) == num_force_syms
-            ):
-                break
-
-    def _force_special_board(self, force_criteria: str, num_force_syms: int) -> None:
+        The board is drawn from the distribution of reel stops conditioned on showing exactly
+        num_force_syms target symbols, so reels which can show several target symbols are supported.
         """
-        Helper function for forcing special (or name specific) symbols
-        """
-        reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
-        reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
-
-        sym_prob = []
-        for x in range(self.config.num_reels):
-            sym_prob.append(len(reelstops[x]) / len(self.config.reels[reelstrip_id][x]))
-        force_stop_positions = {}
-        possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
-        possible_probs = [p for p in sym_prob if p > 0]
-
-        while len(force_stop_positions) != num_force_syms and len(possible_reels) > 0:
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
-            sym_prob[chosen_reel] = 0
-            force_stop_positions[int(chosen_reel)] = int(chosen_stop)
-            possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
-            possible_probs = [p for p in sym_prob if p > 0]
-
-        force_stop_positions = dict(sorted(force_stop_positions.items(), key=lambda x: x[0]))
-        self.force_board_from_reelstrips(reelstrip_id, force_stop_positions)
+        self.create_board_with_count(force_criteria, [num_force_syms])
 
     def get_syms_on_reel(self, reel_id: str, target_symbol: str) -> List[List]:
-        """Return reelstop positions for a specific symbol name."""
-        reel = self.config.reels[reel_id]
-        reelstop_positions = [[] for _ in range(self.config.num_reels)]
-        for r in range(self.config.num_reels):
-            for s in range(len(reel[r])):
-                if (
-                    target_symbol in self.config.special_symbols
-                    and reel[r][s] in self.config.special_symbols[target_symbol]
-                ):
-                    reelstop_positions[r].append(s)
-                elif reel[r][s] == target_symbol:
-                    reelstop_positions[r].append(s)
-
-        return reelstop_positions
+        """Return reelstop positions for a specific symbol name (or special symbol kind)."""
+        return [list(stops) for stops in self.get_reelstrip_table(reel_id).get_stop_positions(target_symbol)]
 
     def count_special_symbols(self, special_sym_criteria: str) -> int:
         "Returns integer number of active symbols of any 'special' kind."
@@ -316,7 +281,7 @@ class Board(GeneralGameState):
 
         assert len(free_positions) >= additional_count, "not enough free place for additional symbols"
 
-        new_positions = random.choices(free_positions, additional_count)[0]
-        random.shuffle(new_positions)
+        new_positions = self.rng.choices(free_positions, additional_count)[0]
+        self.rng.shuffle(new_positions)
         for np in new_positions:
             self.board[np[0]][np[1]] = self.create_symbol(symbol_name)
@@ -0,0 +1,59 @@
+"""Integer-coded board representation used by the win evaluators."""
+
+from array import array
+from src.calculations.symbol import SharedSymbol, WILD, SCATTER, MULTIPLIER, WILD_SYMBOL
+
+
+class BoardCodes:
+    """Flat symbol-id and attribute-flag arrays of a board of Symbol objects.
+
+    The symbol at board[reel][row] is stored at index offsets[reel] + row: codes holds the integer id of the
+    symbol name (SymbolDefinition.code) and flags the attribute bits above, so symbol matching in the win
+    evaluators is an integer comparison. The Symbol board is kept as `board`, for attribute values, and
+    symbol_names[code] is the name of a symbol id.
+
+    The encoding is a snapshot of the board. Evaluators encode the board they are passed, a BoardCodes object can
+    be passed instead to share the encoding between evaluators while the board is unchanged.
+    """
+
+    def __init__(self, board: list, wild_key: str = "wild", multiplier_key: str = "multiplier"):
+        self.board = board
+        self.wild_key = wild_key
+        self.multiplier_key = multiplier_key
+        self.num_rows = [len(reel) for reel in board]
+        self.symbol_names = board[0][0].defn.symbol_names if board and board[0] else ()
+
+        self.offsets, codes, flags = [], [], []
+        for reel in board:
+            self.offsets.append(len(codes))
+            for sym in reel:
+                codes.append(sym.defn.code)
+                if type(sym) is SharedSymbol:
+                    # Plain symbols have no special flags and cannot hold attributes
+                    flags.append(0)
+                else:
+                    flag, attribute_bits = sym.defn.get_board_flags(wild_key, multiplier_key)
+                    for bit, key in attribute_bits:
+                        if getattr(sym, key, None) not in (None, False):
+                            flag |= bit
+                    flags.append(flag)
+        self.codes = array("b", codes)
+        self.flags = array("b", flags)
+
+    @classmethod
+    def encode(cls, board, wild_key: str = None, multiplier_key: str = None) -> "BoardCodes":
+        """Return board if it is already encoded with the given keys (None matches any key), otherwise encode
+        the Symbol board."""
+        if isinstance(board, cls):
+            if wild_key in (None, board.wild_key) and multiplier_key in (None, board.multiplier_key):
+                return board
+            board = board.board
+        return cls(board, wild_key or "wild", multiplier_key or "multiplier")
+
+    def index(self, reel: int, row: int) -> int:
+        """Flat index of a board position."""
+        return self.offsets[reel] + row
+
+    def has_flag(self, reel: int, row: int, flag: int) -> bool:
+        """Check attribute flag bit(s) of a board position."""
+        return bool(self.flags[self.offsets[reel] + row] & flag)
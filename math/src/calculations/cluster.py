@@ -3,8 +3,9 @@ from abc import ABC
 from typing import List, Dict
 from src.calculations.board import Board
 from src.calculations.symbol import Symbol
+from src.calculations.board_codes import BoardCodes, WILD
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.wins.multiplier_strategy import apply_mults
 
 
 class Cluster:
@@ -24,138 +25,145 @@ class Cluster:
 
         return (reel_to_overlay, row_to_overlay)
 
-    @staticmethod
-    def get_neighbours(board: list[list[Symbol]], reel: int, row: int, local_checked: list) -> list:
-        """All neighbouring symbols within board range."""
-        neighbours = []
-        if reel > 0:
-            if (reel - 1, row) not in local_checked:
-                neighbours += [(reel - 1, row)]
-                local_checked += [(reel - 1, row)]
-        if reel < len(board) - 1:
-            if (reel + 1, row) not in local_checked:
-                neighbours += [(reel + 1, row)]
-                local_checked += [(reel + 1, row)]
-        if row > 0:
-            if (reel, row - 1) not in local_checked:
-                neighbours += [(reel, row - 1)]
-                local_checked += [(reel, row - 1)]
-        if row < len(board[reel]) - 1:
-            if (reel, row + 1) not in local_checked:
-                neighbours += [(reel, row + 1)]
-                local_checked += [(reel, row + 1)]
-        return neighbours
+    _neighbour_tables = {}
 
     @staticmethod
-    def in_cluster(board: list[list[Symbol]], reel: int, row: int, og_symbol: str, wild_key: str = "wild") -> bool:
-        """Checks if a symbol (including wilds) match cluster type."""
-        if board[reel][row].check_attribute(wild_key) or og_symbol == board[reel][row].name:
-            return True
+    def get_neighbour_table(num_rows: tuple) -> list:
+        """Per flat board index, the (index, reel, row) of all neighbouring positions within board range.
+        Neighbours are ordered left, right, above, below. Tables are cached per board shape."""
+        table = Cluster._neighbour_tables.get(num_rows)
+        if table is None:
+            offsets = [sum(num_rows[:reel]) for reel in range(len(num_rows))]
+            table = []
+            for reel, rows in enumerate(num_rows):
+                for row in range(rows):
+                    neighbours = []
+                    for reel_, row_ in ((reel - 1, row), (reel + 1, row), (reel, row - 1), (reel, row + 1)):
+                        if 0 <= reel_ < len(num_rows) and 0 <= row_ < num_rows[reel_]:
+                            neighbours.append((offsets[reel_] + row_, reel_, row_))
+                    table.append(tuple(neighbours))
+            Cluster._neighbour_tables[num_rows] = table
+        return table
 
     @staticmethod
-    def check_all_neighbours(
-        board: Board,
-        already_checked: list,
-        local_checked: list,
-        potential_cluster: list,
-        reel,
-        row,
-        og_symbol: str,
-        wild_key: str = "wild",
-    ):
-        """Recursively check neighbours for like-symbols."""
-        neighbours = Cluster.get_neighbours(board, reel, row, local_checked)
-        for reel_, row_ in neighbours:
-            if Cluster.in_cluster(board, reel_, row_, og_symbol, wild_key):
-                potential_cluster += [(reel_, row_)]
-                already_checked += [(reel_, row_)]
-                Cluster.check_all_neighbours(
-                    board,
-                    already_checked,
-                    local_checked,
-                    potential_cluster,
-                    reel_,
-                    row_,
-                    og_symbol,
-                    wild_key,
-                )
+    def in_cluster(board_codes: BoardCodes, reel: int, row: int, og_symbol: int) -> bool:
+        """Checks if a symbol (including wilds) match cluster type, og_symbol is the cluster symbol id."""
+        idx = board_codes.offsets[reel] + row
+        return bool(board_codes.flags[idx] & WILD) or board_codes.codes[idx] == og_symbol
 
     @staticmethod
-    def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
-        """Return all symbol clusters of size >= 1."""
-        already_checked = []
+    def get_clusters(board: list[list[Symbol]] | BoardCodes, wild_key: str = "wild") -> dict:
+        """Return all symbol clusters of size >= 1.
+
+        Iterative depth-first flood fill from each unchecked non-wild position, in board order. When a position
+        is expanded all of its unvisited neighbours are marked as visited, matching neighbours are then added
+        and expanded in left, right, above, below order. Wilds join every cluster they neighbour. Visited sets
+        are integer bitmasks over the flat board index.
+        """
+        board_codes = BoardCodes.encode(board, wild_key=wild_key)
+        board = board_codes.board
+        codes, flags = board_codes.codes, board_codes.flags
+        neighbour_table = Cluster.get_neighbour_table(tuple(board_codes.num_rows))
+        already_checked = 0
         clusters = defaultdict(list)
+        idx = 0
         for reel, _ in enumerate(board):
             for row, _ in enumerate(board[reel]):
-                if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
+                if not (already_checked >> idx) & 1 and not flags[idx] & WILD:
+                    symbol = codes[idx]
                     potential_cluster = [(reel, row)]
-                    already_checked += [(reel, row)]
-                    local_checked = [(reel, row)]
-                    symbol = board[reel][row].name
-                    Cluster.check_all_neighbours(
-                        board,
-                        already_checked,
-                        local_checked,
-                        potential_cluster,
-                        reel,
-                        row,
-                        symbol,
-                        wild_key,
-                    )
-                    clusters[symbol].append(potential_cluster)
+                    already_checked |= 1 << idx
+                    local_checked = 1 << idx
+
+                    # Each stack entry iterates the (claimed) neighbours of an expanded position
+                    neighbours = []
+                    for neighbour in neighbour_table[idx]:
+                        if not (local_checked >> neighbour[0]) & 1:
+                            local_checked |= 1 << neighbour[0]
+                            neighbours.append(neighbour)
+                    stack = [iter(neighbours)]
+                    while stack:
+                        for idx_, reel_, row_ in stack[-1]:
+                            if flags[idx_] & WILD or codes[idx_] == symbol:
+                                potential_cluster.append((reel_, row_))
+                                already_checked |= 1 << idx_
+                                neighbours = []
+                                for neighbour in neighbour_table[idx_]:
+                                    if not (local_checked >> neighbour[0]) & 1:
+                                        local_checked |= 1 << neighbour[0]
+                                        neighbours.append(neighbour)
+                                stack.append(iter(neighbours))
+                                break
+                        else:
+                            stack.pop()
+
+                    clusters[board[reel][row].name].append(potential_cluster)
+                idx += 1
 
         return clusters
 
     @staticmethod
     def evaluate_clusters(
         config: Config,
-        board: list[list[Symbol]],
+        board: list[list[Symbol]] | BoardCodes,
         clusters: dict,
         global_multiplier: int = 1,
         multiplier_key: str = "multiplier",
         return_data: dict = {"totalWin": 0, "wins": []},
+        multiplier_strategy: str = "cluster",
+        **strategy_kwargs,
     ) -> type:
-        """Determine payout amount from cluster, including symbol multiplier and global multiplier value."""
-        exploding_symbols = []
-        total_win = 0
+        """Determine payout amount from cluster, including symbol multiplier and global multiplier value.
+        Cluster multipliers are applied with a registered multiplier strategy, by default "cluster" (added symbol
+        multipliers). Additional keyword arguments are passed on to the strategy."""
+        board_codes = BoardCodes.encode(board, multiplier_key=multiplier_key)
+        board = board_codes.board
+        paying_clusters = []
         for sym in clusters:
             for cluster in clusters[sym]:
-                syms_in_cluster = len(cluster)
-                if (syms_in_cluster, sym) in config.paytable:
-                    cluster_mult = 0
-                    for positions in cluster:
-                        if board[positions[0]][positions[1]].check_attribute(multiplier_key):
-                            if int(board[positions[0]][positions[1]].get_attribute(multiplier_key)) > 0:
-                                cluster_mult += board[positions[0]][positions[1]].get_attribute(multiplier_key)
-                    cluster_mult = max(cluster_mult, 1)
-                    sym_win = config.paytable[(syms_in_cluster, sym)]
-                    symwin_mult = sym_win * cluster_mult * global_multiplier
-                    total_win += symwin_mult
-                    json_positions = [{"reel": p[0], "row": p[1]} for p in cluster]
-
-                    central_pos = Cluster.get_central_cluster_position(json_positions)
-                    return_data["wins"] += [
-                        {
-                            "symbol": sym,
-                            "clusterSize": syms_in_cluster,
-                            "win": symwin_mult,
-                            "positions": json_positions,
-                            "meta": {
-                                "globalMult": global_multiplier,
-                                "clusterMult": cluster_mult,
-                                "winWithoutMult": sym_win,
-                                "overlay": {"reel": central_pos[0], "row": central_pos[1]},
-                            },
-                        }
-                    ]
-
-                    for positions in cluster:
-                        board[positions[0]][positions[1]].explode = True
-                        if {
-                            "reel": positions[0],
-                            "row": positions[1],
-                        } not in exploding_symbols:
-                            exploding_symbols.append({"reel": positions[0], "row": positions[1]})
+                if (len(cluster), sym) in config.paytable:
+                    paying_clusters.append((sym, cluster, [{"reel": p[0], "row": p[1]} for p in cluster]))
+        cluster_wins = apply_mults(
+            board_codes,
+            multiplier_strategy,
+            [(config.paytable[(len(cluster), sym)], positions) for sym, cluster, positions in paying_clusters],
+            global_multiplier=global_multiplier,
+            multiplier_key=multiplier_key,
+            **strategy_kwargs,
+        )
+
+        exploding_symbols = []
+        total_win = 0
+        for (sym, cluster, json_positions), (symwin_mult, cluster_mult) in zip(paying_clusters, cluster_wins):
+            syms_in_cluster = len(cluster)
+            sym_win = config.paytable[(syms_in_cluster, sym)]
+            total_win += symwin_mult
+
+            central_pos = Cluster.get_central_cluster_position(json_positions)
+            return_data["wins"] += [
+                {
+                    "symbol": sym,
+                    "clusterSize": syms_in_cluster,
+                    "win": symwin_mult,
+                    "positions": json_positions,
+                    "meta": {
+                        "globalMult": global_multiplier,
+                        "clusterMult": cluster_mult,
+                        "winWithoutMult": sym_win,
+                        "overlay": {"reel": central_pos[0], "row": central_pos[1]},
+                    },
+                }
+            ]
+
+            for positions in cluster:
+                board[positions[0]][positions[1]] = board[positions[0]][positions[1]].assign_attribute(
+                    {"explode": True}
+                )
+                if {
+                    "reel": positions[0],
+                    "row": positions[1],
+                } not in exploding_symbols:
+                    exploding_symbols.append({"reel": positions[0], "row": positions[1]})
 
         return board, return_data, total_win
 
@@ -168,6 +176,7 @@ class Cluster:
         wild_key: str = "wild",
     ) -> None:
         """Event-ready win information."""
+        board = BoardCodes.encode(board, wild_key=wild_key, multiplier_key=multiplier_key)
         clusters = Cluster.get_clusters(board, wild_key)
         return_data = {
             "totalWin": 0,
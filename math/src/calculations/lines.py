@@ -1,8 +1,10 @@
 """Evaluates and records winds for lines games."""
 
+import copy
 from src.calculations.symbol import Symbol
+from src.calculations.board_codes import BoardCodes, WILD
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.wins.multiplier_strategy import apply_mults
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -10,6 +12,52 @@ from src.events.events import (
 )
 
 
+class CompiledLines:
+    """Paylines and paytable of a config, compiled for evaluation on BoardCodes.
+
+    line_indices holds the flat board index of every payline position and pays[code][kind] the paytable value
+    of a symbol id (0 if it does not pay). Compiled once per config, symbol set and board shape, and compiled again
+    when the paylines or paytable of the config change.
+    """
+
+    _compiled = {}
+
+    def __init__(self, config: Config, symbol_names: tuple, num_rows: tuple):
+        self.config = config
+        self.paylines = copy.deepcopy(config.paylines)
+        self.paytable = dict(config.paytable)
+        offsets = [sum(num_rows[:reel]) for reel in range(len(num_rows))]
+        self.line_ids = list(config.paylines.keys())
+        self.lines = [config.paylines[line_id] for line_id in self.line_ids]
+        self.line_indices = [tuple(offsets[reel] + row for reel, row in enumerate(line)) for line in self.lines]
+
+        self.max_kind = max([len(line) for line in self.lines] + [kind for kind, _ in config.paytable])
+        self.symbol_pays = {}
+        for (kind, name), value in config.paytable.items():
+            self.get_symbol_pays(name)[kind] = value
+        self.pays = [self.get_symbol_pays(name) for name in symbol_names]
+
+    @classmethod
+    def get(cls, config: Config, board_codes: BoardCodes) -> "CompiledLines":
+        """Cached compiled lines for the config and the symbol set and shape of the board."""
+        key = (id(config), board_codes.symbol_names, tuple(board_codes.num_rows))
+        compiled = cls._compiled.get(key)
+        if compiled is None or not compiled.matches(config):
+            compiled = cls(config, board_codes.symbol_names, tuple(board_codes.num_rows))
+            cls._compiled[key] = compiled
+        return compiled
+
+    def matches(self, config: Config) -> bool:
+        """Check the lines were compiled from config and its current paylines and paytable."""
+        return self.config is config and self.paytable == config.paytable and self.paylines == config.paylines
+
+    def get_symbol_pays(self, name: str) -> list:
+        """Paytable values of a symbol name indexed by kind."""
+        if name not in self.symbol_pays:
+            self.symbol_pays[name] = [0] * (self.max_kind + 1)
+        return self.symbol_pays[name]
+
+
 class Lines:
     """Collection of functions to handle line-win games."""
 
@@ -26,7 +74,7 @@ class Lines:
 
     @staticmethod
     def get_lines(
-        board: list[list[Symbol]],
+        board: list[list[Symbol]] | BoardCodes,
         config: Config,
         wild_key: str = "wild",
         wild_sym: str = "W",
@@ -39,89 +87,65 @@ class Lines:
             "wins": [],
         }
 
-        for line_index in config.paylines.keys():
-            line = config.paylines[line_index]
-            first_sym = board[0][line[0]]
-            finished_wild_win = False if first_sym.check_attribute(wild_key) else True
-            first_non_wild = first_sym if finished_wild_win else None
-            potential_line = [first_sym]
-
-            wild_matches = 0 * (finished_wild_win) + 1 * (not (finished_wild_win))
-            matches = 1 * (finished_wild_win) + 0 * (not (finished_wild_win))
-            base_win, wild_win = 0, 0
-
-            for reel in range(1, len(line)):
-                sym = board[reel][line[reel]]
-                if finished_wild_win:
-                    if sym.name == first_non_wild.name or sym.check_attribute(wild_key):
-                        matches += 1
-                    else:
-                        break
-                else:
-                    if sym.check_attribute(wild_key) and first_non_wild is None:
-                        wild_matches += 1
-                    elif first_non_wild is None:
-                        first_non_wild = sym
+        board_codes = BoardCodes.encode(board, wild_key=wild_key)
+        board = board_codes.board
+        codes, flags = board_codes.codes, board_codes.flags
+        compiled = CompiledLines.get(config, board_codes)
+        pays, wild_pays = compiled.pays, compiled.get_symbol_pays(wild_sym)
+        paying_lines = []
+        for line_index, line, line_indices in zip(compiled.line_ids, compiled.lines, compiled.line_indices):
+            # Leading wilds, then the first non-wild symbol and all following matching symbols or wilds
+            wild_matches = 0
+            for idx in line_indices:
+                if not flags[idx] & WILD:
+                    break
+                wild_matches += 1
+
+            matches, first_code = 0, None
+            if wild_matches < len(line_indices):
+                first_code = codes[line_indices[wild_matches]]
+                matches = 1
+                for idx in line_indices[wild_matches + 1 :]:
+                    if codes[idx] == first_code or flags[idx] & WILD:
                         matches += 1
-                        finished_wild_win = True
                     else:
                         break
-                potential_line.append(sym)
 
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
-            if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
+            wild_win = wild_pays[wild_matches]
+            base_win = pays[first_code][wild_matches + matches] if first_code is not None else 0
 
             if base_win > 0 or wild_win > 0:
                 if wild_win > base_win:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board,
-                        multiplier_method,
-                        global_multiplier=global_multiplier,
-                        win_amount=wild_win,
-                        positions=positions,
-                    )
-                    win_dict = Lines.line_win_info(
-                        potential_line[0].name,
-                        wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": wild_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
+                    kind, win_symbol, line_pay = wild_matches, board[0][line[0]].name, wild_win
                 else:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, matches + wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board,
-                        multiplier_method,
-                        global_multiplier=global_multiplier,
-                        win_amount=base_win,
-                        positions=positions,
-                    )
-                    win_dict = Lines.line_win_info(
-                        first_non_wild.name,
-                        matches + wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": base_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
-
-                return_data["totalWin"] += line_win
-                return_data["wins"].append(win_dict)
+                    kind, win_symbol, line_pay = matches + wild_matches, board_codes.symbol_names[first_code], base_win
+                positions = [{"reel": idx, "row": line[idx]} for idx in range(0, kind)]
+                paying_lines.append((line_index, win_symbol, kind, line_pay, positions))
+
+        line_wins = apply_mults(
+            board_codes,
+            multiplier_method,
+            [(line_pay, positions) for _, _, _, line_pay, positions in paying_lines],
+            global_multiplier=global_multiplier,
+        )
+        for (line_index, win_symbol, kind, line_pay, positions), (line_win, applied_mult) in zip(
+            paying_lines, line_wins
+        ):
+            win_dict = Lines.line_win_info(
+                win_symbol,
+                kind,
+                line_win,
+                positions,
+                {
+                    "lineIndex": line_index,
+                    "multiplier": applied_mult,
+                    "winWithoutMult": line_pay,
+                    "globalMult": int(global_multiplier),
+                    "lineMultiplier": int(applied_mult / global_multiplier),
+                },
+            )
+            return_data["totalWin"] += line_win
+            return_data["wins"].append(win_dict)
 
         return return_data
 
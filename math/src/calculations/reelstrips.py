@@ -0,0 +1,132 @@
+"""Precomputed reelstrip tables used for board generation."""
+
+from typing import Iterable, List
+
+
+class ReelstripTable:
+    """Symbol windows of a single reelstrip, precomputed for every stop position.
+
+    For each reel and stop position the table holds the visible symbol names, the padding symbols directly
+    above and below the window, and the rows holding special symbols. A board draw is then a table lookup
+    per reel instead of modular indexing and a scan over all special symbol names for every cell.
+    """
+
+    def __init__(self, config: object, reelstrip: List[List[str]]):
+        self.reelstrip = reelstrip
+        self.lengths = [len(reel) for reel in reelstrip]
+
+        # Special kinds (in config order, repeated if listed more than once) each symbol name is registered under
+        self.special_matches = {}
+        for special_symbol, names in config.special_symbols.items():
+            for name in names:
+                self.special_matches.setdefault(name, []).append(special_symbol)
+
+        self.windows, self.top_padding, self.bottom_padding, self.special_rows = [], [], [], []
+        for reel, strip in enumerate(reelstrip[: config.num_reels]):
+            num_rows, length = config.num_rows[reel], len(strip)
+            windows, special_rows = [], []
+            for stop in range(length):
+                window = tuple(strip[(stop + row) % length] for row in range(num_rows))
+                windows.append(window)
+                special_rows.append(tuple(row for row, name in enumerate(window) if name in self.special_matches))
+            self.windows.append(windows)
+            self.special_rows.append(special_rows)
+            self.top_padding.append([strip[(stop - 1) % length] for stop in range(length)])
+            self.bottom_padding.append([strip[(stop + num_rows) % length] for stop in range(length)])
+
+        # Stop positions (and their share of the reel) of every symbol name and special symbol kind, per reel
+        num_reels = len(self.windows)
+        stop_positions = {}
+        for reel, strip in enumerate(reelstrip[:num_reels]):
+            for stop, name in enumerate(strip):
+                for target in {name, *self.special_matches.get(name, ())}:
+                    stop_positions.setdefault(target, [[] for _ in range(num_reels)])[reel].append(stop)
+        self.symbol_names = {name for strip in reelstrip[:num_reels] for name in strip}
+        self.stop_positions = {target: tuple(map(tuple, stops)) for target, stops in stop_positions.items()}
+        self.stop_probabilities = {
+            target: tuple(len(reel_stops) / self.lengths[reel] for reel, reel_stops in enumerate(stops))
+            for target, stops in self.stop_positions.items()
+        }
+
+        self.count_tables = {}
+
+    def get_stop_positions(self, target: str) -> tuple:
+        """Sorted stop positions per reel at which a symbol name, or any symbol of a special kind, is on the strip."""
+        if target in self.stop_positions:
+            return self.stop_positions[target]
+        return tuple(() for _ in self.windows)
+
+    def get_count_table(self, criteria: str, target_names: Iterable[str]) -> "StopCountTable":
+        """Cached StopCountTable of the symbols matching criteria (a special symbol kind or symbol name)."""
+        table = self.count_tables.get(criteria)
+        if table is None:
+            table = StopCountTable(self.windows, set(target_names))
+            self.count_tables[criteria] = table
+        return table
+
+
+class StopCountTable:
+    """Distribution of the number of target symbols shown on the board, over all reel stop combinations.
+
+    stops_by_count[reel][count] lists the stop positions of a reel whose window shows count target symbols.
+    combinations[reel][total] is the number of stop combinations of reels reel, reel + 1, ... showing total
+    target symbols, built by convolving the per-reel count histograms. Sampling the reels in order, weighted by
+    the combinations of the remaining reels, draws uniformly from all stop combinations with the requested total.
+    """
+
+    def __init__(self, windows: List[List[tuple]], target_names: set):
+        self.stops_by_count = []
+        for reel_windows in windows:
+            stops_by_count = []
+            for stop, window in enumerate(reel_windows):
+                count = sum(1 for name in window if name in target_names)
+                while len(stops_by_count) <= count:
+                    stops_by_count.append([])
+                stops_by_count[count].append(stop)
+            self.stops_by_count.append(stops_by_count)
+
+        self.combinations = [[1]]
+        for stops_by_count in reversed(self.stops_by_count):
+            remaining = self.combinations[0]
+            combinations = [0] * (len(remaining) + len(stops_by_count) - 1)
+            for count, stops in enumerate(stops_by_count):
+                for total, num in enumerate(remaining):
+                    combinations[count + total] += len(stops) * num
+            self.combinations.insert(0, combinations)
+
+    def count_combinations(self, totals: Iterable[int]) -> int:
+        """Number of stop combinations showing any of the given totals."""
+        return sum(self.combinations[0][total] for total in totals if 0 <= total < len(self.combinations[0]))
+
+    def num_combinations(self) -> int:
+        """Number of all stop combinations."""
+        return sum(self.combinations[0])
+
+    def sample(self, rng, totals: Iterable[int]) -> List[int]:
+        """Uniformly draw stop positions from all combinations showing one of the given totals."""
+        totals = [total for total in totals if 0 <= total < len(self.combinations[0])]
+        if self.count_combinations(totals) == 0:
+            raise ValueError(f"No reel stop combination shows {totals} target symbols")
+        total = totals[choose_weighted(rng, [self.combinations[0][t] for t in totals])]
+
+        stops = []
+        for reel, stops_by_count in enumerate(self.stops_by_count):
+            remaining = self.combinations[reel + 1]
+            weights = [
+                len(count_stops) * remaining[total - count] if 0 <= total - count < len(remaining) else 0
+                for count, count_stops in enumerate(stops_by_count)
+            ]
+            count = choose_weighted(rng, weights)
+            stops.append(stops_by_count[count][rng.randrange(len(stops_by_count[count]))])
+            total -= count
+        return stops
+
+
+def choose_weighted(rng, weights: List[int]) -> int:
+    """Index drawn with probability proportional to (integer) weights, exact for arbitrarily large weights."""
+    draw = rng.randrange(sum(weights))
+    for index, weight in enumerate(weights):
+        if draw < weight:
+            return index
+        draw -= weight
+    raise ValueError("weights must be positive")
@@ -4,6 +4,7 @@ from typing import List, Dict
 from collections import defaultdict
 from src.config.config import Config
 from src.calculations.symbol import Symbol
+from src.calculations.board_codes import BoardCodes, MULTIPLIER, WILD_SYMBOL
 
 
 class Scatter:
@@ -34,7 +35,7 @@ class Scatter:
     @staticmethod
     def get_scatterpay_wins(
         config: Config,
-        board: list[list[Symbol]],
+        board: list[list[Symbol]] | BoardCodes,
         wild_key: str = "wild",
         multiplier_key: str = "multiplier",
         global_multiplier: int = 1,
@@ -44,16 +45,24 @@ class Scatter:
             "totalWin": 0,
             "wins": [],
         }
+        board_codes = BoardCodes.encode(board, wild_key=wild_key, multiplier_key=multiplier_key)
+        board = board_codes.board
+        flags = board_codes.flags
         rows_for_overlay = []
-        symbols_on_board = defaultdict(list)
+        positions_by_code = defaultdict(list)
         wild_positions = []
         total_win = 0.0
         for reel_idx, reel in enumerate(board):
-            for row_idx, symbol in enumerate(reel):
-                if symbol.name not in config.special_symbols[wild_key]:
-                    symbols_on_board[symbol.name].append({"reel": reel_idx, "row": row_idx})
+            offset = board_codes.offsets[reel_idx]
+            for row_idx, _ in enumerate(reel):
+                if not flags[offset + row_idx] & WILD_SYMBOL:
+                    positions_by_code[board_codes.codes[offset + row_idx]].append({"reel": reel_idx, "row": row_idx})
                 else:
                     wild_positions.append({"reel": reel_idx, "row": row_idx})
+        symbols_on_board = {
+            board[positions[0]["reel"]][positions[0]["row"]].name: positions
+            for positions in positions_by_code.values()
+        }
 
         # Update all symbol positions with wilds, as this symbol is shared
         for sym in symbols_on_board:
@@ -63,10 +72,10 @@ class Scatter:
             if (win_size, sym) in config.paytable:
                 symbol_mult = 0
                 for p in symbols_on_board[sym]:
-                    if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
+                    if board_codes.has_flag(p["reel"], p["row"], MULTIPLIER):
                         symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
 
-                    board[p["reel"]][p["row"]].explode = True
+                    board[p["reel"]][p["row"]] = board[p["reel"]][p["row"]].assign_attribute({"explode": True})
 
                 symbol_mult = max(symbol_mult, 1)
                 overlay_position = Scatter.get_central_scatter_position(
@@ -1,13 +1,135 @@
 import random
+import hashlib
+from collections import OrderedDict
 from typing import Union
 
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+def derive_rng_seed(betmode: str, sim_seed: int, attempt: int) -> int:
+    """Counter-based seed for a single simulation attempt, independent of how simulations are scheduled."""
+    digest = hashlib.sha256(f"{betmode}:{sim_seed}:{attempt}".encode()).digest()
+    return int.from_bytes(digest[:16], "little")
+
+
+class AliasTable:
+    """Walker/Vose alias table, draws a value from a weighted distribution with a single uniform number in O(1)."""
+
+    def __init__(self, distribution: dict):
+        self.values = list(distribution.keys())
+        n = len(self.values)
+        total = sum(distribution.values())
+        scaled = [weight * n / total for weight in distribution.values()]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+    def sample(self, rng) -> Union[float, int]:
+        """Draw a single value."""
+        u = rng.random() * len(self.values)
+        i = int(u)
+        return self.values[i] if (u - i) < self.prob[i] else self.values[self.alias[i]]
+
+    def sample_k(self, rng, k: int) -> list:
+        """Draw k values."""
+        n, values, prob, alias, draw = len(self.values), self.values, self.prob, self.alias, rng.random
+        outcomes = []
+        for _ in range(k):
+            u = draw() * n
+            i = int(u)
+            outcomes.append(values[i] if (u - i) < prob[i] else values[alias[i]])
+        return outcomes
+
+
+class AliasWeights(dict):
+    """Weights {value: weight} keeping their alias table, which is rebuilt on the first draw after any change."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stale = True
+        self._table = None
+
+    def get_alias_table(self) -> Union[AliasTable, None]:
+        """Return the alias table of the current weights, None if no weight is positive."""
+        if self._stale:
+            self._table = AliasTable(self) if len(self) > 0 and sum(self.values()) > 0 else None
+            self._stale = False
+        return self._table
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._stale = True
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._stale = True
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._stale = True
+
+    def pop(self, *args):
+        self._stale = True
+        return super().pop(*args)
+
+    def popitem(self):
+        self._stale = True
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._stale = True
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._stale = True
+
+
+ALIAS_CACHE_SIZE = 1024
+_alias_cache = OrderedDict()
+
+
+def get_alias_table(distribution: dict) -> Union[AliasTable, None]:
+    """Return the alias table of a distribution, None if no weight is positive. AliasWeights keep their own table,
+    tables of other dicts are cached by content (least recently used tables beyond ALIAS_CACHE_SIZE are dropped)."""
+    if isinstance(distribution, AliasWeights):
+        return distribution.get_alias_table()
+    key = tuple(distribution.items())
+    if key in _alias_cache:
+        _alias_cache.move_to_end(key)
+        return _alias_cache[key]
+    table = AliasTable(distribution) if len(distribution) > 0 and sum(distribution.values()) > 0 else None
+    _alias_cache[key] = table
+    if len(_alias_cache) > ALIAS_CACHE_SIZE:
+        _alias_cache.popitem(last=False)
+    return table
+
+
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng: random.Random = None) -> Union[float, int]:
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    Draws from the global random module unless a (simulation) rng is passed. Uses the alias table of the
+    distribution (see get_alias_table), unless a custom totalWeight is given."""
     assert isinstance(distribution, dict), "distribution must be of type: dict "
+    if rng is None:
+        rng = random
     if totalWeight is None:
+        table = get_alias_table(distribution)
+        if table is not None:
+            return table.sample(rng)
         totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
+    roll = rng.uniform(0, totalWeight)
     cumulative = 0.0
     for value, weight in distribution.items():
         cumulative += weight
@@ -17,6 +139,16 @@ def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[f
     return Exception("error drawing item from distribution")
 
 
+def get_random_outcomes(distribution: dict, k: int, rng: random.Random = None) -> list:
+    """Returns k independent draws from a distribution passed as a dictionary: {value : weight, ...}"""
+    assert isinstance(distribution, dict), "distribution must be of type: dict "
+    if rng is None:
+        rng = random
+    table = get_alias_table(distribution)
+    assert table is not None, "distribution must have a positive total weight"
+    return table.sample_k(rng, k)
+
+
 def get_mean_std_median(dist: dict) -> tuple[float, float, float]:
     """Returns mean and standard deviation from an ordered win-distribution."""
     total = 0
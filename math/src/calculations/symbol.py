@@ -1,5 +1,11 @@
 """Handle symbol classes and initial generation."""
 
+# BoardCodes attribute flag bits
+WILD = 1  # check_attribute(wild_key)
+SCATTER = 2  # check_attribute("scatter")
+MULTIPLIER = 4  # check_attribute(multiplier_key)
+WILD_SYMBOL = 8  # symbol name is listed in config.special_symbols[wild_key]
+
 
 class SymbolDefinition:
     """Define symbol class object structure."""
@@ -10,10 +16,15 @@ class SymbolDefinition:
         "is_paying",
         "paytable",
         "special_flags",
+        "code",
+        "symbol_names",
+        "board_flags",
     )
 
-    def __init__(self, name, config, paytable):
+    def __init__(self, name, config, paytable, code=0, symbol_names=None):
         self.name = name
+        self.code = code
+        self.symbol_names = symbol_names  # names of all registered symbols, indexed by code
 
         self.special_flags = set()
         for prop, symbols in config.special_symbols.items():
@@ -21,6 +32,7 @@ class SymbolDefinition:
                 self.special_flags.add(prop)
 
         self.special = bool(self.special_flags)
+        self.board_flags = {}  # (wild_key, multiplier_key): get_board_flags() result
 
         if paytable:
             self.is_paying = True
@@ -29,6 +41,20 @@ class SymbolDefinition:
             self.is_paying = False
             self.paytable = None
 
+    def get_board_flags(self, wild_key: str = "wild", multiplier_key: str = "multiplier") -> tuple:
+        """BoardCodes flag bits set by the special flags of the symbol, and the (bit, attribute) pairs which depend
+        on attribute values of the symbol instance. Together these match Symbol.check_attribute()."""
+        key = (wild_key, multiplier_key)
+        if key not in self.board_flags:
+            flag, attribute_bits = WILD_SYMBOL * (wild_key in self.special_flags), []
+            for bit, attribute in ((WILD, wild_key), (SCATTER, "scatter"), (MULTIPLIER, multiplier_key)):
+                if attribute in self.special_flags:
+                    flag |= bit
+                else:
+                    attribute_bits.append((bit, attribute))
+            self.board_flags[key] = (flag, tuple(attribute_bits))
+        return self.board_flags[key]
+
 
 class Symbol:
     """Symbol attributes must exist is __slots__ list."""
@@ -94,10 +120,11 @@ class Symbol:
         """Get attribute value (must exist)."""
         return getattr(self, attr)
 
-    def assign_attribute(self, attribute_dict: dict) -> None:
-        """Assign attribute value to symbol."""
+    def assign_attribute(self, attribute_dict: dict) -> "Symbol":
+        """Assign attribute value to symbol, returns the (possibly copied) symbol holding the new values."""
         for prop, value in attribute_dict.items():
             setattr(self, prop, value)
+        return self
 
     def assign_default_attribute(self):
         "Set inital __slots__ properties"
@@ -115,6 +142,35 @@ class Symbol:
                     self.prize = 0
 
 
+class SharedSymbol(Symbol):
+    """Immutable symbol instance, shared by every board position holding the same plain symbol.
+
+    Attributes cannot be set directly. assign_attribute() returns a new mutable Symbol (copy-on-write),
+    which must be stored back on the board in place of the shared instance.
+    """
+
+    __slots__ = ("_frozen",)
+
+    def __init__(self, defn: SymbolDefinition):
+        super().__init__(defn)
+        self._frozen = True
+
+    def __setattr__(self, prop, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(
+                f"Symbol '{self.name}' is a shared instance, use board[reel][row] = symbol.assign_attribute(...)"
+            )
+        super().__setattr__(prop, value)
+
+    def __reduce__(self):
+        # Slot restore would be blocked by _frozen, rebuild from the definition instead (pickle, copy, deepcopy)
+        return (SharedSymbol, (self.defn,))
+
+    def assign_attribute(self, attribute_dict: dict) -> Symbol:
+        """Copy the symbol and assign attribute values to the copy."""
+        return Symbol(self.defn).assign_attribute(attribute_dict)
+
+
 class SymbolStorage:
     """Initial symbol generation from configuration file."""
 
@@ -124,16 +180,34 @@ class SymbolStorage:
         for (kind, sym), val in config.paytable.items():
             paytable_by_symbol.setdefault(sym, []).append({str(kind): val})
 
+        # Integer symbol ids (used by BoardCodes) follow the sorted symbol names
+        assert len(all_symbols) <= 127, "symbol ids must fit in a signed byte"
+        self.symbol_names = tuple(sorted(all_symbols))
         self.symbol_defs = {}
-        for name in all_symbols:
+        for code, name in enumerate(self.symbol_names):
             self.symbol_defs[name] = SymbolDefinition(
                 name=name,
                 config=config,
                 paytable=paytable_by_symbol.get(name),
+                code=code,
+                symbol_names=self.symbol_names,
             )
-
-    def create_symbol(self, name: str):
-        """Create a new instance of symbol class."""
+            self.symbol_defs[name].get_board_flags()
+
+        # Symbols without special flags carry no per-instance state, so one instance is shared per name
+        self.shared_symbols = {}
+        if getattr(config, "share_plain_symbols", True):
+            for name, defn in self.symbol_defs.items():
+                if not defn.special:
+                    self.shared_symbols[name] = SharedSymbol(defn)
+
+    def create_symbol(self, name: str, mutable: bool = False):
+        """Return the shared instance of a plain symbol, or a new instance of symbol class.
+
+        mutable=True always returns a new instance, for symbols which are modified after creation.
+        """
+        if not mutable and name in self.shared_symbols:
+            return self.shared_symbols[name]
         try:
             return Symbol(self.symbol_defs[name])
         except KeyError:
@@ -1,7 +1,7 @@
 """Ways wins executables/calculations."""
 
-from collections import defaultdict
 from src.calculations.symbol import Symbol
+from src.calculations.board_codes import BoardCodes, MULTIPLIER, WILD_SYMBOL
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 from src.events.events import (
@@ -17,7 +17,7 @@ class Ways:
     @staticmethod
     def get_ways_data(
         config: Config,
-        board: list[list[Symbol]],
+        board: list[list[Symbol]] | BoardCodes,
         wild_key: str = "wild",
         global_multiplier: int = 1,
         multiplier_key: str = "multiplier",
@@ -29,73 +29,70 @@ class Ways:
             "wins": [],
         }
         assert multiplier_strategy in ["symbol", "board", "global"]
+        board_codes = BoardCodes.encode(board, wild_key=wild_key, multiplier_key=multiplier_key)
+        board = board_codes.board
+        codes, flags, offsets = board_codes.codes, board_codes.flags, board_codes.offsets
+        num_reels = len(board)
         board_mult_count = 0
-        potential_wins = defaultdict()
-        wilds = [[] for _ in range(len(board))]
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                sym = board[reel][row]
-                if reel == 0 and sym.name not in potential_wins:
-                    potential_wins[sym.name] = [[] for _ in range(len(board))]
-                    potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
-                elif sym.name in potential_wins:
-                    potential_wins[sym.name][reel].append({"reel": reel, "row": row})
-
-                if sym.name in config.special_symbols[wild_key]:
-                    wilds[reel].append({"reel": reel, "row": row})
-                    if board[reel][row].check_attribute(multiplier_key):
-                        wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
-
-        for symbol in potential_wins:
-            kind, ways, cumulative_sym_mult = (0, 1, 0)
-            for reel, _ in enumerate(potential_wins[symbol]):
-                if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
-                    kind += 1
-                    reel_sym_count = 0
-                    # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
-                    symbols_have_mult = False
-                    for s in potential_wins[symbol][reel]:
-                        if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
-                            symbols_have_mult = True
-
-                    if symbols_have_mult is False:
-                        reel_sym_count += len(potential_wins[symbol][reel])
+
+        # Single board pass: per reel counts of every symbol on the first reel, multiplier sums and wild counts
+        symbol_counts = {}  # symbol id -> count per reel
+        symbol_mults = {}  # (symbol id, reel) -> [sum of (multiplier - 1), board multiplier], if multipliers landed
+        wild_rows = [[] for _ in range(num_reels)]
+        wild_symbol_count = [0] * num_reels  # wilds counted with their multiplier value ("symbol" strategy)
+        wild_mult = [0] * num_reels  # sum of wild multipliers > 1
+        for reel in range(num_reels):
+            offset = offsets[reel]
+            for row in range(board_codes.num_rows[reel]):
+                code, flag = codes[offset + row], flags[offset + row]
+                if reel == 0 and code not in symbol_counts:
+                    symbol_counts[code] = [0] * num_reels
+                if code in symbol_counts:
+                    symbol_counts[code][reel] += 1
+                    if flag & MULTIPLIER:
+                        mult = board[reel][row].get_attribute(multiplier_key)
+                        reel_mults = symbol_mults.setdefault((code, reel), [0, 0])
+                        reel_mults[0] += mult - 1
+                        reel_mults[1] += mult * (mult > 1)
+
+                if flag & WILD_SYMBOL:
+                    wild_rows[reel].append(row)
+                    if flag & MULTIPLIER:
+                        mult = board[reel][row].get_attribute(multiplier_key)
+                        wild_symbol_count[reel] += mult
+                        wild_mult[reel] += mult * (mult > 1)
                     else:
-                        reel_sym_count = 0
-                        for s in potential_wins[symbol][reel]:
-                            if (
-                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                and multiplier_strategy == "symbol"
-                            ):
-                                reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                            else:
-                                reel_sym_count += 1
-                                if (
-                                    board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                    and multiplier_strategy == "board"
-                                ):
-                                    gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                                    board_mult_count += gm * (gm > 1)
-
-                    if len(wilds[reel]) > 0:
-                        for sym in wilds[reel]:
-                            if board[sym["reel"]][sym["row"]].check_attribute(
-                                multiplier_key
-                            ) and multiplier_strategy in ["board", "symbol"]:
-                                wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
-                                cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
-                                if multiplier_strategy == "board":
-                                    reel_sym_count += 1
-                                    board_mult_count += wild_mult_val * (wild_mult_val > 1)
-                                else:
-                                    reel_sym_count += wild_mult_val
-                            else:
-                                reel_sym_count += 1
-
-                    ways *= reel_sym_count
-
-                else:
+                        wild_symbol_count[reel] += 1
+
+        for code, reel_counts in symbol_counts.items():
+            symbol = board_codes.symbol_names[code]
+            kind, ways, cumulative_sym_mult = (0, 1, 0)
+            for reel in range(num_reels):
+                num_wilds = len(wild_rows[reel])
+                if reel_counts[reel] == 0 and num_wilds == 0:
                     break
+                kind += 1
+                reel_sym_count = reel_counts[reel]
+                # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
+                if (code, reel) in symbol_mults:
+                    if multiplier_strategy == "symbol":
+                        reel_sym_count += symbol_mults[(code, reel)][0]
+                    elif multiplier_strategy == "board":
+                        board_mult_count += symbol_mults[(code, reel)][1]
+
+                if num_wilds > 0:
+                    match multiplier_strategy:
+                        case "symbol":
+                            reel_sym_count += wild_symbol_count[reel]
+                            cumulative_sym_mult += wild_mult[reel]
+                        case "board":
+                            reel_sym_count += num_wilds
+                            board_mult_count += wild_mult[reel]
+                            cumulative_sym_mult += wild_mult[reel]
+                        case "global":
+                            reel_sym_count += num_wilds
+
+                ways *= reel_sym_count
 
             match multiplier_strategy:
                 case "global":
@@ -106,12 +103,7 @@ class Ways:
                     win_multiplier = 1
 
             if (kind, symbol) in config.paytable:
-                positions = []
-                for reel in range(kind):
-                    for pos in potential_wins[symbol][reel]:
-                        positions += [pos]
-                    for pos in wilds[reel]:
-                        positions += [pos]
+                positions = Ways.get_ways_positions(board_codes, code, kind, wild_rows, multiplier_key)
 
                 win = round(config.paytable[kind, symbol] * ways, 2)
                 win_amt, multiplier = apply_mult(
@@ -141,6 +133,23 @@ class Ways:
 
         return return_data
 
+    @staticmethod
+    def get_ways_positions(
+        board_codes: BoardCodes, code: int, kind: int, wild_rows: list, multiplier_key: str = "multiplier"
+    ) -> list:
+        """Winning positions of a symbol id on the first kind reels, symbols then wilds on each reel."""
+        positions = []
+        for reel in range(kind):
+            offset = board_codes.offsets[reel]
+            for row in range(board_codes.num_rows[reel]):
+                if board_codes.codes[offset + row] == code:
+                    positions.append({"reel": reel, "row": row})
+            for row in wild_rows[reel]:
+                positions.append({"reel": reel, "row": row})
+                if board_codes.flags[offset + row] & MULTIPLIER:
+                    positions[-1][multiplier_key] = board_codes.board[reel][row].get_attribute(multiplier_key)
+        return positions
+
     @staticmethod
     def emit_wayswin_events(gamestate) -> None:
         """Transmit win events asociated with ways wins."""
@@ -18,6 +18,13 @@ class Config:
         self.provider_number = 1
         self.game_name = "sample_lines"
         self.output_regular_json = True  # if True, outputs .json if compression = False. If False, outputs .jsonl
+        # "recompress" streams worker books through a multi-threaded compressor (byte-identical for any thread count),
+        # "concat" joins the compressed worker frames as-is (faster, only the decompressed content is deterministic)
+        self.book_merge_mode = "recompress"
+        self.book_compression_threads = -1  # used by "recompress", -1 uses all logical cores
+        # Write compressed books as frames of books_per_frame books, with a books/books_<mode>_index.json frame index
+        self.seekable_books = False
+        self.books_per_frame = 1000
         if self.game_id != "0_0_sample":
             self.construct_paths()
 
@@ -39,6 +46,8 @@ class Config:
         self.freegame_type = "freegame"
 
         self.include_padding = True
+        # Plain symbols (no special flags or functions) are shared immutable instances, see Symbol.assign_attribute()
+        self.share_plain_symbols = True
 
         # Define the number of scatter-symbols required to award free-spins
         self.freespin_triggers = {}
@@ -49,6 +58,8 @@ class Config:
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
 
         self.write_event_list = True
+        # Debug: verify book events are not modified after they are added (events must not alias gamestate data)
+        self.check_event_aliasing = False
 
         self.bet_modes = []
         self.opt_params = {None: None}
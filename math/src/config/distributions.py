@@ -1,7 +1,22 @@
 """Set and verify simulation parameters."""
 
-from typing import Union
+from typing import Callable, List, Union
 import json
+from src.calculations.statistics import AliasTable, AliasWeights
+
+
+def is_weighted(condition) -> bool:
+    """True for a weighted condition drawn from directly: {value: weight}."""
+    return (
+        isinstance(condition, dict)
+        and len(condition) > 0
+        and all(isinstance(w, (int, float)) and not isinstance(w, bool) for w in condition.values())
+    )
+
+
+def is_weighted_by_gametype(condition) -> bool:
+    """True for a weighted condition drawn from per gametype: {gametype: {value: weight}}."""
+    return isinstance(condition, dict) and len(condition) > 0 and all(is_weighted(w) for w in condition.values())
 
 
 class Distribution:
@@ -18,7 +33,10 @@ class Distribution:
             "reel_weights",
         ],
         default_distribution_conditions: dict = {"force_wincap": False, "force_freegame": False},
+        rejection_hooks: List[Union[str, Callable]] = None,
     ):
+        """rejection_hooks: names of registered hooks (src/state/rejection_hooks.py) or hook functions, which
+        abandon spin attempts as soon as they can no longer satisfy this distribution."""
 
         if fixed_amt is None:
             assert quota > 0, "non-zero quota value must be assigned"
@@ -30,6 +48,7 @@ class Distribution:
         self._required_distribution_conditions = required_distribution_conditions
         self._default_distribution_conditions = default_distribution_conditions
         self._win_criteria = win_criteria
+        self._rejection_hooks = list(rejection_hooks) if rejection_hooks is not None else []
         self.verify_and_set_conditions(conditions)
 
     def verify_and_set_conditions(self, conditions):
@@ -42,8 +61,40 @@ class Distribution:
             if rk not in condition_keys:
                 conditions[rk] = self._default_distribution_conditions[rk]
 
+        for key, nominal in conditions.get("nominal_weights", {}).items():
+            assert key in conditions, f"nominal_weights given for missing condition: {key}"
+            condition = conditions[key]
+            if is_weighted(condition):
+                assert is_weighted(nominal), f"nominal_weights of {key} must be given as {{value: weight}}"
+                nominal, condition = {None: nominal}, {None: condition}
+            else:
+                assert is_weighted_by_gametype(condition), f"nominal_weights given for unweighted condition: {key}"
+                assert is_weighted_by_gametype(
+                    nominal
+                ), f"nominal_weights of {key} must be given as {{gametype: {{value: weight}}}}"
+            for gametype, weights in nominal.items():
+                biased = condition.get(gametype, {})
+                missing = [value for value, weight in weights.items() if weight > 0 and biased.get(value, 0) <= 0]
+                assert len(missing) == 0, f"{key} of {gametype} can never draw nominal outcomes {missing}"
+
+        for key, condition in conditions.items():
+            if key == "nominal_weights":
+                continue
+            if is_weighted(condition) and not isinstance(condition, AliasWeights):
+                conditions[key] = AliasWeights(condition)
+            elif is_weighted_by_gametype(condition):
+                for gametype, weights in condition.items():
+                    if not isinstance(weights, AliasWeights):
+                        condition[gametype] = AliasWeights(weights)
         self._conditions = conditions
 
+    def get_alias_table(self, key: str, gametype: str) -> AliasTable:
+        """Return the alias table of a weighted condition, of gametype if given per gametype. Weights are kept as
+        AliasWeights, whose table follows any change of the weights."""
+        table = self.get_condition_weights(key, gametype).get_alias_table()
+        assert table is not None, f"{key} has no positive weights to draw from"
+        return table
+
     def get_criteria(self):
         """Return distribution criteria value."""
         return self._criteria
@@ -52,10 +103,43 @@ class Distribution:
         """Return distribution simulation quota."""
         return self._quota
 
+    def get_conditions(self):
+        """Return distribution simulation conditions."""
+        return self._conditions
+
     def get_win_criteria(self):
         """Return criteria for simulation to pass."""
         return self._win_criteria
 
+    def get_condition_weights(self, key: str, gametype: str) -> dict:
+        """Return the {value: weight} of a weighted condition, the weights of gametype if given per gametype.
+        Weights assigned to the conditions after they were set are converted to AliasWeights on first use."""
+        condition = self._conditions[key]
+        if isinstance(condition, AliasWeights):
+            return condition
+        if is_weighted(condition):
+            weights = self._conditions[key] = AliasWeights(condition)
+            return weights
+        weights = condition[gametype]
+        if not isinstance(weights, AliasWeights):
+            weights = condition[gametype] = AliasWeights(weights)
+        return weights
+
+    def get_nominal_weights(self, key: str, gametype: str) -> Union[dict, None]:
+        """Return the nominal (unbiased) weights of a weighted condition, None if the condition is not biased."""
+        nominal = self._conditions.get("nominal_weights", {}).get(key)
+        if nominal is None or is_weighted(nominal):
+            return nominal
+        return nominal.get(gametype)
+
+    def is_biased(self) -> bool:
+        """True if any weighted condition is drawn from biased weights (see nominal_weights)."""
+        return len(self._conditions.get("nominal_weights", {})) > 0
+
+    def get_rejection_hooks(self):
+        """Return rejection hooks checked during spin attempts."""
+        return self._rejection_hooks
+
     def get_required_distribution_conditions(self):
         """Return what win conditions must be specified."""
         return self._required_distribution_conditions
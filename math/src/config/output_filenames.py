@@ -119,30 +119,42 @@ class OutputFiles:
                 },
             }
 
-    def get_temp_multi_thread_name(self, betmode: str, thread_index: int, repeat_count: int, compress: bool):
+    def get_temp_multi_thread_name(self, betmode: str, batch_index: int, compress: bool):
         """Naming convention for temp book files."""
         if compress:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl.zst"
+            filename = f"books_{betmode}_{batch_index}.jsonl.zst"
         elif not (compress) and self.game_config.output_regular_json:
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.json"
+            filename = f"books_{betmode}_{batch_index}.json"
         elif not (compress) and not (self.game_config.output_regular_json):
-            filename = f"books_{betmode}_{thread_index}_{repeat_count}.jsonl"
+            filename = f"books_{betmode}_{batch_index}.jsonl"
         else:
             raise RuntimeError("Error in logic generating book name")
 
         return os.path.join(self.temp_path, filename)
 
-    def get_temp_lookup_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_lookup_name(self, betmode: str, batch_index: int):
         """Naming convention for temp lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{batch_index}")
 
-    def get_temp_segmented_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_segmented_name(self, betmode: str, batch_index: int):
         """Naming convention for temp segmented lookup files."""
-        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{thread_index}_{repeat_count}")
+        return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{batch_index}")
 
-    def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
+    def get_temp_force_name(self, betmode: str, batch_index: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{batch_index}.json")
+
+    def get_temp_record_name(self, betmode: str, batch_index: int):
+        """Naming convention for batch completion records."""
+        return os.path.join(self.temp_path, f"record_{betmode}_{batch_index}.json")
+
+    def get_batch_manifest_name(self, betmode: str):
+        """Naming convention for the manifest listing every batch sim-range and temp file."""
+        return os.path.join(self.temp_path, f"manifest_{betmode}.json")
+
+    def get_estimate_summary_name(self, betmode: str):
+        """Win estimate summary of an estimate mode run."""
+        return os.path.join(self.library_path, "estimates", f"estimate_{betmode}.json")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
@@ -156,6 +168,10 @@ class OutputFiles:
             raise RuntimeError("Logic error in name generation.")
         return os.path.join(self.compressed_path if compress else self.book_path, filename)
 
+    def get_final_book_index_name(self, betmode: str):
+        """Sidecar frame index of seekable compressed books."""
+        return os.path.join(self.book_path, f"books_{betmode}_index.json")
+
     def get_final_lookup_name(self, betmode: str):
         """Final csv lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTable_{betmode}.csv")
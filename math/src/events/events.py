@@ -1,9 +1,31 @@
 """Defines reusable events"""
 
-from copy import deepcopy
+from functools import wraps
 from src.events.event_constants import EventConstants
 
 
+def book_event(event_function):
+    """Skip an event function entirely when the book does not record events (estimate mode)."""
+
+    @wraps(event_function)
+    def wrapper(gamestate, *args, **kwargs):
+        if not gamestate.book.record_events:
+            return None
+        return event_function(gamestate, *args, **kwargs)
+
+    return wrapper
+
+
+def json_copy(value):
+    """Detached copy of JSON-like gamestate data (nested dicts, lists and tuples), for use in events.
+    Books store events as passed, so events must not reference lists or dicts that the gamestate keeps modifying."""
+    if isinstance(value, dict):
+        return {key: json_copy(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_copy(item) for item in value]
+    return value
+
+
 def json_ready_sym(symbol: object, special_attributes: list = None):
     """Converts a symbol to dictionary/JSON format."""
     assert special_attributes is not None
@@ -18,6 +40,7 @@ def json_ready_sym(symbol: object, special_attributes: list = None):
     return print_sym
 
 
+@book_event
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -38,13 +61,14 @@ def reveal_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
 
+@book_event
 def fs_trigger_event(
     gamestate,
     include_padding_index=True,
@@ -54,12 +78,10 @@ def fs_trigger_event(
     """Triggers feature game from the basegame."""
     assert basegame_trigger != freegame_trigger, "must set either basegame_trigger or freeSpinTrigger to = True"
     event = {}
-    scatter_positions = []
-    for reel, _ in enumerate(gamestate.special_syms_on_board["scatter"]):
-        scatter_positions.append(gamestate.special_syms_on_board["scatter"][reel])
-    if include_padding_index:
-        for pos in scatter_positions:
-            pos["row"] += 1
+    scatter_positions = [
+        {**pos, "row": pos["row"] + 1} if include_padding_index else dict(pos)
+        for pos in gamestate.special_syms_on_board["scatter"]
+    ]
 
     if basegame_trigger:
         event = {
@@ -80,6 +102,7 @@ def fs_trigger_event(
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -97,6 +120,7 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@book_event
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -112,6 +136,7 @@ def set_total_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -122,6 +147,7 @@ def set_tumble_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -137,12 +163,13 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
     win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
+    win_data_copy["wins"] = json_copy(gamestate.win_data["wins"])
     for idx, w in enumerate(win_data_copy["wins"]):
         if include_padding_index:
             new_positions = []
@@ -176,6 +203,7 @@ def win_info_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -186,6 +214,7 @@ def update_tumble_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -197,6 +226,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -208,6 +238,7 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@book_event
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -218,6 +249,7 @@ def final_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -229,6 +261,7 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
     special_attributes = list(gamestate.config.special_symbols.keys())
@@ -257,6 +290,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@book_event
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
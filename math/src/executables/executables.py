@@ -1,4 +1,5 @@
 from src.state.state_conditions import Conditions
+from src.state.rejection_hooks import WIN_UPDATE, NO_FREEGAME
 from src.calculations.tumble import Tumble
 from src.events.events import (
     win_info_event,
@@ -18,6 +19,8 @@ class Executables(Conditions, Tumble):
     The purpose of this Class is to group together common actions which are likely to be reused between games.
     These can be overridden in the GameExecutables or GameCalculations if game-specific alterations are required.
     Generally Executables functions do not return values.
+    Rejection hooks of the current distribution are checked after wins are updated and when the basegame does not
+    trigger the freegame, see GeneralGameState.check_rejection().
     """
 
     def tumble_game_board(self):
@@ -31,6 +34,7 @@ class Executables(Conditions, Tumble):
             win_info_event(self)
             update_tumble_win_event(self)
             self.evaluate_wincap()
+            self.check_rejection(WIN_UPDATE)
 
     def evaluate_wincap(self) -> None:
         """Indicate spin functions should stop once wincap is reached."""
@@ -46,6 +50,8 @@ class Executables(Conditions, Tumble):
             self.config.freespin_triggers[self.gametype].keys()
         ) and not (self.repeat):
             return True
+        if self.gametype == self.config.basegame_type:
+            self.check_rejection(NO_FREEGAME)
         return False
 
     def check_freespin_entry(self, scatter_key: str = "scatter") -> bool:
@@ -59,6 +65,7 @@ class Executables(Conditions, Tumble):
 
     def run_freespin_from_base(self, scatter_key: str = "scatter") -> None:
         """Trigger the freespin function and update total fs amount."""
+        self.check_rejection(WIN_UPDATE)
         self.record(
             {
                 "kind": self.count_special_symbols(scatter_key),
@@ -85,6 +92,7 @@ class Executables(Conditions, Tumble):
 
     def update_freespin(self) -> None:
         """Called before a new reveal during freegame."""
+        self.check_rejection(WIN_UPDATE)
         update_freespin_event(self)
         self.fs += 1
         self.win_manager.reset_spin_win()
@@ -1,31 +1,51 @@
 "Handles independent simulation events and details."
 
-from copy import deepcopy
+import json
 
 
 class Book:
     "Stores simulation information."
 
-    def __init__(self, book_id: int, criteria: str):
-        "Initialize simulation book"
+    def __init__(self, book_id: int, criteria: str, record_events: bool = True, check_aliasing: bool = False):
+        "Initialize simulation book, with record_events=False events are not stored (estimate mode)."
         self.id = book_id
+        self.record_events = record_events
+        self.check_aliasing = check_aliasing
         self.payout_multiplier = 0.0
         self.events = []
+        self.event_snapshots = []
         self.criteria = criteria
         self.basegame_wins = 0.0
         self.freegame_wins = 0.0
+        self.likelihood_ratio = None
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        "Append event to book. The event is stored as passed and must not share mutable data with the gamestate."
+        if self.record_events:
+            self.events.append(event)
+            if self.check_aliasing:
+                self.event_snapshots.append(json.dumps(event))
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
         for k, v in appended_info.items():
             self.events[event_id][k] = v
+        if self.check_aliasing:
+            self.event_snapshots[event_id] = json.dumps(self.events[event_id])
+
+    def check_events(self) -> None:
+        "Raise if an event changed after it was added, which means it shares data with the gamestate or another event."
+        for index, (event, snapshot) in enumerate(zip(self.events, self.event_snapshots)):
+            if json.dumps(event) != snapshot:
+                raise RuntimeError(
+                    f"Event {index} ('{event.get('type')}') of book {self.id} was modified after it was added, "
+                    "events must be built from copies of gamestate data."
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if self.check_aliasing:
+            self.check_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
@@ -34,4 +54,6 @@ class Book:
             "baseGameWins": self.basegame_wins,
             "freeGameWins": self.freegame_wins,
         }
+        if self.likelihood_ratio is not None:
+            json_book["likelihoodRatio"] = self.likelihood_ratio
         return json_book
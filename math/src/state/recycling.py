@@ -0,0 +1,59 @@
+"""Reuse rejected spin attempts for other criteria generated under identical distribution conditions."""
+
+from collections import Counter, deque
+
+
+class RecyclingPool:
+    """Rejected spin attempts of a batch, kept for criteria which still have simulations to fill.
+
+    Criteria of a betmode are compatible when their distribution conditions are identical and their acceptance is
+    provably disjoint: both declare a win_criteria, and these differ. Attempts rejected by one criteria then hold
+    every outcome the other accepts, so the attempts it keeps are an unbiased sample of its own books. Every fully
+    played attempt rejected by its own criteria is offered to the compatible criteria with unfilled simulations,
+    and kept by the first one whose acceptance check passes. Accepted attempts are never offered, so no outcome is
+    used for more than one book.
+    """
+
+    def __init__(self, distributions: list, sim_to_criteria: dict):
+        conditions = {d.get_criteria(): d.get_conditions() for d in distributions}
+        self.win_criteria = {d.get_criteria(): d.get_win_criteria() for d in distributions}
+        self.targets = {
+            criteria: [
+                other
+                for other in conditions
+                if conditions[other] == conditions[criteria] and self.is_disjoint(criteria, other)
+            ]
+            for criteria in conditions
+        }
+        self.pending = Counter(sim_to_criteria.values())
+        self.pools = {criteria: deque() for criteria in conditions}
+        # book id -> [source simulation, source seed, source attempt] of every recycled book
+        self.recycled = {}
+
+    def is_disjoint(self, criteria: str, other: str) -> bool:
+        """True if no outcome can be accepted by both criteria, i.e. both require a different exact win."""
+        win_criteria, other_win_criteria = self.win_criteria[criteria], self.win_criteria[other]
+        return win_criteria is not None and other_win_criteria is not None and win_criteria != other_win_criteria
+
+    def accepts(self, criteria: str, final_win: float) -> bool:
+        """True if an outcome with final_win lies in the declared acceptance of criteria."""
+        return final_win == self.win_criteria[criteria]
+
+    def get_demand(self, criteria: str) -> int:
+        """Number of simulations of a criteria which are neither started nor covered by pooled attempts."""
+        return self.pending[criteria] - len(self.pools[criteria])
+
+    def get_targets(self, criteria: str) -> list:
+        """Compatible criteria which can still use an attempt played for criteria."""
+        return [target for target in self.targets[criteria] if self.get_demand(target) > 0]
+
+    def add(self, criteria: str, attempt: dict) -> None:
+        """Keep an attempt accepted by criteria."""
+        self.pools[criteria].append(attempt)
+
+    def start_sim(self, criteria: str):
+        """Register the start of a simulation, returns a pooled attempt for it or None."""
+        self.pending[criteria] -= 1
+        if len(self.pools[criteria]) > 0:
+            return self.pools[criteria].popleft()
+        return None
@@ -0,0 +1,55 @@
+"""Rejection hooks: stop spin attempts which can no longer satisfy their distribution criteria."""
+
+from typing import Callable, Union
+
+# Points at which Executables check the rejection hooks of the current distribution
+WIN_UPDATE = "win_update"  # after wins were added (tumbles, before the freegame and before every freespin)
+NO_FREEGAME = "no_freegame"  # the basegame did not trigger the freegame
+
+# Hook name -> fn(gamestate, point) -> bool, True rejects the current attempt
+REJECTION_HOOKS = {}
+
+
+class SpinRejected(Exception):
+    """Raised to abandon the current spin attempt, caught by GeneralGameState.spin_attempt()."""
+
+
+def register_rejection_hook(name: str, hook: Callable = None):
+    """Register a rejection hook under a name, usable as a function or as a decorator.
+    Hooks must only reject attempts which check_repeat() would reject once the spin is finished."""
+    if hook is None:
+        return lambda func: register_rejection_hook(name, func)
+    REJECTION_HOOKS[name] = hook
+    return hook
+
+
+def get_rejection_hook(hook: Union[str, Callable]) -> Callable:
+    """Return the registered hook function (callables are returned unchanged)."""
+    if callable(hook):
+        return hook
+    try:
+        return REJECTION_HOOKS[hook]
+    except KeyError:
+        raise ValueError(f"Rejection hook '{hook}' is not registered")
+
+
+@register_rejection_hook("any_win")
+def reject_any_win(gamestate: object, point: str) -> bool:
+    """Reject as soon as the round has a nonzero win."""
+    return gamestate.win_manager.running_bet_win > 0
+
+
+@register_rejection_hook("exceeds_win_criteria")
+def reject_exceeded_win_criteria(gamestate: object, point: str) -> bool:
+    """Reject once the (capped) round win is larger than the win_criteria of the distribution.
+    Assumes wins within a round only increase."""
+    win_criteria = gamestate.get_current_betmode_distributions().get_win_criteria()
+    if win_criteria is None:
+        return False
+    return round(min(gamestate.win_manager.running_bet_win, gamestate.config.wincap), 2) > win_criteria
+
+
+@register_rejection_hook("missing_freegame")
+def reject_missing_freegame(gamestate: object, point: str) -> bool:
+    """Reject a force_freegame distribution attempt when the basegame does not trigger the freegame."""
+    return point == NO_FREEGAME and gamestate.get_current_distribution_conditions()["force_freegame"]
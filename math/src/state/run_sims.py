@@ -2,14 +2,29 @@ import time
 import math
 import random
 import hashlib
-from multiprocessing import Process, Manager
+import json
+import os
+from multiprocessing import Pool
 import cProfile
 from warnings import warn
 import shutil
+import glob
 import asyncio
-from typing import Dict
+from typing import Dict, List
+from src.write_data.write_data import (
+    get_sha_256,
+    output_lookup_and_force_files,
+    write_batch_manifest,
+    write_batch_record,
+    load_batch_record,
+    load_batch_manifest,
+    write_estimate_summary,
+    write_library_events,
+)
+from src.wins.win_estimates import WinEstimates
 
-from src.write_data.write_data import output_lookup_and_force_files
+# Runs are split into at least this many batches (if batch_size allows), so all workers have batches to pull from
+MIN_BATCHES_PER_RUN = 64
 
 
 def create_books(
@@ -20,23 +35,117 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    resume: bool = False,
+    shard_index: int = None,
+    num_shards: int = 1,
+    shard_path: str = None,
+    estimate: bool = False,
+    recycle_rejected: bool = False,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """Main run-function for simulating game outcomes and outputting all files.
+    With estimate=True no events, books, lookup tables or force files are created. Payouts are accumulated per
+    criteria and a summary (RTP, base/free game RTP, hit-rates, repeat counts and payout histograms) is written
+    to library/estimates/estimate_<betmode>.json.
+    With recycle_rejected=True, attempts rejected by one criteria fill simulations of other criteria with identical
+    distribution conditions (see RecyclingPool). Outcomes then depend on the batch partition (threads, batch_size).
+    With resume=True, batches with a verified completion record from a previous (interrupted) run are skipped.
+    With num_shards > 1, only shard_index of each betmode's sim-space is simulated and temp files are written to
+    shard_path (default temp_multi_threaded_files/shard_<index>). Final outputs are then built with merge_shards()."""
+    assert threads > 0 and batch_size > 0, "threads and batch_size must be positive"
+    sharded = num_shards > 1
+    if sharded:
+        assert shard_index is not None and 0 <= shard_index < num_shards, "shard_index must be in [0, num_shards)"
+        if shard_path is None:
+            shard_path = os.path.join(gamestate.output_files.temp_path, f"shard_{shard_index}")
+        gamestate.output_files.temp_path = shard_path
+        gamestate.output_files.check_folder_exists(shard_path)
+    else:
+        shard_index = 0
+        # Removed at the end of every run, recreated so create_books() can be called repeatedly
+        gamestate.output_files.check_folder_exists(gamestate.output_files.temp_path)
+    assert not (estimate and sharded), "estimate mode does not support sharded runs"
     for key, ns in num_sim_args.items():
-        if all([ns > 0, ns > batch_size * batch_size]):
-            assert (
-                ns % (threads * batch_size) == 0
-            ), "mode-sims/(batch * threads) must be divisible with no remainder"
         num_sim_args[key] = int(ns)
 
-    if not compress and sum(num_sim_args.values()) > 1e4:
+    if not compress and not estimate and sum(num_sim_args.values()) > 1e4:
         warn("Generating large number of uncompressed books!")
 
     if profiling and threads > 1:
         raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
 
     startTime = time.time()
-    print("\nCreating books...")
+    print("\nEstimating RTP..." if estimate else "\nCreating books...")
+    pool = None
+    if threads > 1 and not profiling:
+        pool = Pool(processes=threads, initializer=init_worker, initargs=(gamestate,))
+    try:
+        run_all_betmodes(
+            gamestate,
+            config,
+            num_sim_args,
+            batch_size,
+            threads,
+            compress,
+            profiling,
+            pool,
+            resume,
+            shard_index,
+            num_shards,
+            estimate,
+            recycle_rejected,
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if sharded:
+        print(f"\nFinished shard {shard_index} of {num_shards} in", time.time() - startTime, "seconds.\n")
+        return
+    shutil.rmtree(gamestate.output_files.temp_path)
+    print("\nFinished", "estimating RTP" if estimate else "creating books", "in", time.time() - startTime, "seconds.\n")
+
+
+def merge_shards(gamestate: object, config: object, shard_paths: List[str] = None, cleanup: bool = False):
+    """Combine the temp files of all sharded create_books runs into final outputs.
+    Outputs are identical to a single-node run of the same configuration."""
+    if shard_paths is None:
+        shard_paths = sorted(glob.glob(os.path.join(gamestate.output_files.temp_path, "shard_*")))
+    print("\nMerging", len(shard_paths), "shards...")
+    for bm in config.bet_modes:
+        betmode_name = bm.get_name()
+        manifest_name = os.path.basename(gamestate.output_files.get_batch_manifest_name(betmode_name))
+        manifest_paths = [
+            os.path.join(path, manifest_name)
+            for path in shard_paths
+            if os.path.isfile(os.path.join(path, manifest_name))
+        ]
+        if len(manifest_paths) == 0:
+            continue
+        gamestate.betmode = betmode_name
+        gamestate.config.wincap = bm.get_wincap()
+        merge_batch_records(gamestate, betmode_name, load_batch_manifest(manifest_paths)["batches"])
+        output_lookup_and_force_files(config.game_id, betmode_name, gamestate, manifest_paths)
+    if cleanup:
+        for path in shard_paths:
+            shutil.rmtree(path)
+
+
+def run_all_betmodes(
+    gamestate: object,
+    config: object,
+    num_sim_args: dict,
+    batch_size: int,
+    threads: int,
+    compress: bool,
+    profiling: bool,
+    pool: Pool = None,
+    resume: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    estimate: bool = False,
+    recycle_rejected: bool = False,
+):
+    """Simulate and combine output files for every requested betmode. Sharded runs leave combining to merge_shards."""
     for betmode_name in num_sim_args:
         sim_counter = 0
         for bm in config.bet_modes:
@@ -54,7 +163,7 @@ def create_books(
         if num_sim_args[betmode_name] > 0:
             gamestate.betmode = betmode_name
             nsims = max(num_sim_args[betmode_name], sim_counter)
-            run_multi_process_sims(
+            manifest_path = run_multi_process_sims(
                 threads,
                 batch_size,
                 config.game_id,
@@ -65,32 +174,32 @@ def create_books(
                 write_event_list=config.write_event_list,
                 profiling=profiling,
                 set_sim_amount=set_sim_amount,
+                pool=pool,
+                resume=resume,
+                shard_index=shard_index,
+                num_shards=num_shards,
+                estimate=estimate,
+                recycle_rejected=recycle_rejected,
             )
 
-            output_lookup_and_force_files(
-                threads,
-                batch_size,
-                config.game_id,
-                betmode_name,
-                gamestate,
-                num_sims=nsims,
-                compress=compress,
-            )
-    shutil.rmtree(gamestate.output_files.temp_path)
-    print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
+            if num_shards == 1 and not estimate:
+                output_lookup_and_force_files(config.game_id, betmode_name, gamestate, manifest_path)
 
 
-def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[str, int]:
+def get_sim_splits(
+    gamestate: object, num_sims: int, betmode_name: str, rng: random.Random = None
+) -> Dict[str, int]:
     """Ensure assignment of criteria to all simulations numbers."""
+    if rng is None:
+        rng = random.Random(0)
     betmode_distributions = gamestate.get_betmode(betmode_name).get_distributions()
     num_sims_criteria = {d._criteria: max(int(num_sims * d._quota), 1) for d in betmode_distributions}
     total_sims = sum(num_sims_criteria.values())
     reduce_sims = total_sims > num_sims
     listedCriteria = [d._criteria for d in betmode_distributions]
     criteria_weights = [d._quota for d in betmode_distributions]
-    random.seed(0)
     while sum(num_sims_criteria.values()) != num_sims:
-        c = random.choices(listedCriteria, criteria_weights)[0]
+        c = rng.choices(listedCriteria, criteria_weights)[0]
         if reduce_sims and num_sims_criteria[c] > 1:
             num_sims_criteria[c] -= 1
         elif not reduce_sims:
@@ -99,10 +208,12 @@ def get_sim_splits(gamestate: object, num_sims: int, betmode_name: str) -> Dict[
     return num_sims_criteria
 
 
-def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int) -> Dict[int, str]:
+def assign_sim_criteria(num_sims_criteria: Dict[str, int], sims: int, rng: random.Random = None) -> Dict[int, str]:
     """Assign criteria randomly to simulations based on quota defined in config."""
+    if rng is None:
+        rng = random.Random(0)
     sim_allocation = [criteria for criteria, count in num_sims_criteria.items() for _ in range(count)]
-    random.shuffle(sim_allocation)
+    rng.shuffle(sim_allocation)
     return {i: sim_allocation[i] for i in range(min(sims, len(sim_allocation)))}
 
 
@@ -112,28 +223,10 @@ def string_to_int(s: str) -> int:
     return int(h[:12], 16)
 
 
-async def profile_and_visualize(
-    game_id,
-    gamestate,
-    all_betmode_configs,
-    betmode,
-    sim_allocation,
-    threads,
-    num_repeats,
-    sims_per_thread,
-    repeat,
-    compress,
-    write_event_list,
-    simulation_seeds,
-):
+async def profile_and_visualize(game_id, batch):
     """Create flame-graph, automatically opens output on localhost."""
-    output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
-    cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, simulation_seeds)",
-        globals(),
-        locals(),
-        output_string,
-    )
+    output_string = f"games/{game_id}/simulationProfile_{batch['betmode']}.prof"
+    cProfile.runctx("run_sim_batch(batch)", globals(), locals(), output_string)
     await asyncio.create_subprocess_exec("snakeviz", output_string)
 
 
@@ -148,14 +241,21 @@ def run_multi_process_sims(
     write_event_list: bool = False,
     profiling: bool = False,
     set_sim_amount=False,
+    pool: Pool = None,
+    resume: bool = False,
+    shard_index: int = 0,
+    num_shards: int = 1,
+    estimate: bool = False,
+    recycle_rejected: bool = False,
 ):
-    """Setup multiprocessing manager for running all game-mode simulations."""
+    """Dispatch all game-mode simulation batches (of a single shard) to a (persistent) worker pool.
+    Returns the path of the batch manifest used to combine the temporary output files."""
     print("\nCreating books for", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    sims_per_thread = int(num_sims / threads / num_repeats)
+    # Criteria assignment has its own rng, so it is identical across resumed runs and shards
+    rng = random.Random(0)
     if not set_sim_amount:
-        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode)
-        sim_criteria = assign_sim_criteria(num_sims_criteria, num_sims)
+        num_sims_criteria = get_sim_splits(gamestate, num_sims, betmode, rng)
+        sim_criteria = assign_sim_criteria(num_sims_criteria, num_sims, rng)
         simulation_seeds = [i for i in range(len(sim_criteria))]
         criteria_assignment = list(sim_criteria.values())
     else:
@@ -188,9 +288,9 @@ def run_multi_process_sims(
                                 criteria_assignment.append(dist_criteria)
                                 counter += 1
                     while len(criteria_assignment) < num_sims:
-                        criteria_assignment.append(random.choices(quota_assignment, quota_probs, k=1)[0])
+                        criteria_assignment.append(rng.choices(quota_assignment, quota_probs, k=1)[0])
 
-                    random.shuffle(criteria_assignment)
+                    rng.shuffle(criteria_assignment)
                 break
 
         unique_criteria = set(criteria_assignment)
@@ -205,67 +305,207 @@ def run_multi_process_sims(
             criteria_counter[c] += 1
             simulation_seeds.append(offset_val)
 
-    for repeat in range(num_repeats):
-        print("Batch", repeat + 1, "of", num_repeats)
-        processes = []
-        manager = Manager()
-        all_betmode_configs = manager.list()
-        if profiling:
-            asyncio.run(
-                profile_and_visualize(
-                    game_id=game_id,
-                    gamestate=gamestate,
-                    all_betmode_configs=all_betmode_configs,
-                    betmode=betmode,
-                    sim_allocation=criteria_assignment,
-                    threads=threads,
-                    num_repeats=num_repeats,
-                    sims_per_thread=sims_per_thread,
-                    repeat=repeat,
-                    compress=compress,
-                    write_event_list=write_event_list,
-                    simulation_seeds=simulation_seeds,
-                )
-            )
-        elif threads == 1:
-            gamestate.run_sims(
-                betmode_copy_list=all_betmode_configs,
-                betmode=betmode,
-                sim_to_criteria=criteria_assignment,
-                total_threads=threads,
-                total_repeats=num_repeats,
-                num_sims=sims_per_thread,
-                thread_index=0,
-                repeat_count=repeat,
-                compress=compress,
-                write_event_list=write_event_list,
-                simulation_seeds=simulation_seeds,
-            )
-        else:
-            for thread in range(threads):
-                process = Process(
-                    target=gamestate.run_sims,
-                    args=(
-                        all_betmode_configs,
-                        betmode,
-                        criteria_assignment,
-                        threads,
-                        num_repeats,
-                        sims_per_thread,
-                        thread,
-                        repeat,
-                        compress,
-                        write_event_list,
-                        simulation_seeds,
-                    ),
-                )
-                print("Started thread", thread)
-                process.start()
-                processes += [process]
-            print("All threads are online.")
-            for process in processes:
-                process.join()
-            print("Finished joining threads.")
-            gamestate.combine(all_betmode_configs, betmode)
-            gamestate.get_betmode(betmode).lock_force_keys()
-            manager.shutdown()
+    wincap = gamestate.get_betmode(betmode).get_wincap()
+    output_files = gamestate.output_files
+    num_sims = len(criteria_assignment)
+    shard_start, shard_end = num_sims * shard_index // num_shards, num_sims * (shard_index + 1) // num_shards
+    batches = []
+    for batch_index, sim_range in enumerate(partition_sims(shard_end, batching_size, shard_start)):
+        sim_to_criteria = {sim: criteria_assignment[sim] for sim in sim_range}
+        batch_seeds = {sim: simulation_seeds[sim] for sim in sim_range}
+        batches.append(
+            {
+                "betmode": betmode,
+                "wincap": wincap,
+                "sim_to_criteria": sim_to_criteria,
+                "simulation_seeds": batch_seeds,
+                "batch_index": batch_index,
+                "sim_start": sim_range.start,
+                "sim_end": sim_range.stop,
+                "seeds_hash": hash_batch_seeds(sim_to_criteria, batch_seeds),
+                "compress": compress,
+                "write_event_list": write_event_list,
+                "estimate": estimate,
+                "recycle_rejected": recycle_rejected,
+                "files": (
+                    {}
+                    if estimate
+                    else {
+                        "books": output_files.get_temp_multi_thread_name(betmode, batch_index, compress),
+                        "force": output_files.get_temp_force_name(betmode, batch_index),
+                        "lookup": output_files.get_temp_lookup_name(betmode, batch_index),
+                        "segmented": output_files.get_temp_segmented_name(betmode, batch_index),
+                    }
+                ),
+                "record": output_files.get_temp_record_name(betmode, batch_index),
+            }
+        )
+    manifest_path = output_files.get_batch_manifest_name(betmode)
+    write_batch_manifest(
+        manifest_path,
+        {
+            "betmode": betmode,
+            "num_sims": num_sims,
+            "shard_index": shard_index,
+            "num_shards": num_shards,
+            "assignment_hash": hash_batch_seeds(dict(enumerate(criteria_assignment)), simulation_seeds),
+            "compress": compress,
+            "batches": [
+                {key: batch[key] for key in ("batch_index", "sim_start", "sim_end", "files", "record")}
+                for batch in batches
+            ],
+        },
+    )
+
+    pending = batches
+    if resume:
+        pending = [batch for batch in batches if not batch_is_complete(batch)]
+        print(f"Resuming {betmode}: {len(batches) - len(pending)} of {len(batches)} batches already complete.")
+
+    if profiling:
+        init_worker(gamestate)
+        for batch in pending:
+            asyncio.run(profile_and_visualize(game_id=game_id, batch=batch))
+    elif threads == 1:
+        init_worker(gamestate)
+        for batch in pending:
+            run_sim_batch(batch)
+    elif len(pending) > 0:
+        owns_pool = pool is None
+        if owns_pool:
+            pool = Pool(processes=threads, initializer=init_worker, initargs=(gamestate,))
+        finished = 0
+        # Idle workers pull the next batch from the queue, so no worker waits on a single slow range
+        for _ in pool.imap_unordered(run_sim_batch, pending, chunksize=1):
+            finished += 1
+        print(f"Finished {finished} batches.", flush=True)
+        if owns_pool:
+            pool.close()
+            pool.join()
+
+    merge_batch_records(gamestate, betmode, batches)
+    return manifest_path
+
+
+def merge_batch_records(gamestate: object, betmode: str, batches: List[dict]) -> None:
+    """Merge force keys and print the combined RTP from the completion records of all listed batches.
+    Records also cover batches completed by earlier (resumed) runs or other shards.
+    Win estimates of estimate mode batches are combined and written as the betmode estimate summary.
+    The event list of the betmode is written once, keeping the first example of every event type in batch order."""
+    totals = {"num_sims": 0, "total_wins": 0.0, "base_wins": 0.0, "free_wins": 0.0}
+    win_estimates = None
+    event_items = None
+    for batch in batches:
+        record = load_batch_record(batch["record"])
+        gamestate.merge_force_keys(betmode, record["force_keys"])
+        if record.get("event_items") is not None:
+            event_items = event_items or {}
+            for event_type, example in record["event_items"].items():
+                event_items.setdefault(event_type, example)
+        for key in totals:
+            totals[key] += record["rtp"][key]
+        if record.get("estimate") is not None:
+            win_estimates = win_estimates or WinEstimates()
+            win_estimates.merge(record["estimate"])
+    gamestate.get_betmode(betmode).lock_force_keys()
+
+    if event_items is not None:
+        write_library_events(gamestate, event_items, betmode)
+    mode_cost = gamestate.get_betmode(betmode).get_cost()
+    if win_estimates is not None:
+        write_estimate_summary(
+            gamestate.output_files.get_estimate_summary_name(betmode), win_estimates.get_summary(mode_cost)
+        )
+    if totals["num_sims"] > 0:
+        normalisation = totals["num_sims"] * mode_cost
+        print(
+            f"Mode {betmode} finished with",
+            round(totals["total_wins"] / normalisation, 3),
+            "RTP.",
+            f"[baseGame: {round(totals['base_wins'] / normalisation, 3)}, freeGame: {round(totals['free_wins'] / normalisation, 3)}]",
+            flush=True,
+        )
+
+
+def partition_sims(sim_end: int, batch_size: int, sim_start: int = 0) -> List[range]:
+    """Split simulations [sim_start, sim_end) into contiguous ranges of at most batch_size sims.
+    Any sim count is accepted, the final range holds the remainder. Small runs are split into MIN_BATCHES_PER_RUN
+    ranges. Boundaries do not depend on the thread count, so resumed runs may use a different number of threads."""
+    num_sims = sim_end - sim_start
+    chunk_size = max(min(batch_size, math.ceil(num_sims / MIN_BATCHES_PER_RUN)), 1)
+    return [range(start, min(start + chunk_size, sim_end)) for start in range(sim_start, sim_end, chunk_size)]
+
+
+def hash_batch_seeds(sim_to_criteria: dict, simulation_seeds: dict) -> str:
+    """Fingerprint of the simulations, criteria and seeds assigned to a batch."""
+    payload = json.dumps([[sim, sim_to_criteria[sim], simulation_seeds[sim]] for sim in sim_to_criteria])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def batch_is_complete(batch: dict) -> bool:
+    """A batch is complete if its record matches the batch assignment and all temp files are unchanged."""
+    if not os.path.isfile(batch["record"]):
+        return False
+    try:
+        record = load_batch_record(batch["record"])
+    except (json.JSONDecodeError, OSError):
+        return False
+    for key in ("sim_start", "sim_end", "seeds_hash"):
+        if record.get(key) != batch[key]:
+            return False
+    if (record.get("estimate") is not None) != batch["estimate"]:
+        return False
+    if (record.get("recycled") is not None) != batch["recycle_rejected"]:
+        return False
+    for kind, path in batch["files"].items():
+        if not os.path.isfile(path) or record["files"].get(kind) != get_sha_256(path):
+            return False
+    return True
+
+
+_WORKER_GAMESTATE = None
+
+
+def init_worker(gamestate: object) -> None:
+    """Store the gamestate once per worker process, rather than once per batch."""
+    global _WORKER_GAMESTATE
+    _WORKER_GAMESTATE = gamestate
+
+
+def run_sim_batch(batch: dict) -> dict:
+    """Simulate a single batch descriptor on the worker gamestate, then write its completion record."""
+    gamestate = _WORKER_GAMESTATE
+    betmode = batch["betmode"]
+    gamestate.config.wincap = batch["wincap"]
+    force_keys = gamestate.run_sims(
+        betmode=betmode,
+        sim_to_criteria=batch["sim_to_criteria"],
+        batch_index=batch["batch_index"],
+        compress=batch["compress"],
+        write_event_list=batch["write_event_list"],
+        simulation_seeds=batch["simulation_seeds"],
+        estimate=batch["estimate"],
+        recycle_rejected=batch["recycle_rejected"],
+    )
+    win_manager = gamestate.win_manager
+    record = {
+        "betmode": betmode,
+        "batch_index": batch["batch_index"],
+        "sim_start": batch["sim_start"],
+        "sim_end": batch["sim_end"],
+        "seeds_hash": batch["seeds_hash"],
+        "files": {kind: get_sha_256(path) for kind, path in batch["files"].items()},
+        "rtp": {
+            "num_sims": len(batch["sim_to_criteria"]),
+            "total_wins": win_manager.total_cumulative_wins,
+            "base_wins": win_manager.cumulative_base_wins,
+            "free_wins": win_manager.cumulative_free_wins,
+        },
+        "force_keys": list(force_keys),
+        "frames": gamestate.book_writer.frames if gamestate.book_writer is not None else None,
+        "event_items": gamestate.book_writer.event_items if gamestate.book_writer is not None else None,
+        "estimate": gamestate.win_estimates.to_json() if batch["estimate"] else None,
+        "recycled": gamestate.recycling_pool.recycled if batch["recycle_rejected"] else None,
+    }
+    write_batch_record(batch["record"], record)
+    return record
@@ -1,19 +1,24 @@
 from copy import copy, deepcopy
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from warnings import warn
 import random
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
+from src.wins.win_estimates import WinEstimates
 from src.calculations.symbol import SymbolStorage
+from src.calculations.reelstrips import ReelstripTable
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
+from src.state.rejection_hooks import SpinRejected, get_rejection_hook
+from src.state.recycling import RecyclingPool
+from src.calculations.statistics import derive_rng_seed
 from src.write_data.write_data import (
     print_recorded_wins,
     make_lookup_tables,
-    write_json,
     make_lookup_pay_split,
-    write_library_events,
+    BookWriter,
 )
 
 
@@ -24,14 +29,21 @@ class GeneralGameState(ABC):
         self.config = config
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, config.wincap)
-        self.library = {}
+        self.book_writer = None
+        self.estimate = False
+        self.win_estimates = None
         self.recorded_events = {}
+        self.rejection_hooks = {}
+        self.recycling_pool = None
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
+        self.compile_reelstrips()
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
+        self.betmode = None
+        self.rng = random.Random()
         self.book = Book(self.sim, self.criteria)
         self.repeat = True
         self.repeat_count = 0
@@ -56,19 +68,31 @@ class GeneralGameState(ABC):
         all_symbols_list = list(all_symbols_list)
         self.symbol_storage = SymbolStorage(self.config, all_symbols_list)
 
+    def compile_reelstrips(self) -> None:
+        """Precompute stop-position windows for every reelstrip in the config."""
+        self.reelstrip_tables = {
+            reelstrip_id: ReelstripTable(self.config, reelstrip) for reelstrip_id, reelstrip in self.config.reels.items()
+        }
+
     @abstractmethod
     def assign_special_sym_function(self):
         """ "Define custom symbol functions in game_override."""
         warn("No special symbol functions are defined")
 
     def reset_book(self) -> None:
-        """Reset global simulation variables."""
+        """Reset global simulation variables, each call starts a new simulation attempt with its own rng stream."""
+        self.reset_rng()
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(
+            self.book_id,
+            self.criteria,
+            record_events=not self.estimate,
+            check_aliasing=getattr(self.config, "check_event_aliasing", False),
+        )
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -83,16 +107,21 @@ class GeneralGameState(ABC):
         self.gametype = self.config.basegame_type
         self.repeat = False
         self.anticipation = [0] * self.config.num_reels
+        self.likelihood_ratio = 1.0
 
     def reset_seed(self, sim: int = 0, seed_override=None) -> None:
         """Reset rng seed to simulation number for reproducibility."""
-        if seed_override is not None:
-            random.seed(seed_override + 1)
-        else:
-            random.seed(sim + 1)
+        self.sim_seed = seed_override if seed_override is not None else sim
+        self.rng_attempt = 0
         self.sim = sim
         self.repeat_count = 0
 
+    def reset_rng(self) -> None:
+        """Seed self.rng from (betmode, simulation seed, attempt). Outcomes do not depend on scheduling or on
+        the global random module."""
+        self.rng.seed(derive_rng_seed(self.betmode, self.sim_seed, self.rng_attempt))
+        self.rng_attempt += 1
+
     def reset_fs_spin(self) -> None:
         """Use if using repeat during freespin games."""
         self.triggered_freegame = True
@@ -128,6 +157,105 @@ class GeneralGameState(ABC):
                 return d._conditions
         return RuntimeError("Could not locate betmode conditions")
 
+    def draw_condition(self, key: str, gametype: str = None):
+        """Draw a value from a weighted distribution condition, given as {value: weight} or per gametype as
+        {gametype: {value: weight}} (defaults to the current gametype). Draws from biased weights (nominal_weights
+        declared) update self.likelihood_ratio, so every weighted condition must be drawn through this method."""
+        gametype = self.gametype if gametype is None else gametype
+        distribution = self.get_current_betmode_distributions()
+        value = distribution.get_alias_table(key, gametype).sample(self.rng)
+        nominal = distribution.get_nominal_weights(key, gametype)
+        if nominal is not None:
+            weights = distribution.get_condition_weights(key, gametype)
+            self.update_likelihood_ratio(
+                nominal.get(value, 0) / sum(nominal.values()), weights[value] / sum(weights.values())
+            )
+        return value
+
+    def update_likelihood_ratio(self, nominal_prob: float, biased_prob: float) -> None:
+        """Weight the current attempt by the nominal over the biased probability of an outcome drawn from it."""
+        self.likelihood_ratio *= nominal_prob / biased_prob
+
+    def get_rejection_hooks(self) -> list:
+        """Rejection hook functions of the current distribution."""
+        key = (self.betmode, self.criteria)
+        if key not in self.rejection_hooks:
+            hooks = self.get_current_betmode_distributions().get_rejection_hooks()
+            self.rejection_hooks[key] = [get_rejection_hook(hook) for hook in hooks]
+        return self.rejection_hooks[key]
+
+    def check_rejection(self, point: str) -> None:
+        """Abandon the current spin attempt (raise SpinRejected) if the distribution declares rejection hooks and
+        the attempt is already marked for repeat, or a hook rejects it at this point."""
+        hooks = self.get_rejection_hooks()
+        if len(hooks) > 0 and (self.repeat or any(hook(self, point) for hook in hooks)):
+            self.repeat = True
+            raise SpinRejected()
+
+    @contextmanager
+    def spin_attempt(self):
+        """Wraps a single attempt in the repeat loop of run_spin(). An attempt abandoned through check_rejection()
+        is counted as a repeat, the next attempt draws from its own rng stream as usual."""
+        try:
+            yield
+        except SpinRejected:
+            self.repeat = True
+            self.repeat_count += 1
+            self.check_current_repeat_count()
+        else:
+            if self.recycling_pool is not None and self.repeat:
+                self.offer_attempt()
+
+    def offer_attempt(self) -> None:
+        """Offer a finished attempt rejected by its own criteria to the first compatible criteria (with unfilled
+        simulations) accepting it. Acceptance is decided by check_repeat() with the target criteria, the current
+        attempt is not affected."""
+        targets = self.recycling_pool.get_targets(self.criteria)
+        if len(targets) == 0:
+            return
+        criteria, repeat, repeat_count = self.criteria, self.repeat, self.repeat_count
+        try:
+            for target in targets:
+                self.criteria, self.repeat = target, False
+                self.check_repeat()
+                if not self.repeat and self.recycling_pool.accepts(target, self.final_win):
+                    self.recycling_pool.add(
+                        target,
+                        {
+                            "events": self.book.events,
+                            "payout_multiplier": self.book.payout_multiplier,
+                            "basegame_wins": self.book.basegame_wins,
+                            "freegame_wins": self.book.freegame_wins,
+                            "final_win": self.final_win,
+                            "round_wins": (self.win_manager.basegame_wins, self.win_manager.freegame_wins),
+                            "records": self.temp_wins[::2],
+                            "likelihood_ratio": self.likelihood_ratio,
+                            "source": [self.sim, self.sim_seed, self.rng_attempt - 1],
+                        },
+                    )
+                    break
+        finally:
+            self.criteria, self.repeat, self.repeat_count = criteria, repeat, repeat_count
+
+    def imprint_recycled_attempt(self, sim: int, attempt: dict) -> None:
+        """Imprint an attempt from the recycling pool as the book of simulation sim. The rng stream is that of the
+        originating attempt, so the book can be reproduced from its (seed, attempt)."""
+        _, seed, source_attempt = attempt["source"]
+        self.reset_seed(sim, seed_override=seed)
+        self.rng_attempt = source_attempt
+        self.reset_book()
+        self.book.events = attempt["events"]
+        self.book.payout_multiplier = attempt["payout_multiplier"]
+        self.book.basegame_wins = attempt["basegame_wins"]
+        self.book.freegame_wins = attempt["freegame_wins"]
+        self.final_win = attempt["final_win"]
+        self.win_manager.basegame_wins, self.win_manager.freegame_wins = attempt["round_wins"]
+        self.likelihood_ratio = attempt["likelihood_ratio"]
+        for description in attempt["records"]:
+            self.temp_wins += [description, self.book_id]
+        self.recycling_pool.recycled[sim] = attempt["source"]
+        self.imprint_wins()
+
     def check_current_repeat_count(self, warn_after_count: int = 1000):
         """Alert user to high repeat count."""
         if self.repeat_count >= warn_after_count and (self.repeat_count % warn_after_count) == 0:
@@ -154,19 +282,29 @@ class GeneralGameState(ABC):
             if keyValue[0] not in current_mode_force_keys:
                 self.get_current_betmode().add_force_key(keyValue[0])  # type:ignore
 
-    def combine(self, modes, betmode_name) -> None:
-        """Retrieve unique force record keys."""
-        for modeConfig in modes:
-            for betmode in modeConfig:
-                if betmode.get_name() == betmode_name:
-                    break
-            force_keys = betmode.get_force_keys()  # type:ignore
-            for key in force_keys:
-                if key not in self.get_betmode(betmode_name).get_force_keys():  # type:ignore
-                    self.get_betmode(betmode_name).add_force_key(key)  # type:ignore
+    def merge_force_keys(self, betmode_name: str, force_keys: list) -> None:
+        """Add force-record keys discovered by a worker process to the target betmode."""
+        betmode = self.get_betmode(betmode_name)
+        for key in force_keys:
+            if key not in betmode.get_force_keys():  # type:ignore
+                betmode.add_force_key(key)  # type:ignore
 
     def imprint_wins(self) -> None:
-        """Record all events to library if criteria conditions are satisfied."""
+        """Record all events to library if criteria conditions are satisfied.
+        In estimate mode only the payout of the simulation is added to self.win_estimates.
+        Books of biased distributions record the likelihood ratio of the attempt."""
+        if self.estimate:
+            self.temp_wins = []
+            self.win_estimates.add(
+                self.criteria,
+                self.book.payout_multiplier,
+                self.book.basegame_wins,
+                self.book.freegame_wins,
+                self.repeat_count,
+                self.likelihood_ratio,
+            )
+            self.win_manager.update_end_round_wins()
+            return
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
             description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
             book_id = self.temp_wins[2 * temp_win_index + 1]
@@ -182,7 +320,9 @@ class GeneralGameState(ABC):
                     "bookIds": [book_id],
                 }
         self.temp_wins = []
-        self.library[self.sim + 1] = copy(self.book.to_json())
+        if self.get_current_betmode_distributions().is_biased():
+            self.book.likelihood_ratio = self.likelihood_ratio
+        self.book_writer.write(self.book.to_json())
         self.win_manager.update_end_round_wins()
 
     def update_final_win(self) -> None:
@@ -234,19 +374,20 @@ class GeneralGameState(ABC):
 
     def run_sims(
         self,
-        betmode_copy_list,
         betmode,
         sim_to_criteria,
-        total_threads,
-        total_repeats,
-        num_sims,
-        thread_index,
-        repeat_count,
+        batch_index,
         compress=True,
         write_event_list=True,
         simulation_seeds=[],
+        estimate=False,
+        recycle_rejected=False,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """Assigns criteria and runs all simulations keyed in sim_to_criteria. Results are stored in temporary files to be combined when all batches are finished.
+        With estimate=True no events or books are created, payouts are only accumulated in self.win_estimates.
+        With recycle_rejected=True rejected attempts are pooled for compatible criteria (see RecyclingPool), and
+        simulations of those criteria use pooled attempts before playing their own.
+        Returns the force-record keys known to this process for the simulated betmode."""
         mode_max_win = None
         for bm in self.config.bet_modes:
             if bm._name.lower() == betmode.lower():
@@ -254,20 +395,34 @@ class GeneralGameState(ABC):
         assert mode_max_win is not None
 
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type, mode_max_win)
-        self.library = {}
+        self.estimate = estimate
+        self.win_estimates = WinEstimates() if estimate else None
+        self.book_writer = None
+        if not estimate:
+            self.book_writer = BookWriter(
+                self.output_files.get_temp_multi_thread_name(betmode, batch_index, compress),
+                self.config.output_regular_json,
+                track_events=write_event_list,
+                books_per_frame=self.config.books_per_frame if self.config.seekable_books else None,
+            )
         self.recorded_events = {}
         self.betmode = betmode
-        self.num_sims = num_sims
-        for sim in range(
-            thread_index * num_sims + (total_threads * num_sims) * repeat_count,
-            (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
-        ):
-            self.criteria = sim_to_criteria[sim]
-            self.run_spin(sim, simulation_seeds[sim])
+        self.num_sims = len(sim_to_criteria)
+        self.recycling_pool = None
+        if recycle_rejected:
+            self.recycling_pool = RecyclingPool(self.get_betmode(betmode).get_distributions(), sim_to_criteria)
+        for sim, criteria in sim_to_criteria.items():
+            self.criteria = criteria
+            attempt = self.recycling_pool.start_sim(criteria) if self.recycling_pool is not None else None
+            if attempt is not None:
+                self.imprint_recycled_attempt(sim, attempt)
+            else:
+                self.run_spin(sim, simulation_seeds[sim])
         mode_cost = self.get_current_betmode().get_cost()
+        num_sims = self.num_sims
 
         print(
-            "Thread " + str(thread_index),
+            f"Batch {batch_index}",
             "finished with",
             round(self.win_manager.total_cumulative_wins / (num_sims * mode_cost), 3),
             "RTP.",
@@ -275,16 +430,11 @@ class GeneralGameState(ABC):
             flush=True,
         )
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
-        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
-        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
-        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
+        if estimate:
+            return self.get_betmode(betmode).get_force_keys()
 
-        if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
-        betmode_copy_list.append(self.config.bet_modes)
+        self.book_writer.close()
+        print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, batch_index))
+        make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, batch_index))
+        make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, batch_index))
+        return self.get_betmode(betmode).get_force_keys()
@@ -1,27 +1,63 @@
 """Global multipliers, symbol multipliers, combined multipliers or no actions
     All functions return [final_win_amount], [applied multiplier]"""
 
-from typing import List, Dict
+from typing import Callable, List, Dict, Tuple, Union
 from src.calculations.board import Board
+from src.calculations.board_codes import BoardCodes, MULTIPLIER
+
+# Strategy name -> fn(board, win_amount, global_multiplier, positions, multiplier_key, **kwargs) -> (win, multiplier)
+MULT_STRATEGIES = {}
+
+
+def register_mult_strategy(name: str, strategy: Callable = None, replace: bool = False):
+    """Register a multiplier strategy under a name, usable as a function or as a decorator.
+    Additional keyword arguments passed to apply_mult()/apply_mults() are forwarded to the strategy.
+    Names already registered raise a ValueError, unless replace is set."""
+    if strategy is None:
+        return lambda func: register_mult_strategy(name, func, replace)
+    if name in MULT_STRATEGIES and not replace:
+        raise ValueError(f"Multiplier strategy '{name}' is already registered")
+    MULT_STRATEGIES[name] = strategy
+    return strategy
+
+
+def get_mult_strategy(strategy: Union[str, Callable]) -> Callable:
+    """Return the registered strategy function (callables are returned unchanged)."""
+    if callable(strategy):
+        return strategy
+    try:
+        return MULT_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Multiplier strategy '{strategy}' is not registered")
 
 
 def apply_mult(
     board: Board,
-    strategy: str,
+    strategy: Union[str, Callable],
     win_amount: float = 0.0,
     global_multiplier: int = 1,
     positions: list = [],
     multiplier_key: str = "multiplier",
+    **kwargs,
 ):
     """Apply multiplier method to win_amount and winning symbol positions."""
-    strat = {
-        "global": apply_global_mult(win_amount, global_multiplier),
-        "symbol": apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
-        "combined": apply_combined_mult(
-            board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key
-        ),
-    }
-    return strat[strategy]
+    return get_mult_strategy(strategy)(board, win_amount, global_multiplier, positions, multiplier_key, **kwargs)
+
+
+def apply_mults(
+    board: Board,
+    strategy: Union[str, Callable],
+    wins: List[Tuple[float, List[Dict]]],
+    global_multiplier: int = 1,
+    multiplier_key: str = "multiplier",
+    **kwargs,
+) -> List[tuple]:
+    """Apply a multiplier method to all (win_amount, positions) wins of a board, the strategy is resolved once."""
+    strategy = get_mult_strategy(strategy)
+    return [
+        strategy(board, win_amount, global_multiplier, positions, multiplier_key, **kwargs)
+        for win_amount, positions in wins
+    ]
 
 
 def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
@@ -29,15 +65,27 @@ def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
     return (round(win_amount * global_multiplier, 2), global_multiplier)
 
 
+def get_symbol_multipliers(board: Union[Board, BoardCodes], positions: List[Dict], multiplier_key: str) -> list:
+    """Multiplier attribute values of all positions holding a symbol with a multiplier."""
+    if isinstance(board, BoardCodes) and board.multiplier_key == multiplier_key:
+        flags, offsets, symbols = board.flags, board.offsets, board.board
+        return [
+            symbols[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+            for pos in positions
+            if flags[offsets[pos["reel"]] + pos["row"]] & MULTIPLIER
+        ]
+    if isinstance(board, BoardCodes):
+        board = board.board
+    return [
+        board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+        for pos in positions
+        if board[pos["reel"]][pos["row"]].check_attribute(multiplier_key)
+    ]
+
+
 def apply_added_symbol_mult(board: Board, win_amount: float, positions: List[Dict], multiplier_key: str) -> tuple:
     """Get multiplier attribute from all winning positions"""
-    symbol_multiplier = 0
-    for pos in positions:
-        if (
-            board[pos["reel"]][pos["row"]].check_attribute(multiplier_key)
-            and board[pos["reel"]][pos["row"]].get_attribute(multiplier_key) > 1
-        ):
-            symbol_multiplier += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+    symbol_multiplier = sum(mult for mult in get_symbol_multipliers(board, positions, multiplier_key) if mult > 1)
     return (round(win_amount * max(symbol_multiplier, 1), 2), max(symbol_multiplier, 1))
 
 
@@ -46,4 +94,29 @@ def apply_combined_mult(
 ) -> tuple:
     """Apply symbol multipliers and then global multiplier"""
     win, sym_mult = apply_added_symbol_mult(board, win_amount, positions, multiplier_key)
-    return (win * global_multiplier  , sym_mult * global_multiplier)
+    return (win * global_multiplier, sym_mult * global_multiplier)
+
+
+def apply_cluster_symbol_mult(
+    board: Board, win_amount: float, global_multiplier: int, positions: List[Dict], multiplier_key: str
+) -> tuple:
+    """Added (positive) symbol multipliers of a cluster and the global multiplier, returns the cluster multiplier."""
+    cluster_mult = sum(mult for mult in get_symbol_multipliers(board, positions, multiplier_key) if int(mult) > 0)
+    cluster_mult = max(cluster_mult, 1)
+    return (win_amount * cluster_mult * global_multiplier, cluster_mult)
+
+
+register_mult_strategy(
+    "global",
+    lambda board, win_amount, global_multiplier, positions, multiplier_key: apply_global_mult(
+        win_amount, global_multiplier
+    ),
+)
+register_mult_strategy(
+    "symbol",
+    lambda board, win_amount, global_multiplier, positions, multiplier_key: apply_added_symbol_mult(
+        board, win_amount, positions, multiplier_key
+    ),
+)
+register_mult_strategy("combined", apply_combined_mult)
+register_mult_strategy("cluster", apply_cluster_symbol_mult)
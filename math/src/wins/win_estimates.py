@@ -0,0 +1,97 @@
+"""Streaming win statistics kept instead of books when simulating in estimate mode."""
+
+
+class WinEstimates:
+    """Per-criteria payout accumulators: simulation and attempt counts, base/free game win sums and a histogram
+    of payout multipliers (in cents). Batches are combined with merge(), using the to_json() output of each.
+    Simulations of biased distributions are weighted by their likelihood ratio: wins and hits are accumulated times
+    the ratio and normalised by the summed ratios ("weight"), the histogram keeps unweighted counts."""
+
+    def __init__(self):
+        self.criteria = {}
+
+    def get_criteria_stats(self, criteria: str) -> dict:
+        """Accumulators of a single criteria, created on first use."""
+        if criteria not in self.criteria:
+            self.criteria[criteria] = {
+                "num_sims": 0,
+                "attempts": 0,
+                "weight": 0.0,
+                "hits": 0,
+                "total_wins": 0.0,
+                "base_wins": 0.0,
+                "free_wins": 0.0,
+                "histogram": {},
+            }
+        return self.criteria[criteria]
+
+    def add(
+        self,
+        criteria: str,
+        payout_multiplier: float,
+        basegame_wins: float,
+        freegame_wins: float,
+        attempts: int,
+        likelihood_ratio: float = 1.0,
+    ) -> None:
+        """Add a finished simulation, attempts being the number of spins needed to satisfy its criteria."""
+        stats = self.get_criteria_stats(criteria)
+        stats["num_sims"] += 1
+        stats["attempts"] += attempts
+        stats["weight"] += likelihood_ratio
+        stats["hits"] += likelihood_ratio * (payout_multiplier > 0)
+        stats["total_wins"] += likelihood_ratio * payout_multiplier
+        stats["base_wins"] += likelihood_ratio * basegame_wins
+        stats["free_wins"] += likelihood_ratio * freegame_wins
+        payout = int(round(payout_multiplier * 100, 0))
+        stats["histogram"][payout] = stats["histogram"].get(payout, 0) + 1
+
+    def merge(self, estimates: dict) -> None:
+        """Add the accumulators of another WinEstimates, as returned by its to_json()."""
+        for criteria, other in estimates.items():
+            stats = self.get_criteria_stats(criteria)
+            for key in ("num_sims", "attempts", "weight", "hits", "total_wins", "base_wins", "free_wins"):
+                stats[key] += other[key]
+            for payout, count in other["histogram"].items():
+                stats["histogram"][int(payout)] = stats["histogram"].get(int(payout), 0) + count
+
+    def to_json(self) -> dict:
+        """JSON-ready accumulators, histogram keys are payout multipliers in cents."""
+        return {
+            criteria: {
+                **stats,
+                "histogram": {str(payout): count for payout, count in sorted(stats["histogram"].items())},
+            }
+            for criteria, stats in self.criteria.items()
+        }
+
+    def get_summary(self, cost: float) -> dict:
+        """RTP, base/free game RTP, hit-rate and mean attempts of the betmode and of each criteria.
+        Criteria RTPs are conditional on the criteria, "share" is the fraction of simulations assigned to it."""
+        total_sims = sum(stats["num_sims"] for stats in self.criteria.values())
+
+        def summarise(stats: dict) -> dict:
+            num_sims = max(stats["num_sims"], 1)
+            weight = stats["weight"] if stats["weight"] > 0 else 1.0
+            return {
+                "num_sims": stats["num_sims"],
+                "share": stats["num_sims"] / max(total_sims, 1),
+                "rtp": stats["total_wins"] / (weight * cost),
+                "base_rtp": stats["base_wins"] / (weight * cost),
+                "free_rtp": stats["free_wins"] / (weight * cost),
+                "hit_rate": stats["hits"] / weight,
+                "mean_attempts": stats["attempts"] / num_sims,
+                "histogram": {str(payout): count for payout, count in sorted(stats["histogram"].items())},
+            }
+
+        combined = WinEstimates()
+        for stats in self.criteria.values():
+            # Weighted sums are rescaled for every criteria to count with its number of simulations
+            scale = stats["num_sims"] / stats["weight"] if stats["weight"] > 0 else 0.0
+            weighted = {key: stats[key] * scale for key in ("weight", "hits", "total_wins", "base_wins", "free_wins")}
+            combined.merge({"all": {**stats, **weighted}})
+        return {
+            "cost": cost,
+            "mode": summarise(combined.get_criteria_stats("all")),
+            "criteria": {criteria: summarise(stats) for criteria, stats in sorted(self.criteria.items())},
+        }
@@ -7,8 +7,11 @@ import os
 import hashlib
 import json
 import ast
+from typing import List, Union
 import zstandard as zstd
 
+MERGE_BUFFER_SIZE = 1 << 20
+
 
 def get_sha_256(file_to_hash: str):
     """Get human readable hash of file."""
@@ -74,47 +77,114 @@ def get_force_options(force_results: dict):
     return {key: list(val) for key, val in force_keys.items()}
 
 
+class BookWriter:
+    """Serialise (and zstd-compress) each book as soon as it is imprinted.
+    Only a compact (id, payoutMultiplier, criteria, baseGameWins, freeGameWins) record is kept in memory per sim,
+    along with one example of every event type when track_events is set.
+    With books_per_frame set, compressed books are written as independent zstd frames of that many books, and
+    [offset, size, book_ids] of each frame is kept in self.frames for building a seekable index."""
+
+    def __init__(
+        self,
+        filename: str,
+        output_regular_json: bool = False,
+        track_events: bool = False,
+        books_per_frame: int = None,
+    ):
+        self.filename = filename
+        self.records = []
+        self.event_items = {} if track_events else None
+        self.num_books = 0
+        self.books_per_frame = None
+        self.frames = None
+        if filename.endswith(".zst") and books_per_frame is not None:
+            assert books_per_frame > 0, "books_per_frame must be positive"
+            self.regular_json = False
+            self.books_per_frame = books_per_frame
+            self.frames = []
+            self.frame_buffer = []
+            self.frame_ids = []
+            self.compressor = zstd.ZstdCompressor()
+            self.stream = open(filename, "wb")
+        elif filename.endswith(".zst"):
+            self.regular_json = False
+            self.stream = zstd.ZstdCompressor().stream_writer(open(filename, "wb"), closefd=True)
+        else:
+            self.regular_json = output_regular_json
+            self.stream = open(filename, "wb")
+            if self.regular_json:
+                self.stream.write(b"[")
+
+    def write(self, book: dict) -> None:
+        """Append a single JSON-ready book to the output file."""
+        book_str = json.dumps(book)
+        if self.regular_json:
+            book_str = (", " if self.num_books > 0 else "") + book_str
+        else:
+            book_str += "\n"
+        if self.books_per_frame is not None:
+            self.frame_ids.append(book["id"])
+            self.frame_buffer.append(book_str.encode("UTF-8"))
+            if len(self.frame_buffer) == self.books_per_frame:
+                self.flush_frame()
+        else:
+            self.stream.write(book_str.encode("UTF-8"))
+        self.num_books += 1
+        self.records.append(
+            (book["id"], book["payoutMultiplier"], book["criteria"], book["baseGameWins"], book["freeGameWins"])
+        )
+        if self.event_items is not None:
+            update_unique_events(self.event_items, book)
+
+    def flush_frame(self) -> None:
+        """Compress buffered books into a single, independently decompressible frame."""
+        if len(self.frame_buffer) == 0:
+            return
+        frame = self.compressor.compress(b"".join(self.frame_buffer))
+        self.frames.append([self.stream.tell(), len(frame), self.frame_ids])
+        self.stream.write(frame)
+        self.frame_buffer = []
+        self.frame_ids = []
+
+    def close(self) -> None:
+        """Finalise the (compressed) output file."""
+        if self.books_per_frame is not None:
+            self.flush_frame()
+        if self.regular_json:
+            self.stream.write(b"]")
+        self.stream.close()
+
+
 def make_lookup_tables(gamestate: object, name: str):
     """Write lookup tables for all simulations."""
     file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
-        file.write("{},1,{}\n".format(gamestate.library[sim]["id"], gamestate.library[sim]["payoutMultiplier"]))
+    records = sorted(gamestate.book_writer.records, key=lambda record: record[0])
+    for book_id, payout_multiplier, _, _, _ in records:
+        file.write("{},1,{}\n".format(book_id, payout_multiplier))
     file.close()
 
 
 def make_lookup_pay_split(gamestate: object, name: str):
     """Record win values from basegame and freegame types."""
     file = open(name, "w", encoding="UTF-8")
-    sims = list(gamestate.library.keys())
-    sims.sort()
-    for sim in sims:
+    records = sorted(gamestate.book_writer.records, key=lambda record: record[0])
+    for book_id, _, criteria, base_wins, free_wins in records:
         file.write(
-            str(gamestate.library[sim]["id"])
-            + ","
-            + str(gamestate.library[sim]["criteria"])
-            + ","
-            + str(round(gamestate.library[sim]["baseGameWins"], 2))
-            + ","
-            + str(round(gamestate.library[sim]["freeGameWins"], 2))
-            + "\n"
+            str(book_id) + "," + str(criteria) + "," + str(round(base_wins, 2)) + "," + str(round(free_wins, 2)) + "\n"
         )
     file.close()
 
 
-def write_library_events(gamestate: object, library: list, gametype: str):
+def update_unique_events(event_items: dict, book: dict) -> None:
+    """Keep the first example of every event type, excluding its index."""
+    for instance in book["events"]:
+        lib_event = instance["type"]
+        if lib_event not in event_items:
+            event_items[lib_event] = {key: instance[key] for key in instance.keys() if key != "index"}
+
+
+def write_library_events(gamestate: object, event_items: dict, gametype: str):
     """Write all unique events within a given mode - with one example application."""
-    unique_event = []
-    event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -124,38 +194,169 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
+def write_batch_manifest(manifest_path: str, manifest: dict) -> None:
+    """Record the sim-range and temporary output files of every batch in a betmode (or betmode shard).
+    File paths are stored relative to the manifest, so shard directories can be moved before merging."""
+    manifest_dir = os.path.dirname(manifest_path)
+    manifest = dict(manifest)
+    manifest["batches"] = [
+        {
+            **batch,
+            "files": {kind: os.path.relpath(path, manifest_dir) for kind, path in batch["files"].items()},
+            "record": os.path.relpath(batch["record"], manifest_dir),
+        }
+        for batch in manifest["batches"]
+    ]
+    with open(manifest_path, "w", encoding="UTF-8") as f:
+        json.dump(manifest, f, indent=4)
+
+
+def load_batch_manifest(manifest_paths: Union[str, List[str]]) -> dict:
+    """Load one or more (shard) batch manifests of a betmode, with batches ordered by their first simulation id.
+    All shards must share the same criteria/seed assignment and together cover every simulation exactly once."""
+    if isinstance(manifest_paths, str):
+        manifest_paths = [manifest_paths]
+    manifest = None
+    shards = set()
+    for manifest_path in manifest_paths:
+        with open(manifest_path, "r", encoding="UTF-8") as f:
+            shard_manifest = json.load(f)
+        manifest_dir = os.path.dirname(manifest_path)
+        for batch in shard_manifest["batches"]:
+            batch["files"] = {kind: os.path.join(manifest_dir, path) for kind, path in batch["files"].items()}
+            batch["record"] = os.path.join(manifest_dir, batch["record"])
+        if manifest is None:
+            manifest = shard_manifest
+        else:
+            for key in ("betmode", "num_sims", "num_shards", "compress", "assignment_hash"):
+                assert shard_manifest[key] == manifest[key], f"Shard manifests disagree on '{key}': {manifest_path}"
+            manifest["batches"].extend(shard_manifest["batches"])
+        assert shard_manifest["shard_index"] not in shards, f"Duplicate shard {shard_manifest['shard_index']}"
+        shards.add(shard_manifest["shard_index"])
+    assert manifest is not None, "No batch manifests provided"
+    missing_shards = set(range(manifest["num_shards"])) - shards
+    assert len(missing_shards) == 0, f"Missing manifests for shards {sorted(missing_shards)}"
+
+    manifest["batches"].sort(key=lambda batch: batch["sim_start"])
+    covered = 0
+    for batch in manifest["batches"]:
+        assert batch["sim_start"] == covered, f"Batch manifest is missing simulations {covered}-{batch['sim_start']}"
+        covered = batch["sim_end"]
+    assert covered == manifest["num_sims"], f"Batch manifest covers {covered} of {manifest['num_sims']} simulations"
+    return manifest
+
+
+def write_batch_record(record_path: str, record: dict) -> None:
+    """Write a batch completion record. The file is replaced atomically, so a partial record is never read."""
+    temp_record_path = record_path + ".tmp"
+    with open(temp_record_path, "w", encoding="UTF-8") as f:
+        json.dump(record, f)
+    os.replace(temp_record_path, record_path)
+
+
+def load_batch_record(record_path: str) -> dict:
+    """Load a batch completion record."""
+    with open(record_path, "r", encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def write_estimate_summary(summary_path: str, summary: dict) -> None:
+    """Write the combined win estimates of an estimate mode run."""
+    os.makedirs(os.path.dirname(summary_path), exist_ok=True)
+    with open(summary_path, "w", encoding="UTF-8") as f:
+        json.dump(summary, f, indent=4)
+
+
+def merge_compressed_books(file_list: List[str], final_out: str, merge_mode: str = "recompress", threads: int = -1):
+    """Combine compressed temp books into a single .jsonl.zst file.
+    "recompress" writes a single frame through a multi-threaded streaming compressor. Memory use is bounded
+    and no decompressed scratch file is needed. Multi-threaded zstd output does not depend on the number of
+    worker threads, so the file is byte-identical for any thread count, batch size or sharding of the run.
+    A sequence of zstd frames is a valid zstd stream, so "concat" copies each worker frame as-is. It is faster,
+    but only the decompressed content is deterministic. Multi-frame files must be read with read_across_frames=True."""
+    if merge_mode == "concat":
+        with open(final_out, "wb") as f_out:
+            for fname in file_list:
+                with open(fname, "rb") as f_in:
+                    shutil.copyfileobj(f_in, f_out, MERGE_BUFFER_SIZE)
+    elif merge_mode == "recompress":
+        decompressor = zstd.ZstdDecompressor()
+        with open(final_out, "wb") as f_out:
+            # threads=0 would select single-threaded compression, whose output differs from the multi-threaded one
+            with zstd.ZstdCompressor(threads=threads or 1).stream_writer(f_out, closefd=False) as writer:
+                for fname in file_list:
+                    with open(fname, "rb") as f_in:
+                        decompressor.copy_stream(f_in, writer, read_size=MERGE_BUFFER_SIZE)
+    else:
+        raise ValueError(f"Unknown book merge mode: {merge_mode}")
+
+
+def merge_seekable_books(
+    file_list: List[str], batch_frames: List[list], final_out: str, index_path: str, books_per_frame: int
+) -> None:
+    """Combine seekable worker books into frames of books_per_frame books, and write the sidecar index.
+    Books are re-framed in file order, so the output is byte-identical for any batch partition of the run.
+    The index stores {"books": name, "frames": [[offset, size, book_ids], ...]}, with the explicit book-ids of
+    every frame in line order, so no ordering or contiguity of book-ids is assumed."""
+    compressor = zstd.ZstdCompressor()
+    decompressor = zstd.ZstdDecompressor()
+    frames, buffer, buffer_ids = [], [], []
+    with open(final_out, "wb") as f_out:
+
+        def flush_frame():
+            frame = compressor.compress(b"".join(buffer))
+            frames.append([f_out.tell(), len(frame), list(buffer_ids)])
+            f_out.write(frame)
+            buffer.clear()
+            buffer_ids.clear()
+
+        for fname, frames_in_file in zip(file_list, batch_frames):
+            assert frames_in_file is not None, f"{fname} was not written as a seekable book file"
+            with open(fname, "rb") as f_in:
+                for offset, size, book_ids in frames_in_file:
+                    f_in.seek(offset)
+                    lines = decompressor.decompress(f_in.read(size)).splitlines(keepends=True)
+                    assert len(lines) == len(book_ids), f"Frame at {offset} of {fname} does not match its record"
+                    for line, book_id in zip(lines, book_ids):
+                        buffer.append(line)
+                        buffer_ids.append(book_id)
+                        if len(buffer) == books_per_frame:
+                            flush_frame()
+        if len(buffer) > 0:
+            flush_frame()
+    with open(index_path, "w", encoding="UTF-8") as f:
+        json.dump({"books": os.path.basename(final_out), "frames": frames}, f)
+
+
 def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
     game_id: str,
     betmode: str,
     gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
+    manifest_paths: Union[str, List[str]],
 ):
-    """Combine temporary lookup tables and force files into a single output."""
+    """Combine temporary books, lookup tables and force files listed in the batch manifest(s) into a single output."""
     print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
-
-    if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+    manifest = load_batch_manifest(manifest_paths)
+    batch_results = manifest["batches"]
+    compress = manifest["compress"]
+
+    file_list = [batch["files"]["books"] for batch in batch_results]
+
+    if compress and gamestate.config.seekable_books:
+        merge_seekable_books(
+            file_list,
+            [load_batch_record(batch["record"])["frames"] for batch in batch_results],
+            gamestate.output_files.get_final_book_name(betmode, True),
+            gamestate.output_files.get_final_book_index_name(betmode),
+            gamestate.config.books_per_frame,
+        )
+    elif compress:
+        merge_compressed_books(
+            file_list,
+            gamestate.output_files.get_final_book_name(betmode, True),
+            gamestate.config.book_merge_mode,
+            gamestate.config.book_compression_threads,
+        )
     else:
         with open(
             gamestate.output_files.get_final_book_name(betmode, False),
@@ -173,18 +374,13 @@ def output_lookup_and_force_files(
                         elif id == 0 and len(file_list) > 1:
                             outfile.write(file_data[:-1])  # don't write final ']'
                         elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
+                            outfile.write(", " + file_data[1:-1])  # don't write first or last '[/]'
                         else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
+                            outfile.write(", " + file_data[1::])  # dont write first '[', write last ']'
 
     print("Saving force files for", game_id, "in", betmode)
     force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
+    file_list = [batch["files"]["force"] for batch in batch_results]
 
     for filename in file_list:
         force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
@@ -224,17 +420,9 @@ def output_lookup_and_force_files(
     with open(json_file_path, "w", encoding="UTF-8") as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
     print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    weights_plus_wins_file_list = [batch["files"]["lookup"] for batch in batch_results]
+    segmented_lut_file_list = [batch["files"]["segmented"] for batch in batch_results]
 
     with open(
         gamestate.output_files.get_final_lookup_name(betmode),
@@ -261,25 +449,6 @@ def output_lookup_and_force_files(
                 outfile.write(infile.read())
 
 
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
-
-    if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
-    else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
-
-
 def print_recorded_wins(gamestate: object, name: str = ""):
     """Temporary file generation for wins/recorded results."""
     json_object = json.dumps(str(gamestate.recorded_events), indent=4)
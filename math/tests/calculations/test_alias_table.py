@@ -0,0 +1,79 @@
+"""Test alias table draws and their ownership by distribution conditions."""
+
+import random
+import pickle
+from collections import Counter
+from src.calculations import statistics
+from src.calculations.statistics import AliasTable, get_alias_table, get_random_outcome, get_random_outcomes
+from src.config.distributions import Distribution
+
+WEIGHTS = {"a": 1, "b": 2, "c": 3, "d": 10, "e": 0.5}
+NUM_DRAWS = 50000
+# Chi-square 0.999 quantile with len(WEIGHTS) - 1 = 4 dof
+CHI2_LIMIT = 18.47
+
+
+def test_alias_draws_match_weights():
+    """Frequencies of alias table draws match the weights."""
+    counts = Counter(AliasTable(WEIGHTS).sample_k(random.Random(0), NUM_DRAWS))
+    total = sum(WEIGHTS.values())
+    expected = {value: NUM_DRAWS * weight / total for value, weight in WEIGHTS.items()}
+    assert sum((counts[value] - expected[value]) ** 2 / expected[value] for value in WEIGHTS) < CHI2_LIMIT
+
+
+def test_alias_draws_match_random_outcome():
+    """Alias table draws and linear scan draws of get_random_outcome() follow the same distribution."""
+    table, rng = AliasTable(WEIGHTS), random.Random(1)
+    alias_counts = Counter(table.sample(rng) for _ in range(NUM_DRAWS))
+    rng = random.Random(2)
+    scan_counts = Counter(get_random_outcome(WEIGHTS, sum(WEIGHTS.values()), rng) for _ in range(NUM_DRAWS))
+
+    # Chi-square test of homogeneity, both samples have NUM_DRAWS draws
+    statistic = 0.0
+    for value in WEIGHTS:
+        expected = (alias_counts[value] + scan_counts[value]) / 2
+        statistic += (alias_counts[value] - expected) ** 2 / expected + (scan_counts[value] - expected) ** 2 / expected
+    assert statistic < CHI2_LIMIT
+
+
+def test_distribution_alias_tables_follow_conditions():
+    """Tables follow in place changes and replacements of the conditions, also after pickling."""
+    distribution = Distribution(
+        criteria="basegame",
+        quota=1,
+        conditions={"reel_weights": {"basegame": {"BR0": 1}}, "mult_values": {2: 1, 3: 0}},
+    )
+    table = distribution.get_alias_table("mult_values", "basegame")
+    assert table is distribution.get_alias_table("mult_values", "freegame")
+    assert table.sample(random.Random(0)) == 2
+
+    distribution.get_conditions()["mult_values"][2] = 0
+    distribution.get_conditions()["mult_values"][3] = 1
+    assert distribution.get_alias_table("mult_values", "basegame").sample(random.Random(0)) == 3
+    distribution.get_conditions()["mult_values"] = {4: 1}
+    assert distribution.get_alias_table("mult_values", "basegame").sample(random.Random(0)) == 4
+    distribution.get_conditions()["reel_weights"]["basegame"] = {"BR1": 1}
+    assert distribution.get_alias_table("reel_weights", "basegame").values == ["BR1"]
+
+    copy = pickle.loads(pickle.dumps(distribution))
+    copy.get_conditions()["mult_values"].update({4: 0, 5: 1})
+    assert copy.get_alias_table("mult_values", "basegame").sample(random.Random(0)) == 5
+    assert distribution.get_alias_table("mult_values", "basegame").sample(random.Random(0)) == 4
+
+
+def test_random_outcome_tables_cached_by_content(monkeypatch):
+    """Ad-hoc distributions share tables by content, mutations are picked up and the cache stays bounded."""
+    monkeypatch.setattr(statistics, "_alias_cache", statistics.OrderedDict())
+    monkeypatch.setattr(statistics, "ALIAS_CACHE_SIZE", 4)
+    weights = dict(WEIGHTS)
+    assert get_alias_table(weights) is get_alias_table(dict(WEIGHTS))
+
+    weights["a"], weights["d"] = 0, 0
+    assert get_alias_table(weights) is not get_alias_table(WEIGHTS)
+    assert set(get_random_outcomes(weights, 1000, random.Random(0))) == {"b", "c", "e"}
+    assert get_alias_table({"a": 0}) is None
+    assert get_random_outcome({"a": 0, "b": 0}) == "a"
+
+    for value in range(10):
+        assert get_random_outcome({value: 1}, rng=random.Random(0)) == value
+    assert len(statistics._alias_cache) == 4
@@ -0,0 +1,58 @@
+"""Test the integer-coded board against symbol names and check_attribute()."""
+
+import pytest
+from src.calculations.board_codes import BoardCodes, WILD, SCATTER, MULTIPLIER, WILD_SYMBOL
+from src.calculations.symbol import SymbolStorage
+
+
+class SymbolConfig:
+    """Paytable and special symbols only."""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 10, (3, "L1"): 3}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["M"], "prize": ["W"]}
+
+
+def create_board(storage: SymbolStorage) -> list:
+    """Special symbols, plain symbols and plain symbols with assigned attributes."""
+    board = [
+        [storage.create_symbol(name) for name in ("W", "S", "M")],
+        [storage.create_symbol(name) for name in ("H1", "L1", "H1")],
+        [storage.create_symbol(name) for name in ("L1", "H1", "W")],
+    ]
+    board[1][0] = board[1][0].assign_attribute({"multiplier": 3})
+    board[1][1] = board[1][1].assign_attribute({"wild": True})
+    board[1][2] = board[1][2].assign_attribute({"scatter": True, "multiplier": 0})
+    board[2][0] = board[2][0].assign_attribute({"prize": 2, "explode": True})
+    board[2][2] = board[2][2].assign_attribute({"multiplier": 5})
+    return board
+
+
+def test_definition_flags_computed_with_storage():
+    """Flags for the default keys are stored on every definition when symbols are registered."""
+    storage = SymbolStorage(SymbolConfig(), ["H1", "L1", "M", "S", "W"])
+    for defn in storage.symbol_defs.values():
+        assert list(defn.board_flags) == [("wild", "multiplier")]
+    flag, attribute_bits = storage.symbol_defs["W"].get_board_flags()
+    assert flag == WILD | WILD_SYMBOL and attribute_bits == ((SCATTER, "scatter"), (MULTIPLIER, "multiplier"))
+
+
+@pytest.mark.parametrize("wild_key, multiplier_key", [("wild", "multiplier"), ("wild", "prize")])
+def test_codes_match_check_attribute(wild_key, multiplier_key):
+    """Codes name the symbols and flags match check_attribute() at every position."""
+    config = SymbolConfig()
+    storage = SymbolStorage(config, ["H1", "L1", "M", "S", "W"])
+    board = create_board(storage)
+    board_codes = BoardCodes(board, wild_key, multiplier_key)
+
+    for reel, symbols in enumerate(board):
+        for row, sym in enumerate(symbols):
+            idx = board_codes.index(reel, row)
+            assert board_codes.symbol_names[board_codes.codes[idx]] == sym.name
+            assert board_codes.has_flag(reel, row, WILD) == sym.check_attribute(wild_key)
+            assert board_codes.has_flag(reel, row, SCATTER) == sym.check_attribute("scatter")
+            assert board_codes.has_flag(reel, row, MULTIPLIER) == sym.check_attribute(multiplier_key)
+            assert board_codes.has_flag(reel, row, WILD_SYMBOL) == (sym.name in config.special_symbols[wild_key])
+    assert board_codes.has_flag(1, 1, WILD) and not board_codes.has_flag(1, 1, WILD_SYMBOL)
+    assert board_codes.has_flag(1, 2, SCATTER) and not board_codes.has_flag(1, 2, MULTIPLIER)
+    assert board_codes.has_flag(2, 0, MULTIPLIER) is (multiplier_key == "prize")
@@ -0,0 +1,61 @@
+"""Test conditional reel stop sampling against the enumerated stop combinations."""
+
+import itertools
+import math
+import random
+from collections import Counter
+import pytest
+from src.calculations.reelstrips import StopCountTable
+
+STRIPS = [
+    ["S", "H1", "L1", "S", "L2", "H1"],
+    ["H1", "S", "L1", "L2", "L1"],
+    ["L1", "S", "S", "H1", "L2", "L1", "H1"],
+]
+NUM_ROWS = 2
+NUM_DRAWS = 40000
+
+
+def get_windows(strip: list) -> list:
+    """Symbols shown at each stop position, wrapping around the end of the strip."""
+    return [tuple(strip[(stop + row) % len(strip)] for row in range(NUM_ROWS)) for stop in range(len(strip))]
+
+
+def count_targets(stops: tuple, windows: list) -> int:
+    """Number of target symbols shown by a stop combination."""
+    return sum(windows[reel][stop].count("S") for reel, stop in enumerate(stops))
+
+
+def chi2_limit(dof: int) -> float:
+    """Wilson-Hilferty approximation of the chi-square 0.999 quantile."""
+    scale = 2 / (9 * dof)
+    return dof * (1 - scale + 3.09 * math.sqrt(scale)) ** 3
+
+
+@pytest.mark.parametrize("totals", [[2], [0, 3]])
+def test_sampled_stops_match_enumeration(totals):
+    """Stops sampled for fixed totals are uniform over all enumerated combinations showing those totals."""
+    windows = [get_windows(strip) for strip in STRIPS]
+    table = StopCountTable(windows, {"S"})
+    combinations = [
+        stops
+        for stops in itertools.product(*(range(len(strip)) for strip in STRIPS))
+        if count_targets(stops, windows) in totals
+    ]
+    assert table.count_combinations(totals) == len(combinations)
+    assert table.num_combinations() == math.prod(len(strip) for strip in STRIPS)
+
+    rng = random.Random(0)
+    counts = Counter(tuple(table.sample(rng, totals)) for _ in range(NUM_DRAWS))
+    assert set(counts) <= set(combinations)
+
+    expected = NUM_DRAWS / len(combinations)
+    statistic = sum((counts[stops] - expected) ** 2 / expected for stops in combinations)
+    assert statistic < chi2_limit(len(combinations) - 1)
+
+
+def test_impossible_total_raises():
+    """Totals no stop combination can show are rejected."""
+    table = StopCountTable([get_windows(strip) for strip in STRIPS], {"S"})
+    with pytest.raises(ValueError):
+        table.sample(random.Random(0), [len(STRIPS) * NUM_ROWS + 1])
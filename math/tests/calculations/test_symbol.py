@@ -0,0 +1,52 @@
+"""Test copying and pickling of shared symbol instances."""
+
+import copy
+import pickle
+import random
+import pytest
+from src.calculations.symbol import SharedSymbol, SymbolStorage
+from tests.state.sample_game import load_game
+
+
+class SymbolConfig:
+    """Paytable and special symbols only."""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 10, (3, "L1"): 3}
+        self.special_symbols = {"wild": ["W"]}
+
+
+COPIES = [
+    lambda obj: pickle.loads(pickle.dumps(obj)),
+    copy.copy,
+    copy.deepcopy,
+]
+
+
+@pytest.mark.parametrize("copy_fn", COPIES)
+def test_shared_symbol_round_trip(copy_fn):
+    """Copies of a shared symbol are frozen shared symbols of the same definition."""
+    symbol = SymbolStorage(SymbolConfig(), ["H1", "L1", "W"]).create_symbol("H1")
+    copied = copy_fn(symbol)
+    assert isinstance(copied, SharedSymbol)
+    assert copied.name == "H1" and copied.defn.paytable == symbol.defn.paytable
+    with pytest.raises(AttributeError):
+        copied.explode = True
+    assert copied.assign_attribute({"explode": True}).explode
+
+
+@pytest.mark.parametrize("copy_fn", [COPIES[0], COPIES[2]])
+def test_gamestate_round_trip(tmp_path, monkeypatch, copy_fn):
+    """Gamestates holding shared symbols can be pickled and deep-copied, positions keep sharing instances."""
+    _, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    gamestate.betmode, gamestate.criteria, gamestate.gametype = "base", "basegame", "basegame"
+    gamestate.rng = random.Random(0)
+    gamestate.create_board_reelstrips()
+
+    copied = copy_fn(gamestate)
+    assert copied.board_string(copied.board) == gamestate.board_string(gamestate.board)
+    shared = copied.symbol_storage.shared_symbols
+    for reel in copied.board:
+        for symbol in reel:
+            if symbol.name in shared:
+                assert symbol is shared[symbol.name]
@@ -0,0 +1,64 @@
+"""Load sample games with their library redirected to a temporary folder."""
+
+import importlib
+import json
+import os
+import sys
+import zstandard as zstd
+import src.config.output_filenames as output_filenames
+from src.config.paths import PATH_TO_GAMES
+
+# Game-local modules, imported by name from the game folder
+GAME_MODULES = (
+    "gamestate",
+    "game_override",
+    "game_executables",
+    "game_calculations",
+    "game_events",
+    "game_config",
+    "game_optimization",
+)
+
+
+def load_game(game_id: str, output_root: str, monkeypatch) -> tuple:
+    """Return (config, gamestate) of a sample game, outputs are written to output_root/<game_id>/library."""
+    for name in GAME_MODULES:
+        sys.modules.pop(name, None)
+    monkeypatch.syspath_prepend(os.path.join(PATH_TO_GAMES, game_id))
+    monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", str(output_root))
+    config = importlib.import_module("game_config").GameConfig()
+    gamestate = importlib.import_module("gamestate").GameState(config)
+    return config, gamestate
+
+
+def read_lookup(gamestate: object, name: str, betmode: str) -> list:
+    """Rows of a final lookup table ("base_lookup" or "segmented_id") of a betmode."""
+    path = os.path.join(gamestate.output_files.lookup_path, gamestate.output_files.lookups[betmode]["names"][name])
+    with open(path, "r", encoding="UTF-8") as f:
+        return [line.strip().split(",") for line in f if line.strip()]
+
+
+def read_books(gamestate: object, betmode: str) -> list:
+    """Final books of a betmode, compressed or not."""
+    compressed = gamestate.output_files.get_final_book_name(betmode, True)
+    if os.path.isfile(compressed):
+        with open(compressed, "rb") as f:
+            data = zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True).read()
+        return [json.loads(line) for line in data.decode("UTF-8").splitlines() if line]
+    with open(gamestate.output_files.get_final_book_name(betmode, False), "r", encoding="UTF-8") as f:
+        if gamestate.config.output_regular_json:
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def read_outputs(gamestate: object) -> dict:
+    """Bytes of every final output file (books, lookup tables, force and config files), by library-relative path."""
+    outputs = {}
+    library_path = gamestate.output_files.library_path
+    for folder in ("books", "publish_files", "lookup_tables", "forces", "configs"):
+        for root, _, files in os.walk(os.path.join(library_path, folder)):
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path, "rb") as f:
+                    outputs[os.path.relpath(path, library_path)] = f.read()
+    return outputs
@@ -0,0 +1,31 @@
+"""Test that every spin attempt draws from its own seeded rng stream."""
+
+import random
+from src.calculations.statistics import derive_rng_seed
+from tests.state.sample_game import load_game
+
+
+def test_attempts_use_derived_streams(tmp_path, monkeypatch):
+    """reset_book() seeds attempt k of a simulation from (betmode, simulation seed, k)."""
+    _, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    gamestate.betmode = "base"
+    for seed_override in (None, 9001):
+        gamestate.reset_seed(5, seed_override)
+        sim_seed = 5 if seed_override is None else seed_override
+        for attempt in range(3):
+            gamestate.reset_book()
+            expected = random.Random(derive_rng_seed("base", sim_seed, attempt))
+            assert [gamestate.rng.random() for _ in range(5)] == [expected.random() for _ in range(5)]
+
+
+def test_global_random_state_is_ignored(tmp_path, monkeypatch):
+    """Attempts do not depend on the global random module."""
+    _, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    gamestate.betmode = "base"
+    draws = []
+    for global_seed in (1, 2):
+        random.seed(global_seed)
+        gamestate.reset_seed(3)
+        gamestate.reset_book()
+        draws.append([gamestate.rng.random() for _ in range(5)])
+    assert draws[0] == draws[1]
@@ -0,0 +1,32 @@
+"""Test that every weighted condition drawn by the sample games updates the likelihood ratio."""
+
+import pytest
+from tests.state.sample_game import load_game
+from tests.state.test_cluster_game import run_book
+
+# (game, betmode, criteria, condition, biased weights or None to keep the game weights, nominal weights)
+BIASED_CONDITIONS = [
+    ("0_0_expwilds", "base", "freegame", "scatter_triggers", None, {4: 1, 5: 1}),
+    ("0_0_expwilds", "base", "freegame", "landing_wilds", None, {0: 1, 1: 1, 2: 1, 3: 1}),
+    ("0_0_expwilds", "base", "freegame", "mult_values", None, {"freegame": dict.fromkeys([2, 3, 4, 5, 10, 20, 50], 1)}),
+    ("0_0_expwilds", "superspin", "0", "prize_values", {1: 1, 2: 1}, {1: 3, 2: 1}),
+    ("0_0_ways", "base", "freegame", "scatter_triggers", None, {3: 1, 4: 1, 5: 1}),
+    ("0_0_ways", "base", "freegame", "mult_values", None, {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}),
+    ("0_0_lines", "base", "freegame", "mult_values", None, {"freegame": dict.fromkeys([2, 3, 4, 5, 10, 20, 50], 1)}),
+]
+
+
+@pytest.mark.parametrize("game_id, betmode, criteria, key, biased, nominal", BIASED_CONDITIONS)
+def test_condition_updates_likelihood_ratio(tmp_path, monkeypatch, game_id, betmode, criteria, key, biased, nominal):
+    """With only one condition biased, books are weighted by a likelihood ratio other than 1."""
+    _, gamestate = load_game(game_id, tmp_path, monkeypatch)
+    distribution = next(d for d in gamestate.get_betmode(betmode).get_distributions() if d.get_criteria() == criteria)
+    conditions = dict(distribution.get_conditions())
+    if biased is not None:
+        conditions[key] = biased
+    conditions["nominal_weights"] = {key: nominal}
+    distribution.verify_and_set_conditions(conditions)
+
+    ratios = [run_book(gamestate, betmode, criteria, sim)["likelihoodRatio"] for sim in range(10)]
+    assert all(ratio > 0 for ratio in ratios)
+    assert any(ratio != pytest.approx(1.0) for ratio in ratios)
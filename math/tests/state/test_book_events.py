@@ -0,0 +1,51 @@
+"""Test that stored book events do not share data with the gamestate."""
+
+import json
+import pytest
+from src.state.books import Book
+from tests.state.sample_game import load_game
+from tests.state.test_cluster_game import run_book
+
+# Gamestate attributes which hold the book itself or no simulation data
+SKIPPED_ATTRIBUTES = {"config", "book", "book_writer", "symbol_storage", "output_files", "rng"}
+
+
+def scramble(obj, seen: set) -> None:
+    """Overwrite every number and string held in (nested) lists and dicts in place."""
+    if id(obj) in seen or not isinstance(obj, (list, dict)):
+        return
+    seen.add(id(obj))
+    keys = range(len(obj)) if isinstance(obj, list) else list(obj)
+    for key in keys:
+        value = obj[key]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            obj[key] = -1
+        elif isinstance(value, str):
+            obj[key] = "scrambled"
+        else:
+            scramble(value, seen)
+
+
+@pytest.mark.parametrize("game_id", ["0_0_lines", "0_0_ways", "0_0_scatter", "0_0_cluster", "0_0_expwilds"])
+def test_events_unchanged_by_gamestate(tmp_path, monkeypatch, game_id):
+    """Books are unchanged when all gamestate data is modified after imprint_wins()."""
+    for sim in range(3):
+        # Scrambling also overwrites cached reelstrip data, so every book is simulated on a fresh gamestate
+        _, gamestate = load_game(game_id, tmp_path, monkeypatch)
+        book = run_book(gamestate, "bonus", "freegame", sim)
+        written = json.dumps(book)
+        seen = set()
+        for name, value in vars(gamestate).items():
+            if name not in SKIPPED_ATTRIBUTES:
+                scramble(value, seen)
+        assert json.dumps(book) == written
+
+
+def test_aliased_event_detected():
+    """With aliasing checks enabled, events modified after they were added raise when the book is written."""
+    book = Book(0, "basegame", check_aliasing=True)
+    positions = [0, 1, 2]
+    book.add_event({"index": 0, "type": "reveal", "reelPositions": positions})
+    positions[0] = 5
+    with pytest.raises(RuntimeError):
+        book.to_json()
@@ -0,0 +1,54 @@
+"""Test that books of the cluster sample game do not depend on previously simulated books."""
+
+import pytest
+from src.wins.win_manager import WinManager
+from tests.state.sample_game import load_game
+
+
+class BookCollector:
+    """Keeps imprinted books in memory instead of writing them."""
+
+    def __init__(self):
+        self.books = []
+
+    def write(self, book: dict) -> None:
+        self.books.append(book)
+
+
+def run_book(gamestate, betmode: str, criteria: str, sim: int) -> dict:
+    """Simulate a single book and return it."""
+    gamestate.betmode, gamestate.criteria = betmode, criteria
+    gamestate.win_manager = WinManager(
+        gamestate.config.basegame_type, gamestate.config.freegame_type, gamestate.get_betmode(betmode).get_wincap()
+    )
+    gamestate.book_writer = BookCollector()
+    gamestate.run_spin(sim, sim)
+    return gamestate.book_writer.books[0]
+
+
+@pytest.fixture
+def cluster_game(tmp_path, monkeypatch):
+    """Loader for fresh cluster gamestates."""
+    return lambda: load_game("0_0_cluster", tmp_path, monkeypatch)[1]
+
+
+def test_reset_book_clears_grid_multipliers(cluster_game):
+    """Grid multipliers left by a freegame are cleared for the next book."""
+    gamestate = cluster_game()
+    for reel in gamestate.position_multipliers:
+        reel[:] = [4] * len(reel)
+    gamestate.reset_book()
+    assert all(mult == 0 for reel in gamestate.position_multipliers for mult in reel)
+
+
+def test_books_independent_of_previous_freegame(cluster_game):
+    """A basegame book is identical whether or not a freegame was simulated before it."""
+    fresh = cluster_game()
+    expected = [run_book(fresh, "base", "basegame", sim) for sim in range(5)]
+
+    gamestate = cluster_game()
+    books = []
+    for sim in range(5):
+        run_book(gamestate, "bonus", "freegame", 100 + sim)
+        books.append(run_book(gamestate, "base", "basegame", sim))
+    assert books == expected
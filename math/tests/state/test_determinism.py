@@ -0,0 +1,25 @@
+"""Test that outputs do not depend on how simulations are spread over workers and batches."""
+
+import pytest
+from src.state.run_sims import create_books
+from tests.state.sample_game import load_game, read_outputs
+
+NUM_SIMS = {"base": 200, "bonus": 40}
+
+
+def run_outputs(root, monkeypatch, game_id: str, batch_size: int, threads: int, compress: bool = False) -> dict:
+    """Final outputs of a run."""
+    config, gamestate = load_game(game_id, root, monkeypatch)
+    create_books(gamestate, config, dict(NUM_SIMS), batch_size, threads, compress, False)
+    return read_outputs(gamestate)
+
+
+@pytest.mark.parametrize("game_id, compress", [("0_0_lines", False), ("0_0_cluster", False), ("0_0_lines", True)])
+def test_outputs_independent_of_threads(tmp_path, monkeypatch, game_id, compress):
+    """Books, lookup tables, force and event files are identical for 1 and 3 threads and any batch size."""
+    single = run_outputs(tmp_path / "single", monkeypatch, game_id, 1000, 1, compress)
+    pooled = run_outputs(tmp_path / "pooled", monkeypatch, game_id, 2, 3, compress)
+    assert len(single) > 0
+    assert single.keys() == pooled.keys()
+    for path in single:
+        assert single[path] == pooled[path], path
@@ -0,0 +1,33 @@
+"""Test estimate mode summaries."""
+
+import json
+import os
+from src.state.run_sims import create_books
+from tests.state.sample_game import load_game, read_lookup, read_outputs
+
+NUM_SIMS = {"base": 200, "bonus": 40}
+
+
+def test_estimate_writes_no_books(tmp_path, monkeypatch):
+    """Estimate mode writes no books, lookup tables or force files, only per-criteria summaries whose payouts
+    match a full run."""
+    config, gamestate = load_game("0_0_lines", tmp_path / "estimate", monkeypatch)
+    create_books(gamestate, config, dict(NUM_SIMS), 50, 2, False, False, estimate=True)
+    assert [path for path in read_outputs(gamestate) if not path.startswith("configs")] == []
+
+    config, full = load_game("0_0_lines", tmp_path / "full", monkeypatch)
+    create_books(full, config, dict(NUM_SIMS), 50, 2, False, False)
+    for betmode, num_sims in NUM_SIMS.items():
+        with open(gamestate.output_files.get_estimate_summary_name(betmode), "r", encoding="UTF-8") as f:
+            summary = json.load(f)
+        criteria = {d.get_criteria() for d in gamestate.get_betmode(betmode).get_distributions()}
+        assert set(summary["criteria"]) <= criteria
+        assert sum(stats["num_sims"] for stats in summary["criteria"].values()) == num_sims
+        for stats in summary["criteria"].values():
+            assert stats["mean_attempts"] >= 1
+            assert {"rtp", "base_rtp", "free_rtp", "hit_rate", "histogram"} <= set(stats)
+
+        histogram = summary["mode"]["histogram"]
+        payouts = sum(int(payout) * count for payout, count in histogram.items())
+        assert payouts == sum(int(row[2]) for row in read_lookup(full, "base_lookup", betmode))
+
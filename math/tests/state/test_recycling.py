@@ -0,0 +1,156 @@
+"""Test recycling of rejected attempts across compatible criteria."""
+
+import json
+import random
+from collections import Counter
+from src.calculations.statistics import derive_rng_seed
+from src.state.recycling import RecyclingPool
+from src.state.run_sims import create_books, get_sim_splits
+from src.wins.win_manager import WinManager
+from tests.state.sample_game import load_game, read_books, read_lookup
+from tests.state.test_cluster_game import BookCollector, run_book
+
+NUM_SIMS = {"base": 400}
+# Exact win of the criteria sharing the conditions of "0" in recycled runs
+PAYING_WIN = 1.0
+# Chi-square 0.999 quantiles by degrees of freedom
+CHI2_LIMITS = {1: 10.83, 2: 13.82, 3: 16.27, 4: 18.47, 5: 20.52, 6: 22.46, 7: 24.32, 8: 26.12, 9: 27.88, 10: 29.59}
+
+
+def get_distribution(gamestate, criteria: str):
+    """Distribution of a base mode criteria."""
+    return next(d for d in gamestate.get_betmode("base").get_distributions() if d.get_criteria() == criteria)
+
+
+def recycled_run(root, monkeypatch, recycle: bool = True, num_sims: dict = NUM_SIMS) -> tuple:
+    """Cluster game base mode with two compatible criteria: "0" and "basegame" paying exactly PAYING_WIN.
+    Returns the gamestate and the imprinted (sim, attempt) pairs of recycled books."""
+    config, gamestate = load_game("0_0_cluster", root, monkeypatch)
+    zero, paying = get_distribution(gamestate, "0"), get_distribution(gamestate, "basegame")
+    monkeypatch.setattr(zero, "_quota", 0.9)
+    monkeypatch.setattr(paying, "_quota", 0.1)
+    monkeypatch.setattr(paying, "_win_criteria", PAYING_WIN)
+    monkeypatch.setattr(gamestate.get_betmode("base"), "_distributions", [zero, paying])
+
+    recycled = []
+    imprint = gamestate.imprint_recycled_attempt
+
+    def record(sim, attempt):
+        recycled.append((sim, attempt))
+        imprint(sim, attempt)
+
+    monkeypatch.setattr(gamestate, "imprint_recycled_attempt", record)
+    create_books(gamestate, config, dict(num_sims), 100, 1, False, False, recycle_rejected=recycle)
+    return gamestate, recycled
+
+
+def chi_square_homogeneity(first: Counter, second: Counter) -> tuple:
+    """Chi-square statistic and degrees of freedom of two samples of a categorical value, rare values skipped."""
+    total_first, total_second = sum(first.values()), sum(second.values())
+    statistic, categories = 0.0, 0
+    for value in set(first) | set(second):
+        combined = first[value] + second[value]
+        if combined < 10:
+            continue
+        for count, total in ((first[value], total_first), (second[value], total_second)):
+            expected = combined * total / (total_first + total_second)
+            statistic += (count - expected) ** 2 / expected
+        categories += 1
+    return statistic, categories - 1
+
+
+def test_overlapping_criteria_not_recycled(tmp_path, monkeypatch):
+    """Criteria whose acceptance can overlap are not compatible, even with identical conditions."""
+    _, gamestate = load_game("0_0_cluster", tmp_path, monkeypatch)
+    distributions = gamestate.get_betmode("base").get_distributions()
+    # "basegame" declares no win_criteria, so it can accept any outcome "0" rejects
+    assert RecyclingPool(distributions, {}).get_targets("0") == []
+    assert RecyclingPool(distributions, {}).get_targets("basegame") == []
+
+    monkeypatch.setattr(get_distribution(gamestate, "basegame"), "_win_criteria", 0.0)
+    assert RecyclingPool(distributions, {}).targets["0"] == []
+    monkeypatch.setattr(get_distribution(gamestate, "basegame"), "_win_criteria", PAYING_WIN)
+    assert RecyclingPool(distributions, {}).targets["0"] == ["basegame"]
+
+
+def test_quotas_with_recycling(tmp_path, monkeypatch):
+    """Recycled books count towards the quota of the criteria using them, and satisfy that criteria."""
+    gamestate, recycled = recycled_run(tmp_path, monkeypatch)
+    assert len(recycled) > 0
+    rows = read_lookup(gamestate, "segmented_id", "base")
+    counts = Counter(row[1] for row in rows)
+    assert counts == get_sim_splits(gamestate, NUM_SIMS["base"], "base", random.Random(0))
+
+    for book in read_books(gamestate, "base"):
+        expected = 0 if book["criteria"] == "0" else round(PAYING_WIN * 100)
+        assert book["payoutMultiplier"] == expected
+
+
+def test_no_duplicated_outcomes(tmp_path, monkeypatch):
+    """Only attempts rejected by their own criteria are recycled, every outcome fills at most one book."""
+    gamestate, recycled = recycled_run(tmp_path, monkeypatch)
+    assert len(recycled) > 0
+    sources = [tuple(attempt["source"]) for _, attempt in recycled]
+    assert len(set(sources)) == len(sources)
+    events = [json.dumps(book["events"]) for book in read_books(gamestate, "base")]
+    assert len(set(events)) == len(events)
+
+
+def test_recycled_book_distribution(tmp_path, monkeypatch):
+    """Recycled books of a criteria follow the distribution of books played for it."""
+    num_sims = {"base": 1000}
+    recycled_state, recycled = recycled_run(tmp_path / "recycled", monkeypatch, num_sims=num_sims)
+    played_state, _ = recycled_run(tmp_path / "played", monkeypatch, recycle=False, num_sims=num_sims)
+    recycled_sims = {sim for sim, _ in recycled}
+
+    def first_symbols(gamestate, sims=None) -> Counter:
+        """Top symbol of the first reel on the first reveal of "0" books, one independent value per book."""
+        counts = Counter()
+        for book in read_books(gamestate, "base"):
+            if book["criteria"] == "0" and (sims is None or book["id"] in sims):
+                counts[book["events"][0]["board"][0][0]["name"]] += 1
+        return counts
+
+    recycled_counts, played_counts = first_symbols(recycled_state, recycled_sims), first_symbols(played_state)
+    assert sum(recycled_counts.values()) >= 150
+    statistic, dof = chi_square_homogeneity(recycled_counts, played_counts)
+    assert statistic < CHI2_LIMITS[dof]
+
+
+def test_recycled_books_reproducible(tmp_path, monkeypatch):
+    """A recycled book is the book of its source attempt, replayed from the source seed and attempt."""
+    _, recycled = recycled_run(tmp_path / "run", monkeypatch)
+    for sim, attempt in recycled[:10]:
+        source_sim, seed, source_attempt = attempt["source"]
+        _, gamestate = load_game("0_0_cluster", tmp_path / "replay", monkeypatch)
+        reset_seed = gamestate.reset_seed
+
+        def replay_seed(sim, seed_override=None, seed=seed, source_attempt=source_attempt):
+            reset_seed(sim, seed)
+            gamestate.rng_attempt = source_attempt
+
+        monkeypatch.setattr(gamestate, "reset_seed", replay_seed)
+        book = run_book(gamestate, "base", "0", source_sim)
+        assert book["events"] == attempt["events"]
+        assert book["payoutMultiplier"] == round(attempt["payout_multiplier"] * 100)
+
+
+def test_recycled_attempt_keeps_seed(tmp_path, monkeypatch):
+    """Imprinting a recycled attempt keeps the seed override of its source attempt."""
+    _, recycled = recycled_run(tmp_path / "run", monkeypatch)
+    attempt = dict(recycled[0][1], source=[3, 12345, 2])
+
+    _, gamestate = load_game("0_0_cluster", tmp_path / "replay", monkeypatch)
+    gamestate.betmode, gamestate.criteria = "base", "0"
+    gamestate.win_manager = WinManager(
+        gamestate.config.basegame_type, gamestate.config.freegame_type, gamestate.get_betmode("base").get_wincap()
+    )
+    gamestate.book_writer = BookCollector()
+    gamestate.recycling_pool = type("Pool", (), {"recycled": {}})()
+    expected_rng = random.Random(derive_rng_seed("base", 12345, 2))
+
+    gamestate.imprint_recycled_attempt(7, attempt)
+    assert (gamestate.sim, gamestate.sim_seed, gamestate.rng_attempt) == (7, 12345, 3)
+    assert gamestate.recycling_pool.recycled == {7: [3, 12345, 2]}
+    assert gamestate.book_writer.books[0]["id"] == 7
+    assert gamestate.rng.getstate() == expected_rng.getstate()
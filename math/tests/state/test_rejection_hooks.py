@@ -0,0 +1,108 @@
+"""Test that rejection hooks only abandon attempts at their check points, without changing accepted books."""
+
+import pytest
+from src.config.distributions import Distribution
+from src.state import rejection_hooks
+from src.state.rejection_hooks import NO_FREEGAME, WIN_UPDATE, get_rejection_hook
+from tests.state.sample_game import load_game
+from tests.state.test_cluster_game import run_book
+
+
+class HookState:
+    """Minimal gamestate seen by rejection hooks."""
+
+    def __init__(self, running_bet_win: float, win_criteria: float = None, force_freegame: bool = False):
+        self.win_manager = type("WinManager", (), {"running_bet_win": running_bet_win})()
+        self.config = type("Config", (), {"wincap": 5000})()
+        self.distribution = Distribution(
+            criteria="c",
+            quota=1,
+            win_criteria=win_criteria,
+            conditions={"reel_weights": {"basegame": {"BR0": 1}}, "force_freegame": force_freegame},
+        )
+
+    def get_current_betmode_distributions(self):
+        return self.distribution
+
+    def get_current_distribution_conditions(self):
+        return self.distribution.get_conditions()
+
+
+# (hook, gamestate, expected result at WIN_UPDATE, expected result at NO_FREEGAME)
+HOOK_CASES = [
+    ("any_win", HookState(0.0), False, False),
+    ("any_win", HookState(0.2), True, True),
+    ("exceeds_win_criteria", HookState(10.0), False, False),
+    ("exceeds_win_criteria", HookState(10.0, win_criteria=10.0), False, False),
+    ("exceeds_win_criteria", HookState(10.1, win_criteria=10.0), True, True),
+    ("exceeds_win_criteria", HookState(9000.0, win_criteria=5000.0), False, False),
+    ("missing_freegame", HookState(0.0, force_freegame=False), False, False),
+    ("missing_freegame", HookState(0.0, force_freegame=True), False, True),
+]
+
+
+@pytest.mark.parametrize("name, gamestate, at_win_update, at_no_freegame", HOOK_CASES)
+def test_hook_check_points(name, gamestate, at_win_update, at_no_freegame):
+    """Win hooks reject on the round win at any check point, missing_freegame only when the freegame was missed."""
+    hook = get_rejection_hook(name)
+    assert hook(gamestate, WIN_UPDATE) is at_win_update
+    assert hook(gamestate, NO_FREEGAME) is at_no_freegame
+
+
+# (game, betmode, criteria, hooks or None to keep the configured hooks)
+HOOKED_CRITERIA = [
+    ("0_0_lines", "base", "0", None),
+    ("0_0_lines", "base", "0", ["any_win"]),
+    ("0_0_cluster", "base", "0", None),
+    ("0_0_cluster", "base", "freegame", None),
+    ("0_0_cluster", "bonus", "freegame", ["missing_freegame", "exceeds_win_criteria"]),
+]
+
+
+def run_books(tmp_path, monkeypatch, game_id, betmode, criteria, hooks, num_sims=20):
+    """Books and number of attempts of simulations run with the given distribution hooks, rejections by check point."""
+    _, gamestate = load_game(game_id, tmp_path, monkeypatch)
+    distribution = next(d for d in gamestate.get_betmode(betmode).get_distributions() if d.get_criteria() == criteria)
+    monkeypatch.setattr(distribution, "_rejection_hooks", hooks)
+
+    rejections = []
+
+    def record(name):
+        hook = get_rejection_hook(name)
+
+        def recorded(state, point):
+            rejected = hook(state, point)
+            if rejected:
+                rejections.append((name, point, state.gametype))
+            return rejected
+
+        return recorded
+
+    hooks[:] = [record(hook) for hook in hooks]
+    books = []
+    for sim in range(num_sims):
+        book = run_book(gamestate, betmode, criteria, sim)
+        books.append((book, gamestate.rng_attempt))
+    return books, rejections
+
+
+@pytest.mark.parametrize("game_id, betmode, criteria, hooks", HOOKED_CRITERIA)
+def test_hooks_keep_accepted_books(tmp_path, monkeypatch, game_id, betmode, criteria, hooks):
+    """Accepted books and the number of attempts are identical with hooks on and off."""
+    if hooks is None:
+        _, gamestate = load_game(game_id, tmp_path / "config", monkeypatch)
+        distribution = next(
+            d for d in gamestate.get_betmode(betmode).get_distributions() if d.get_criteria() == criteria
+        )
+        hooks = list(distribution.get_rejection_hooks())
+    assert len(hooks) > 0
+
+    hooked, rejections = run_books(tmp_path / "on", monkeypatch, game_id, betmode, criteria, list(hooks))
+    plain, _ = run_books(tmp_path / "off", monkeypatch, game_id, betmode, criteria, [])
+    assert hooked == plain
+    for name, point, gametype in rejections:
+        assert point in (WIN_UPDATE, NO_FREEGAME)
+        if point == NO_FREEGAME or name == "missing_freegame":
+            assert point == NO_FREEGAME and gametype == "basegame"
+    if criteria == "0":
+        assert len(rejections) > 0
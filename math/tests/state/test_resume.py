@@ -0,0 +1,66 @@
+"""Test that resumed runs skip verified batches and re-run incomplete ones."""
+
+import json
+import pytest
+import src.state.run_sims as run_sims
+from src.state.run_sims import create_books
+from src.write_data.write_data import load_batch_manifest
+from tests.state.sample_game import load_game, read_outputs
+
+NUM_SIMS = {"base": 120}
+
+
+@pytest.fixture
+def interrupted_run(tmp_path, monkeypatch):
+    """Lines sample game after a run whose temp files were kept, and a recorder of simulated batches."""
+    config, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    monkeypatch.setattr(run_sims.shutil, "rmtree", lambda path: None)
+    create_books(gamestate, config, dict(NUM_SIMS), 10, 1, False, False)
+
+    simulated = []
+    run_sim_batch = run_sims.run_sim_batch
+
+    def record_batch(batch):
+        simulated.append(batch["batch_index"])
+        return run_sim_batch(batch)
+
+    monkeypatch.setattr(run_sims, "run_sim_batch", record_batch)
+    batches = load_batch_manifest(gamestate.output_files.get_batch_manifest_name("base"))["batches"]
+    return config, gamestate, batches, simulated
+
+
+def resume(config, gamestate) -> dict:
+    """Resume the run and return its final outputs."""
+    create_books(gamestate, config, dict(NUM_SIMS), 10, 1, False, False, resume=True)
+    return read_outputs(gamestate)
+
+
+def test_resume_skips_complete_batches(interrupted_run):
+    """No batch is simulated again when every batch verifies."""
+    config, gamestate, batches, simulated = interrupted_run
+    expected = read_outputs(gamestate)
+    assert resume(config, gamestate) == expected
+    assert simulated == []
+
+
+def test_resume_reruns_truncated_batch(interrupted_run):
+    """A batch whose temp books were truncated is simulated again, the outputs are unchanged."""
+    config, gamestate, batches, simulated = interrupted_run
+    expected = read_outputs(gamestate)
+    with open(batches[3]["files"]["books"], "r+b") as f:
+        f.truncate(10)
+    assert resume(config, gamestate) == expected
+    assert simulated == [3]
+
+
+def test_resume_reruns_mismatched_batch(interrupted_run):
+    """A batch whose record does not match the assigned simulations and seeds is simulated again."""
+    config, gamestate, batches, simulated = interrupted_run
+    expected = read_outputs(gamestate)
+    with open(batches[5]["record"], "r", encoding="UTF-8") as f:
+        record = json.load(f)
+    record["seeds_hash"] = "0" * 64
+    with open(batches[5]["record"], "w", encoding="UTF-8") as f:
+        json.dump(record, f)
+    assert resume(config, gamestate) == expected
+    assert simulated == [5]
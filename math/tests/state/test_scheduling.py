@@ -0,0 +1,53 @@
+"""Test partitioning of simulations into batches and the combined outputs of all batches."""
+
+import json
+import os
+from collections import Counter
+import random
+import pytest
+from src.state.run_sims import create_books, partition_sims, get_sim_splits, MIN_BATCHES_PER_RUN
+from tests.state.sample_game import load_game, read_books, read_lookup
+
+NUM_SIMS = {"base": 300, "bonus": 60}
+
+
+@pytest.mark.parametrize(
+    "sim_start, sim_end, batch_size",
+    [(0, 1000, 50), (0, 1000, 7), (250, 1001, 100000), (0, 3, 10), (10, 10, 5)],
+)
+def test_partition_covers_simulations(sim_start, sim_end, batch_size):
+    """Ranges are contiguous, cover every simulation once and hold at most batch_size sims."""
+    ranges = partition_sims(sim_end, batch_size, sim_start)
+    sims = [sim for sim_range in ranges for sim in sim_range]
+    assert sims == list(range(sim_start, sim_end))
+    assert all(0 < len(sim_range) <= batch_size for sim_range in ranges)
+    assert len(ranges) <= max(MIN_BATCHES_PER_RUN, -(-(sim_end - sim_start) // batch_size))
+
+
+@pytest.fixture
+def lines_run(tmp_path, monkeypatch):
+    """Lines sample game after a small multi-threaded run."""
+    config, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    create_books(gamestate, config, dict(NUM_SIMS), 20, 2, False, False)
+    return gamestate
+
+
+def test_criteria_quotas_preserved(lines_run):
+    """Every criteria keeps its share of simulations, however simulations are split into batches."""
+    for betmode, num_sims in NUM_SIMS.items():
+        counts = Counter(row[1] for row in read_lookup(lines_run, "segmented_id", betmode))
+        assert sum(counts.values()) == num_sims
+        assert counts == get_sim_splits(lines_run, num_sims, betmode, random.Random(0))
+        assert [int(row[0]) for row in read_lookup(lines_run, "base_lookup", betmode)] == list(range(num_sims))
+
+
+def test_event_list_written_once(lines_run):
+    """The event list holds the first example of every event type, in simulation order."""
+    for betmode in NUM_SIMS:
+        expected = {}
+        for book in read_books(lines_run, betmode):
+            for event in book["events"]:
+                expected.setdefault(event["type"], {key: value for key, value in event.items() if key != "index"})
+        path = os.path.join(lines_run.output_files.config_path, f"event_config_{betmode}.json")
+        with open(path, "r", encoding="UTF-8") as f:
+            assert json.load(f) == expected
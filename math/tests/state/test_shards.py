@@ -0,0 +1,39 @@
+"""Test that sharded runs merged with merge_shards equal a single-node run."""
+
+import pytest
+from src.state.run_sims import create_books, merge_shards
+from tests.state.sample_game import load_game, read_outputs
+
+NUM_SIMS = {"base": 200, "bonus": 40}
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_merged_shards_equal_single_run(tmp_path, monkeypatch, compress):
+    """Books, lookup tables, force and event files of merged shards are byte-identical to a single-node run."""
+    config, gamestate = load_game("0_0_lines", tmp_path / "single", monkeypatch)
+    create_books(gamestate, config, dict(NUM_SIMS), 25, 2, compress, False)
+    expected = read_outputs(gamestate)
+
+    shard_paths = [str(tmp_path / f"shard_{index}") for index in range(3)]
+    for index, (batch_size, threads) in enumerate([(25, 2), (7, 1), (1000, 3)]):
+        config, gamestate = load_game("0_0_lines", tmp_path / "sharded", monkeypatch)
+        create_books(
+            gamestate,
+            config,
+            dict(NUM_SIMS),
+            batch_size,
+            threads,
+            compress,
+            False,
+            shard_index=index,
+            num_shards=3,
+            shard_path=shard_paths[index],
+        )
+    config, gamestate = load_game("0_0_lines", tmp_path / "sharded", monkeypatch)
+    merge_shards(gamestate, config, shard_paths)
+    merged = read_outputs(gamestate)
+
+    assert len(expected) > 0
+    assert merged.keys() == expected.keys()
+    for path in expected:
+        assert merged[path] == expected[path], path
@@ -0,0 +1,91 @@
+"""Test exact reelstrip RTP against brute-force enumeration of all reel stops."""
+
+from itertools import product
+import pytest
+from tests.win_calculations.game_test_config import GamestateTest
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from src.calculations.analytic_rtp import get_reelstrip_rtp
+
+
+class GameAnalyticConfig:
+    """Small 3x2 game with short reelstrips."""
+
+    def __init__(self):
+        self.game_id = "0_test_class"
+        self.rtp = 0.9700
+
+        # Game Dimensions
+        self.num_reels = 3
+        self.num_rows = [2] * self.num_reels
+        # Board and Symbol Properties
+        self.paytable = {
+            (3, "W"): 20,
+            (2, "W"): 4,
+            (3, "H1"): 10,
+            (2, "H1"): 2,
+            (3, "L1"): 3,
+            (2, "L1"): 1.5,
+            (1, "L1"): 0.1,
+        }
+        self.paylines = {1: [0, 0, 0], 2: [1, 1, 1], 3: [0, 1, 0]}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"]}
+        self.reels = {
+            "BR0": [
+                ["H1", "L1", "W", "S", "L1"],
+                ["L1", "H1", "S", "W", "H1", "L1"],
+                ["W", "L1", "H1", "S"],
+            ]
+        }
+        self.freespin_triggers = {"basegame": {2: 5, 3: 10}}
+        self.bet_modes = []
+        self.basegame_type = "basegame"
+        self.freegame_type = "freegame"
+
+
+@pytest.fixture
+def gamestate():
+    """Initialise test state."""
+    test_gamestate = GamestateTest(GameAnalyticConfig())
+    test_gamestate.create_symbol_map()
+    test_gamestate.assign_special_sym_function()
+    return test_gamestate
+
+
+def enumerate_boards(gamestate):
+    """All boards of the reelstrip, one per stop combination."""
+    reels = gamestate.config.reels["BR0"]
+    for stops in product(*(range(len(reel)) for reel in reels)):
+        yield [
+            [gamestate.create_symbol(reel[(stop + row) % len(reel)]) for row in range(gamestate.config.num_rows[idx])]
+            for idx, (reel, stop) in enumerate(zip(reels, stops))
+        ]
+
+
+@pytest.mark.parametrize("win_type", ["lines", "ways"])
+def test_analytic_rtp_matches_enumeration(gamestate, win_type):
+    """Exact RTP and per symbol/kind contributions equal the average over all stop combinations."""
+    totals, hits, num_boards, scatter_counts = {}, {}, 0, {}
+    for board in enumerate_boards(gamestate):
+        if win_type == "lines":
+            windata = Lines.get_lines(board, gamestate.config)
+        else:
+            windata = Ways.get_ways_data(gamestate.config, board)
+        for win in windata["wins"]:
+            key = (win["symbol"], win["kind"])
+            totals[key] = totals.get(key, 0) + win["win"]
+            hits[key] = hits.get(key, 0) + 1
+        num_scatter = sum(sym.name == "S" for reel in board for sym in reel)
+        scatter_counts[num_scatter] = scatter_counts.get(num_scatter, 0) + 1
+        num_boards += 1
+
+    result = get_reelstrip_rtp(gamestate.config, "BR0", win_type=win_type)
+    assert result["rtp"] == pytest.approx(sum(totals.values()) / num_boards)
+    for (symbol, kind), total in totals.items():
+        assert result["wins"][symbol][kind]["rtp"] == pytest.approx(total / num_boards)
+        assert result["wins"][symbol][kind]["hit_rate"] == pytest.approx(hits[(symbol, kind)] / num_boards)
+    for count, num in scatter_counts.items():
+        assert result["scatter_counts"][count] == pytest.approx(num / num_boards)
+    assert result["trigger_probability"] == pytest.approx(
+        sum(num for count, num in scatter_counts.items() if count >= 2) / num_boards
+    )
@@ -0,0 +1,176 @@
+"""Test likelihood ratios of boards drawn from biased reel weights."""
+
+from itertools import product
+import random
+import pytest
+from tests.win_calculations.game_test_config import GamestateTest
+from src.calculations.board import Board
+from src.config.betmode import BetMode
+from src.config.distributions import Distribution
+
+NOMINAL_WEIGHTS = {"BR0": 3, "BR1": 1}
+BIASED_WEIGHTS = {"BR0": 1, "BR1": 4}
+NOMINAL_MULTS = {2: 1, 3: 1}
+BIASED_MULTS = {2: 1, 3: 3}
+
+
+class GameBiasConfig:
+    """Small 3x2 game with two reelstrips, drawn from biased reel weights."""
+
+    def __init__(self):
+        self.game_id = "0_test_class"
+        self.rtp = 0.9700
+        self.wincap = 5000
+
+        # Game Dimensions
+        self.num_reels = 3
+        self.num_rows = [2] * self.num_reels
+        # Board and Symbol Properties
+        self.paytable = {(3, "H1"): 10, (3, "L1"): 3}
+        self.special_symbols = {"scatter": ["S"]}
+        self.include_padding = False
+        self.reels = {
+            "BR0": [["H1", "L1", "S", "L1"], ["L1", "H1", "S"], ["S", "L1", "H1", "L1", "H1"]],
+            "BR1": [["S", "S", "L1"], ["L1", "S", "H1", "S"], ["H1", "L1", "S"]],
+        }
+        self.anticipation_triggers = {"basegame": 2}
+        self.basegame_type = "basegame"
+        self.freegame_type = "freegame"
+        self.bet_modes = [
+            BetMode(
+                name="base",
+                cost=1.0,
+                rtp=self.rtp,
+                max_win=self.wincap,
+                auto_close_disabled=False,
+                is_feature=True,
+                is_buybonus=False,
+                distributions=[
+                    Distribution(
+                        criteria="basegame",
+                        quota=1,
+                        conditions={
+                            "reel_weights": {self.basegame_type: dict(BIASED_WEIGHTS)},
+                            "mult_values": dict(BIASED_MULTS),
+                            "nominal_weights": {
+                                "reel_weights": {self.basegame_type: dict(NOMINAL_WEIGHTS)},
+                                "mult_values": dict(NOMINAL_MULTS),
+                            },
+                        },
+                    )
+                ],
+            )
+        ]
+
+
+class BoardTest(GamestateTest, Board):
+    """Test gamestate drawing boards."""
+
+
+@pytest.fixture
+def gamestate():
+    """Initialise test state."""
+    test_gamestate = BoardTest(GameBiasConfig())
+    test_gamestate.create_symbol_map()
+    test_gamestate.compile_reelstrips()
+    test_gamestate.assign_special_sym_function()
+    test_gamestate.betmode = "base"
+    test_gamestate.criteria = "basegame"
+    test_gamestate.gametype = "basegame"
+    return test_gamestate
+
+
+def count_scatter_boards(reelstrip, num_rows, totals):
+    """Number of stop combinations of a reelstrip showing one of the totals of scatters, and of all combinations."""
+    hits, num_boards = 0, 0
+    for stops in product(*(range(len(reel)) for reel in reelstrip)):
+        count = sum(
+            reel[(stop + row) % len(reel)] == "S" for reel, stop in zip(reelstrip, stops) for row in range(num_rows)
+        )
+        hits += count in totals
+        num_boards += 1
+    return hits, num_boards
+
+
+def draw_ratios(gamestate, draw_board):
+    """Likelihood ratio of a board drawn with every seed, by drawn reelstrip."""
+    ratios = {}
+    for seed in range(200):
+        gamestate.rng = random.Random(seed)
+        gamestate.likelihood_ratio = 1.0
+        draw_board()
+        ratios.setdefault(gamestate.reelstrip_id, set()).add(gamestate.likelihood_ratio)
+    return ratios
+
+
+def test_reelstrip_draw_ratio(gamestate):
+    """Unconditional reelstrip draws are weighted by nominal over biased reelstrip probability."""
+    ratios = draw_ratios(gamestate, gamestate.create_board_reelstrips)
+    assert set(ratios) == set(NOMINAL_WEIGHTS)
+    for reelstrip_id, values in ratios.items():
+        expected = (NOMINAL_WEIGHTS[reelstrip_id] / 4) / (BIASED_WEIGHTS[reelstrip_id] / 5)
+        assert all(value == pytest.approx(expected) for value in values)
+
+
+def test_unkeyed_condition_draw_ratio(gamestate):
+    """Draws from conditions given as {value: weight} are weighted like per-gametype conditions."""
+    ratios = {}
+    for seed in range(200):
+        gamestate.rng = random.Random(seed)
+        gamestate.likelihood_ratio = 1.0
+        value = gamestate.draw_condition("mult_values")
+        ratios.setdefault(value, set()).add(gamestate.likelihood_ratio)
+    assert set(ratios) == set(NOMINAL_MULTS)
+    for value, values in ratios.items():
+        expected = (NOMINAL_MULTS[value] / 2) / (BIASED_MULTS[value] / 4)
+        assert all(ratio == pytest.approx(expected) for ratio in values)
+
+
+@pytest.mark.parametrize("totals", [[1, 2], [3, 4]])
+def test_count_board_ratio(gamestate, totals):
+    """Boards forced to a scatter count are weighted by nominal over biased probability given the count."""
+    shown = {}
+    for reelstrip_id, reelstrip in gamestate.config.reels.items():
+        hits, num_boards = count_scatter_boards(reelstrip, 2, totals)
+        shown[reelstrip_id] = hits / num_boards
+    nominal_total = sum(NOMINAL_WEIGHTS[r] * shown[r] for r in shown)
+    biased_total = sum(BIASED_WEIGHTS[r] * shown[r] for r in shown)
+
+    ratios = draw_ratios(gamestate, lambda: gamestate.create_board_with_count("scatter", totals))
+    assert set(ratios) == set(NOMINAL_WEIGHTS)
+    for reelstrip_id, values in ratios.items():
+        expected = (NOMINAL_WEIGHTS[reelstrip_id] * shown[reelstrip_id] / nominal_total) / (
+            BIASED_WEIGHTS[reelstrip_id] * shown[reelstrip_id] / biased_total
+        )
+        assert all(value == pytest.approx(expected) for value in values)
+
+
+def test_unreachable_nominal_outcome():
+    """Biased weights must be able to draw every outcome with nominal weight."""
+    with pytest.raises(AssertionError):
+        Distribution(
+            criteria="basegame",
+            quota=1,
+            conditions={
+                "reel_weights": {"basegame": {"BR1": 1}},
+                "nominal_weights": {"reel_weights": {"basegame": {"BR0": 1, "BR1": 1}}},
+            },
+        )
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        {"force_freegame": True, "nominal_weights": {"force_freegame": {True: 1}}},
+        {"mult_values": {2: 1, 3: 1}, "nominal_weights": {"mult_values": {"basegame": {2: 1, 3: 1}}}},
+        {"nominal_weights": {"reel_weights": {"BR0": 1}}},
+    ],
+)
+def test_nominal_weights_of_unweighted_condition(conditions):
+    """Nominal weights are only accepted for weighted conditions, in the shape of the condition."""
+    with pytest.raises(AssertionError):
+        Distribution(
+            criteria="basegame",
+            quota=1,
+            conditions={"reel_weights": {"basegame": {"BR0": 1}}, **conditions},
+        )
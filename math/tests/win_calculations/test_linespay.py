@@ -122,3 +122,26 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_linespay_config_changes(gamestate):
+    "Changes of the paytable and paylines of a config are picked up between evaluations."
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("H1" if idx < 3 else "X")
+
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == gamestate.config.paytable[(3, "H1")] * 4
+
+    gamestate.config.paytable[(3, "H1")] = 7
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == 7 * 4
+
+    gamestate.config.paylines[5] = [1, 1, 1, 1, 1]
+    del gamestate.config.paylines[1]
+    gamestate.config.paylines[2][1] = 4
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert windata["totalWin"] == 7 * 4
+    assert sorted(win["meta"]["lineIndex"] for win in windata["wins"]) == [2, 3, 4, 5]
+    line_2 = [win for win in windata["wins"] if win["meta"]["lineIndex"] == 2][0]
+    assert [(pos["reel"], pos["row"]) for pos in line_2["positions"]] == [(0, 0), (1, 4), (2, 2)]
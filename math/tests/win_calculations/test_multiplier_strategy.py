@@ -0,0 +1,122 @@
+"""Test the multiplier strategy registry and the built-in strategies."""
+
+import random
+import pytest
+from src.calculations.board_codes import BoardCodes
+from src.calculations.symbol import SymbolStorage
+from src.wins import multiplier_strategy
+from src.wins.multiplier_strategy import apply_mult, apply_mults, get_mult_strategy, register_mult_strategy
+
+
+class SymbolConfig:
+    """Paytable and special symbols only."""
+
+    def __init__(self):
+        self.paytable = {(3, "H1"): 10, (3, "L1"): 3}
+        self.special_symbols = {"wild": ["W"], "multiplier": ["M"]}
+
+
+def global_reference(board, win_amount, global_multiplier, positions, multiplier_key) -> tuple:
+    """Previous "global" result."""
+    return (round(win_amount * global_multiplier, 2), global_multiplier)
+
+
+def symbol_reference(board, win_amount, global_multiplier, positions, multiplier_key) -> tuple:
+    """Previous "symbol" result, added symbol multipliers above 1."""
+    symbol_multiplier = 0
+    for pos in positions:
+        if (
+            board[pos["reel"]][pos["row"]].check_attribute(multiplier_key)
+            and board[pos["reel"]][pos["row"]].get_attribute(multiplier_key) > 1
+        ):
+            symbol_multiplier += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+    return (round(win_amount * max(symbol_multiplier, 1), 2), max(symbol_multiplier, 1))
+
+
+def combined_reference(board, win_amount, global_multiplier, positions, multiplier_key) -> tuple:
+    """Previous "combined" result, symbol multipliers and then the global multiplier."""
+    win, sym_mult = symbol_reference(board, win_amount, global_multiplier, positions, multiplier_key)
+    return (win * global_multiplier, sym_mult * global_multiplier)
+
+
+def cluster_reference(board, win_amount, global_multiplier, positions, multiplier_key) -> tuple:
+    """Previous cluster multiplier of Cluster.evaluate_clusters(), added positive symbol multipliers."""
+    cluster_mult = 0
+    for pos in positions:
+        if board[pos["reel"]][pos["row"]].check_attribute(multiplier_key):
+            if int(board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)) > 0:
+                cluster_mult += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+    cluster_mult = max(cluster_mult, 1)
+    return (win_amount * cluster_mult * global_multiplier, cluster_mult)
+
+
+REFERENCES = {
+    "global": global_reference,
+    "symbol": symbol_reference,
+    "combined": combined_reference,
+    "cluster": cluster_reference,
+}
+
+
+def create_board(rng: random.Random) -> list:
+    """5x4 board of plain, wild and multiplier symbols, with multiplier values on some positions."""
+    storage = SymbolStorage(SymbolConfig(), ["H1", "L1", "M", "W"])
+    board = [[storage.create_symbol(rng.choice(["H1", "L1", "M", "W"])) for _ in range(4)] for _ in range(5)]
+    for reel in board:
+        for row, sym in enumerate(reel):
+            if sym.name == "M" or rng.random() < 0.3:
+                reel[row] = sym.assign_attribute({"multiplier": rng.choice([0, 1, 2, 3, 5])})
+    return board
+
+
+@pytest.mark.parametrize("name", list(REFERENCES))
+def test_builtin_strategies_match_previous_results(name):
+    """Each built-in strategy gives the previous per-win results, on Symbol boards and encoded boards."""
+    rng = random.Random(0)
+    for _ in range(50):
+        board = create_board(rng)
+        global_multiplier = rng.choice([1, 2, 3])
+        wins = []
+        for _ in range(5):
+            positions = [{"reel": reel, "row": rng.randrange(4)} for reel in range(rng.randint(1, 5))]
+            wins.append((rng.choice([0.1, 0.35, 1.5, 10]), positions))
+        expected = [REFERENCES[name](board, win, global_multiplier, positions, "multiplier") for win, positions in wins]
+
+        for evaluated in (board, BoardCodes(board)):
+            assert apply_mults(evaluated, name, wins, global_multiplier=global_multiplier) == expected
+            assert [
+                apply_mult(evaluated, name, win, global_multiplier, positions) for win, positions in wins
+            ] == expected
+
+
+def test_register_custom_strategy(monkeypatch):
+    """Custom strategies are registered as a function or decorator and receive additional keyword arguments."""
+    monkeypatch.setattr(multiplier_strategy, "MULT_STRATEGIES", dict(multiplier_strategy.MULT_STRATEGIES))
+
+    @register_mult_strategy("fixed")
+    def apply_fixed_mult(board, win_amount, global_multiplier, positions, multiplier_key, mult) -> tuple:
+        return (win_amount * mult * global_multiplier, mult)
+
+    register_mult_strategy("none", lambda board, win_amount, *args: (win_amount, 1))
+    assert get_mult_strategy("fixed") is apply_fixed_mult
+    assert apply_mult([], "fixed", 2, 3, mult=4) == (24, 4)
+    assert apply_mults([], "none", [(2, []), (5, [])]) == [(2, 1), (5, 1)]
+    assert apply_mult([], apply_fixed_mult, 1, mult=7) == (7, 7)
+
+
+def test_duplicate_and_unknown_names(monkeypatch):
+    """Registered names cannot be overwritten without replace, unknown names are rejected."""
+    monkeypatch.setattr(multiplier_strategy, "MULT_STRATEGIES", dict(multiplier_strategy.MULT_STRATEGIES))
+    with pytest.raises(ValueError, match="already registered"):
+        register_mult_strategy("global", lambda *args: (0, 0))
+    with pytest.raises(ValueError, match="already registered"):
+        register_mult_strategy("symbol")(lambda *args: (0, 0))
+    assert apply_mult([], "global", 2, 3) == (6, 3)
+
+    register_mult_strategy("global", lambda *args: (0, 0), replace=True)
+    assert apply_mult([], "global", 2, 3) == (0, 0)
+
+    with pytest.raises(ValueError, match="not registered"):
+        apply_mult([], "unknown", 1)
+    with pytest.raises(ValueError, match="not registered"):
+        apply_mults([], "unknown", [])
@@ -0,0 +1,65 @@
+"""Test streaming of books to disk by BookWriter."""
+
+import json
+import pytest
+import zstandard as zstd
+from src.write_data.write_data import BookWriter
+
+
+def make_book(book_id: int) -> dict:
+    """Small book with a single event."""
+    return {
+        "id": book_id,
+        "payoutMultiplier": book_id * 10,
+        "events": [{"index": 0, "type": "reveal", "board": [[book_id]]}],
+        "criteria": "basegame",
+        "baseGameWins": book_id / 10,
+        "freeGameWins": 0.0,
+    }
+
+
+def read_file(filename: str) -> list:
+    """Books of a written file."""
+    with open(filename, "rb") as f:
+        data = f.read()
+    if filename.endswith(".zst"):
+        data = zstd.ZstdDecompressor().stream_reader(data, read_across_frames=True).read()
+    text = data.decode("UTF-8")
+    if filename.endswith(".json"):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+@pytest.mark.parametrize(
+    "name, regular_json, books_per_frame",
+    [
+        ("books.json", True, None),
+        ("books.jsonl", False, None),
+        ("books.jsonl.zst", False, None),
+        ("books.jsonl.zst", False, 3),
+    ],
+)
+def test_books_round_trip(tmp_path, name, regular_json, books_per_frame):
+    """Every written book is read back unchanged, only compact records are kept in memory."""
+    books = [make_book(book_id) for book_id in range(10)]
+    writer = BookWriter(str(tmp_path / name), regular_json, track_events=True, books_per_frame=books_per_frame)
+    for book in books:
+        writer.write(book)
+    writer.close()
+
+    assert read_file(str(tmp_path / name)) == books
+    assert writer.records == [(b["id"], b["payoutMultiplier"], b["criteria"], b["baseGameWins"], 0.0) for b in books]
+    assert writer.event_items == {"reveal": {"type": "reveal", "board": [[0]]}}
+    if books_per_frame is not None:
+        assert [frame[2] for frame in writer.frames] == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_books_serialised_on_write(tmp_path):
+    """A book is serialised when written, later changes to the book object are not stored."""
+    writer = BookWriter(str(tmp_path / "books.jsonl"))
+    book = make_book(1)
+    writer.write(book)
+    book["events"].append({"index": 1, "type": "late"})
+    book["payoutMultiplier"] = 0
+    writer.close()
+    assert read_file(str(tmp_path / "books.jsonl")) == [make_book(1)]
@@ -0,0 +1,58 @@
+"""Test merging of compressed worker books."""
+
+import pytest
+import zstandard as zstd
+from src.write_data.write_data import BookWriter, merge_compressed_books
+from tests.write_data.test_book_writer import make_book, read_file
+
+NUM_BOOKS = 40
+
+
+def write_batches(folder, batch_size: int) -> list:
+    """Compressed worker files of NUM_BOOKS books, split into batches of batch_size books."""
+    file_list = []
+    for start in range(0, NUM_BOOKS, batch_size):
+        filename = str(folder / f"books_{start}.jsonl.zst")
+        writer = BookWriter(filename)
+        for book_id in range(start, min(start + batch_size, NUM_BOOKS)):
+            writer.write(make_book(book_id))
+        writer.close()
+        file_list.append(filename)
+    return file_list
+
+
+@pytest.fixture
+def partitions(tmp_path):
+    """The same books written as worker files of three different batch partitions."""
+    result = []
+    for batch_size in (NUM_BOOKS, 7, 1):
+        folder = tmp_path / f"batches_{batch_size}"
+        folder.mkdir()
+        result.append(write_batches(folder, batch_size))
+    return result
+
+
+def test_recompress_is_byte_identical(tmp_path, partitions):
+    """Recompressed books do not depend on the batch partition or the number of compression threads."""
+    outputs = set()
+    for index, file_list in enumerate(partitions):
+        for threads in (-1, 0, 1, 3):
+            final_out = str(tmp_path / f"merged_{index}_{threads}.jsonl.zst")
+            merge_compressed_books(file_list, final_out, "recompress", threads)
+            assert read_file(final_out) == [make_book(book_id) for book_id in range(NUM_BOOKS)]
+            with open(final_out, "rb") as f:
+                outputs.add(f.read())
+    assert len(outputs) == 1
+
+
+def test_concat_content_is_identical(tmp_path, partitions):
+    """Concatenated books decompress to the same content for every batch partition, the bytes differ."""
+    outputs = []
+    for index, file_list in enumerate(partitions):
+        final_out = str(tmp_path / f"merged_{index}.jsonl.zst")
+        merge_compressed_books(file_list, final_out, "concat")
+        with open(final_out, "rb") as f:
+            outputs.append(f.read())
+    contents = [zstd.ZstdDecompressor().stream_reader(data, read_across_frames=True).read() for data in outputs]
+    assert all(content == contents[0] for content in contents)
+    assert len(set(outputs)) == len(outputs)
@@ -0,0 +1,79 @@
+"""Test merging and random access of seekable books."""
+
+import json
+import pytest
+from src.state.run_sims import create_books
+from src.write_data.write_data import BookWriter, merge_seekable_books
+from tests.state.sample_game import load_game, read_books
+from tests.write_data.test_book_writer import make_book, read_file
+from utils.seekable_books import SeekableBooks
+
+# Book-ids in worker order, neither ascending nor contiguous (as after recycling or merging shards)
+BATCH_IDS = [[10, 4, 7, 8, 2], [1, 20], [3, 15, 16]]
+
+
+def write_seekable(folder, batch_ids: list, books_per_frame: int) -> tuple:
+    """Seekable worker files of the listed book-ids, with the frames of each file."""
+    file_list, batch_frames = [], []
+    for index, book_ids in enumerate(batch_ids):
+        filename = str(folder / f"books_{index}.jsonl.zst")
+        writer = BookWriter(filename, books_per_frame=books_per_frame)
+        for book_id in book_ids:
+            writer.write(make_book(book_id))
+        writer.close()
+        file_list.append(filename)
+        batch_frames.append(writer.frames)
+    return file_list, batch_frames
+
+
+def merge(folder, batch_ids: list, worker_frame_size: int = 2, books_per_frame: int = 3) -> SeekableBooks:
+    """Merge seekable worker files and open the result."""
+    file_list, batch_frames = write_seekable(folder, batch_ids, worker_frame_size)
+    books_path, index_path = str(folder / "books.jsonl.zst"), str(folder / "index.json")
+    merge_seekable_books(file_list, batch_frames, books_path, index_path, books_per_frame)
+    return SeekableBooks(books_path, index_path)
+
+
+def test_unordered_book_ids(tmp_path):
+    """Books are found by id whatever the order of ids, the file holds all books in worker order."""
+    books = merge(tmp_path, BATCH_IDS)
+    all_ids = [book_id for book_ids in BATCH_IDS for book_id in book_ids]
+    assert read_file(books.books_path) == [make_book(book_id) for book_id in all_ids]
+    assert books.get_books(all_ids) == {book_id: make_book(book_id) for book_id in all_ids}
+    assert books.get_book(20) == make_book(20)
+    assert [len(frame[2]) for frame in books.frames] == [3, 3, 3, 1]
+    with pytest.raises(KeyError):
+        books.get_book(5)
+
+
+def test_duplicate_book_ids_rejected(tmp_path):
+    """An index listing a book-id twice is rejected when opened."""
+    with pytest.raises(ValueError):
+        merge(tmp_path, [[1, 2, 3], [3, 4]])
+
+
+def test_merged_books_independent_of_partition(tmp_path):
+    """The same books split into different worker files and frames merge to identical bytes."""
+    outputs = set()
+    for index, (batch_ids, worker_frame_size) in enumerate(
+        [([list(range(12))], 5), ([[0, 1, 2], [3, 4, 5, 6, 7], [8, 9, 10, 11]], 2), ([[i] for i in range(12)], 1)]
+    ):
+        folder = tmp_path / str(index)
+        folder.mkdir()
+        books = merge(folder, batch_ids, worker_frame_size, books_per_frame=4)
+        with open(books.books_path, "rb") as f:
+            data = f.read()
+        with open(str(folder / "index.json"), "r", encoding="UTF-8") as f:
+            outputs.add((data, json.dumps(json.load(f)["frames"])))
+    assert len(outputs) == 1
+
+
+def test_seekable_library_books(tmp_path, monkeypatch):
+    """Books of a seekable run are all readable by id, and equal the books read as a stream."""
+    config, gamestate = load_game("0_0_lines", tmp_path, monkeypatch)
+    config.seekable_books = True
+    config.books_per_frame = 16
+    create_books(gamestate, config, {"base": 150}, 10, 2, True, False)
+    expected = read_books(gamestate, "base")
+    books = SeekableBooks.from_library(gamestate.output_files.library_path, "base")
+    assert books.get_books(range(150)) == {book["id"]: book for book in expected}
@@ -18,7 +18,7 @@ def decompress(input_path: str, save_output: bool = False):
 
     decompressor = zstd.ZstdDecompressor()
     with open(input_path, "rb") as f:
-        with decompressor.stream_reader(f) as reader:
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = io.TextIOWrapper(reader, encoding="utf-8")
             lines = []
             for line in txt_stream:
@@ -3,7 +3,9 @@
 import os
 import importlib
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterable
+
+from utils.seekable_books import SeekableBooks
 
 
 def load_game_config(game_id: str):
@@ -65,6 +67,13 @@ class ForceTool:
             print_results["simulation_ids"] = list(simulation_ids)
             f.write(json.dumps(print_results, indent=4))
 
+    def get_example_books(self, book_ids: Iterable[int], count_limit: int = None) -> Dict[int, dict]:
+        """Load the books for matched ids, requires books generated with config.seekable_books = True."""
+        book_ids = sorted(book_ids)
+        if count_limit is not None:
+            book_ids = book_ids[:count_limit]
+        return SeekableBooks.from_library(self.config.library_path, self.target_mode).get_books(book_ids)
+
     def transform_serch_dict(self, item: dict) -> list:
         """Transform force_record format."""
         tranform_dict = {}
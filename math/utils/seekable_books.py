@@ -0,0 +1,68 @@
+"""Random access to individual books of a seekable .jsonl.zst book file (config.seekable_books = True)."""
+
+import os
+import json
+from typing import Dict, Iterable
+import zstandard as zstd
+
+
+class SeekableBooks:
+    """Load single books, or sets of book-ids, by decompressing only the frames that contain them."""
+
+    def __init__(self, books_path: str, index_path: str):
+        with open(index_path, "r", encoding="UTF-8") as f:
+            self.frames = json.load(f)["frames"]
+        self.books_path = books_path
+        # book-id -> (frame index, line within the frame), ids are not assumed to be ordered or contiguous
+        self.locations = {}
+        for frame_index, (_, _, book_ids) in enumerate(self.frames):
+            for line, book_id in enumerate(book_ids):
+                if book_id in self.locations:
+                    raise ValueError(f"Book {book_id} is listed more than once in {index_path}")
+                self.locations[book_id] = (frame_index, line)
+        self.decompressor = zstd.ZstdDecompressor()
+
+    @classmethod
+    def from_library(cls, library_path: str, betmode: str):
+        """Open the published books of a betmode from a game library folder."""
+        return cls(
+            os.path.join(library_path, "publish_files", f"books_{betmode}.jsonl.zst"),
+            os.path.join(library_path, "books", f"books_{betmode}_index.json"),
+        )
+
+    def find_frame(self, book_id: int) -> tuple:
+        """(frame index, line within the frame) of book_id."""
+        try:
+            return self.locations[book_id]
+        except KeyError:
+            raise KeyError(f"Book {book_id} is not in {self.books_path}")
+
+    def read_frame(self, books_file, frame_index: int) -> list:
+        """Decompress a single frame into its (newline separated) JSON book strings."""
+        offset, size, book_ids = self.frames[frame_index]
+        books_file.seek(offset)
+        lines = self.decompressor.decompress(books_file.read(size)).decode("UTF-8").splitlines()
+        if len(lines) != len(book_ids):
+            raise ValueError(f"Frame {frame_index} of {self.books_path} does not match the book index")
+        return lines
+
+    def get_book(self, book_id: int) -> dict:
+        """Return a single book."""
+        return self.get_books([book_id])[book_id]
+
+    def get_books(self, book_ids: Iterable[int]) -> Dict[int, dict]:
+        """Return {book_id: book} for all requested ids, each required frame is decompressed once."""
+        lines_by_frame = {}
+        for book_id in book_ids:
+            frame_index, line = self.find_frame(int(book_id))
+            lines_by_frame.setdefault(frame_index, []).append((int(book_id), line))
+
+        books = {}
+        with open(self.books_path, "rb") as f:
+            for frame_index in sorted(lines_by_frame):
+                lines = self.read_frame(f, frame_index)
+                for book_id, line in lines_by_frame[frame_index]:
+                    book = json.loads(lines[line])
+                    assert book["id"] == book_id, "Book index does not match book file"
+                    books[book_id] = book
+        return books